@@ -0,0 +1,125 @@
+"""
+Measures the startup and thread reset time of the clients with the condition based waits,
+and with the fixed sleeps they replaced, to report the time saved.
+
+Usage:
+    python benchmarks/fixed_sleeps.py Pi Copilot Gemini --resets 5
+"""
+
+import argparse
+import sys
+import time
+from contextlib import contextmanager
+
+from talkingheads import get_client
+from talkingheads.base_browser import BaseBrowser
+
+CLIENTS = ["ChatGPT", "Claude", "Copilot", "Gemini", "HuggingChat", "LeChat", "Pi"]
+
+# The fixed sleeps replaced by condition based waits, in seconds, by client and the method
+# waiting. None stands for the timeout given to the wait, as the sleep was parametrized.
+FIXED_SLEEPS = {
+    ("ChatGPT", "pass_verification"): None,
+    ("ChatGPT", "open_custom_instruction_tab"): 0.2,
+    ("ChatGPT", "set_custom_instruction"): 0.1,
+    ("Claude", "reset_thread"): 0.5,
+    ("Copilot", "postload_custom_func"): 1.0,
+    ("Gemini", "upload_image"): 0.3,
+    ("Gemini", "reset_thread"): 0.5,
+    ("Pi", "postload_custom_func"): 2.0,
+}
+
+
+def fixed_sleep(client: BaseBrowser, timeout_dur: float) -> bool:
+    """Sleeps instead of the wait if it replaced a fixed sleep of the calling method.
+
+    Args:
+        client (BaseBrowser): The waiting client.
+        timeout_dur (float): The timeout of the wait.
+
+    Returns:
+        bool: True if it slept, False if the wait has to run.
+    """
+    caller = sys._getframe(2).f_code.co_name
+    key = (client.client_name, caller)
+    if key not in FIXED_SLEEPS:
+        return False
+    time.sleep(FIXED_SLEEPS[key] if FIXED_SLEEPS[key] is not None else timeout_dur or 1)
+    return True
+
+
+@contextmanager
+def fixed_sleeps():
+    """Restores the fixed sleeps in place of the condition based waits which replaced them,
+    the condition is checked once after the sleep as the old code did."""
+    wait_for, wait_until_appear = BaseBrowser.wait_for, BaseBrowser.wait_until_appear
+
+    def sleeping_wait_for(self, condition, timeout_dur=None, period=0.1):
+        if not fixed_sleep(self, timeout_dur):
+            return wait_for(self, condition, timeout_dur, period)
+        try:
+            return condition(self.browser)
+        except Exception:
+            return None
+
+    def sleeping_wait_until_appear(self, by, elem_query, timeout_dur=None, fail_ok=False):
+        if not fixed_sleep(self, timeout_dur):
+            return wait_until_appear(self, by, elem_query, timeout_dur, fail_ok)
+        return self.find_or_fail(by, elem_query, fail_ok=True)
+
+    BaseBrowser.wait_for = sleeping_wait_for
+    BaseBrowser.wait_until_appear = sleeping_wait_until_appear
+    try:
+        yield
+    finally:
+        BaseBrowser.wait_for = wait_for
+        BaseBrowser.wait_until_appear = wait_until_appear
+
+
+def measure(client_name: str, resets: int, headless: bool) -> dict:
+    """Starts the client and resets its thread several times.
+
+    Args:
+        client_name (str): The name of the client.
+        resets (int): The number of thread resets.
+        headless (bool): Enables/disables headless mode.
+
+    Returns:
+        dict: The startup time and the mean reset time, in seconds.
+    """
+    started = time.perf_counter()
+    client = get_client(client_name)(headless=headless)
+    startup = time.perf_counter() - started
+
+    durations = []
+    for _ in range(resets):
+        started = time.perf_counter()
+        client.reset_thread()
+        durations.append(time.perf_counter() - started)
+    client.close()
+    return {"startup": startup, "reset": sum(durations) / max(len(durations), 1)}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("clients", nargs="+", choices=CLIENTS)
+    parser.add_argument("--resets", type=int, default=5)
+    parser.add_argument("--headful", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{'client':<12}{'':<8}{'startup':>10}{'reset':>10}")
+    for client_name in args.clients:
+        waits = measure(client_name, args.resets, not args.headful)
+        with fixed_sleeps():
+            sleeps = measure(client_name, args.resets, not args.headful)
+        for label, timing in (("sleeps", sleeps), ("waits", waits)):
+            print(f"{client_name:<12}{label:<8}{timing['startup']:>10.2f}{timing['reset']:>10.2f}")
+        print(
+            f"{client_name:<12}{'saved':<8}"
+            f"{sleeps['startup'] - waits['startup']:>10.2f}"
+            f"{sleeps['reset'] - waits['reset']:>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,15 +1,51 @@
-"""Initialization file of talkingheads library"""
-from .base_browser import BaseBrowser
-from .utils import is_url, check_filetype, detect_chrome_version
-from .model_library import ChatGPTClient, ClaudeClient, CopilotClient, \
-    GeminiClient, HuggingChatClient, LeChatClient, PiClient
-from .multiagent.multiagent import MultiAgent, Conversation
+"""Initialization file of talkingheads library
+
+The attributes are imported on first access (PEP 562), so that importing the package
+doesn't load selenium, pandas and the clients until they are used.
+"""
+import importlib
+
+_LAZY_ATTRIBUTES = {
+    "BaseBrowser": ".base_browser",
+    "PageStateError": ".base_browser",
+    "CompletionDetector": ".base_browser",
+    "StableTextDetector": ".base_browser",
+    "ButtonStateDetector": ".base_browser",
+    "MarkerDisappearanceDetector": ".base_browser",
+    "NetworkIdleDetector": ".base_browser",
+    "LatencyHistory": ".latency",
+    "is_url": ".utils",
+    "check_filetype": ".utils",
+    "detect_chrome_version": ".utils",
+    "ChatGPTClient": ".model_library",
+    "ClaudeClient": ".model_library",
+    "CopilotClient": ".model_library",
+    "GeminiClient": ".model_library",
+    "HuggingChatClient": ".model_library",
+    "LeChatClient": ".model_library",
+    "PiClient": ".model_library",
+    "MultiAgent": ".multiagent.multiagent",
+    "Conversation": ".multiagent.multiagent",
+    "BrowserPool": ".pool",
+    "get_client": ".registry",
+    "register_client": ".registry",
+    "unregister_client": ".registry",
+    "available_clients": ".registry",
+}
+_LAZY_SUBMODULES = {"model_library", "multiagent"}
 
 __all__ = [
     "is_url",
     "check_filetype",
     "detect_chrome_version",
     "BaseBrowser",
+    "PageStateError",
+    "CompletionDetector",
+    "StableTextDetector",
+    "ButtonStateDetector",
+    "MarkerDisappearanceDetector",
+    "NetworkIdleDetector",
+    "LatencyHistory",
     "ChatGPTClient",
     "ClaudeClient",
     "CopilotClient",
@@ -19,6 +55,26 @@ __all__ = [
     "PiClient",
     "MultiAgent",
     "Conversation",
+    "BrowserPool",
+    "get_client",
+    "register_client",
+    "unregister_client",
+    "available_clients",
     "model_library",
     "multiagent"
 ]
+
+
+def __getattr__(name):
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -22,23 +22,306 @@ with a chatbot or performing other automated web tasks.
 """
 
 import abc
+import base64
+import contextlib
+import json
 import os
 import logging
+import re
+import tempfile
+import threading
 import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
 from datetime import datetime
-from typing import Union, Dict, List
+from typing import Any, Callable, Union, Dict, Iterator, List, Tuple
 
 import undetected_chromedriver as uc
 import pandas as pd
 
 from selenium.webdriver.common.by import By
+from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.remote.webelement import WebElement
 import selenium.common.exceptions as Exceptions
 
-from .object_map import markers
-from .utils import detect_chrome_version, save_func_map
+from . import scripts
+from .latency import LatencyHistory
+from .object_map import fallbacks, markers, page_states
+from .selector_registry import SelectorRegistry
+from .session import decrypt_session, encrypt_session, get_passphrase
+from .utils import (
+    CACHE_DIR,
+    check_filetype,
+    detect_chrome_version,
+    resolve_driver,
+    save_func_map,
+    text_hash,
+    utf16_length,
+)
+
+# Locator strategies resolved in the page by the batched queries
+SCRIPT_LOCATORS = {By.XPATH, By.CSS_SELECTOR, By.TAG_NAME, By.CLASS_NAME, By.ID, By.NAME}
+
+LONG_PROMPT_INSTRUCTION = (
+    "The prompt is in the attached file {}. "
+    "Read it completely and respond to it as if it was written here."
+)
+
+# Default location of the persisted latency history
+LATENCY_PATH = os.path.join(CACHE_DIR, "latency.json")
+
+# Minimum time between two page state checks of the waits, in seconds
+PAGE_STATE_PERIOD = 0.5
+
+
+class PageStateError(RuntimeError):
+    """
+    Raised when the page is in a state blocking the interaction, such as a login wall,
+    a verification challenge, a usage cap or an error message.
+
+    Args:
+        client_name (str): Name of the client.
+        state (str): The name of the page state, see `object_map.page_states`.
+
+    Attributes:
+        client_name (str): Name of the client.
+        state (str): The name of the page state.
+    """
+
+    def __init__(self, client_name: str, state: str):
+        super().__init__(f"{client_name} page is blocked, state: {state}")
+        self.client_name = client_name
+        self.state = state
+
+
+class CompletionDetector(abc.ABC):
+    """
+    Base class of the strategies deciding whether a response is complete,
+    polled by `BaseBrowser.wait_completion`.
+
+    The polling period adapts to the generation speed. While the response grows,
+    the period is set to receive about `chunk_size` characters between two checks,
+    otherwise, the period backs off by `backoff` times.
+
+    Args:
+        min_period (float, optional): The shortest time between two checks. Default: 0.1.
+        max_period (float, optional): The longest time between two checks. Default: 1.
+        chunk_size (int, optional): The number of characters expected between two checks.
+            Default: 200.
+        backoff (float, optional): The period multiplier when there is no progress.
+            Default: 1.5.
+    """
+
+    def __init__(
+        self,
+        min_period: float = 0.1,
+        max_period: float = 1.0,
+        chunk_size: int = 200,
+        backoff: float = 1.5,
+    ):
+        self.min_period = min_period
+        self.max_period = max_period
+        self.chunk_size = chunk_size
+        self.backoff = backoff
+        self.period = min_period
+        self.started = time.monotonic()
+        self.last_progress = None
+
+    def reset(self, client: "BaseBrowser") -> None:
+        """
+        Prepares the detector for a new response.
+
+        Args:
+            client (BaseBrowser): The client waiting for the response.
+        """
+        self.period = self.min_period
+        self.started = time.monotonic()
+        self.last_progress = None
+
+    def observe(self, progress: int = None) -> None:
+        """
+        Adapts the polling period to the progress of the response.
+
+        Args:
+            progress (int, optional): The length of the response, None if unknown.
+        """
+        now = time.monotonic()
+        if progress is not None and self.last_progress is not None:
+            last_time, last_length = self.last_progress
+            if progress > last_length and now > last_time:
+                speed = (progress - last_length) / (now - last_time)
+                self.period = self.chunk_size / speed
+            else:
+                self.period *= self.backoff
+        elif progress is None:
+            self.period *= self.backoff
+        self.period = min(max(self.period, self.min_period), self.max_period)
+        if progress is not None:
+            self.last_progress = (now, progress)
+
+    @abc.abstractmethod
+    def check(self, client: "BaseBrowser") -> bool:
+        """
+        Checks the page once.
+
+        Args:
+            client (BaseBrowser): The client waiting for the response.
+
+        Returns:
+            bool: True if the response is complete.
+        """
+
+
+class StableTextDetector(CompletionDetector):
+    """
+    The response is complete once the last response is not empty and
+    its text doesn't change for `quiet_period` seconds.
+
+    Args:
+        by (By): The method used to locate the responses.
+        elem_query (str): The query string to locate the responses.
+        quiet_period (float, optional): Seconds without a change. Default: 1.5.
+    """
+
+    def __init__(self, by: By, elem_query: str, quiet_period: float = 1.5, **kwargs):
+        super().__init__(**kwargs)
+        self.by = by
+        self.elem_query = elem_query
+        self.quiet_period = quiet_period
+        self.text = None
+        self.changed_at = self.started
+
+    def reset(self, client):
+        super().reset(client)
+        self.text = None
+        self.changed_at = self.started
+
+    def check(self, client):
+        text = client.read_last_text(self.by, self.elem_query)
+        self.observe(len(text))
+        now = time.monotonic()
+        if text != self.text:
+            self.text = text
+            self.changed_at = now
+            return False
+        return bool(text.strip()) and now - self.changed_at >= self.quiet_period
+
+
+class ButtonStateDetector(CompletionDetector):
+    """
+    The response is complete once the button is present and enabled (or disabled).
+    The button is expected to leave that state while the response is generated, if it
+    doesn't in `appear_timeout` seconds, the generation is assumed to be over.
+
+    Args:
+        by (By): The method used to locate the button.
+        elem_query (str): The query string to locate the button.
+        enabled (bool, optional): The state of the button indicating completion. Default: True.
+        appear_timeout (float, optional): Seconds to wait for the busy state. Default: 5.
+    """
+
+    def __init__(
+        self, by: By, elem_query: str, enabled: bool = True, appear_timeout: float = 5.0, **kwargs
+    ):
+        super().__init__(**kwargs)
+        self.by = by
+        self.elem_query = elem_query
+        self.enabled = enabled
+        self.appear_timeout = appear_timeout
+        self.seen = False
+
+    def reset(self, client):
+        super().reset(client)
+        self.seen = False
+
+    def check(self, client):
+        flags = client.probe({"button": (self.by, self.elem_query)})["button"]
+        self.observe()
+        if not flags["present"] or flags["enabled"] != self.enabled:
+            self.seen = True
+            return False
+        return self.seen or time.monotonic() - self.started >= self.appear_timeout
+
+
+class MarkerDisappearanceDetector(CompletionDetector):
+    """
+    The response is complete once the marker, e.g. a stop button, disappears. If the
+    marker doesn't appear in `appear_timeout` seconds, the generation is assumed to be over.
+
+    Args:
+        by (By): The method used to locate the marker.
+        elem_query (str): The query string to locate the marker.
+        appear_timeout (float, optional): Seconds to wait for the marker. Default: 5.
+    """
+
+    def __init__(self, by: By, elem_query: str, appear_timeout: float = 5.0, **kwargs):
+        super().__init__(**kwargs)
+        self.by = by
+        self.elem_query = elem_query
+        self.appear_timeout = appear_timeout
+        self.seen = False
+
+    def reset(self, client):
+        super().reset(client)
+        self.seen = False
+
+    def check(self, client):
+        present = client.probe({"marker": (self.by, self.elem_query)})["marker"]["present"]
+        self.observe()
+        if present:
+            self.seen = True
+            return False
+        return self.seen or time.monotonic() - self.started >= self.appear_timeout
+
+
+class NetworkIdleDetector(CompletionDetector):
+    """
+    The response is complete once the requests of the page are finished and no request
+    starts for `idle_period` seconds. Requires the client to be created with
+    network_capture=True, so that the network events are recorded.
+
+    Args:
+        idle_period (float, optional): Seconds without network activity. Default: 1.
+        url_re (str, optional): Only the requests matching the pattern are followed.
+            Default: the `stream_url_re` marker, or every fetch/XHR request.
+    """
+
+    def __init__(self, idle_period: float = 1.0, url_re: str = None, **kwargs):
+        super().__init__(**kwargs)
+        self.idle_period = idle_period
+        self.url_re = url_re
+        self.pattern = None
+        self.in_flight = set()
+        self.active_at = None
+
+    def reset(self, client):
+        if not client.network_log:
+            raise RuntimeError("NetworkIdleDetector requires network_capture=True")
+        super().reset(client)
+        self.pattern = re.compile(self.url_re or client.markers.get("stream_url_re") or ".")
+        self.in_flight = set()
+        self.active_at = None
+
+    def check(self, client):
+        for entry in client.browser.get_log("performance"):
+            message = json.loads(entry["message"])["message"]
+            method, params = message["method"], message.get("params", {})
+            if method == "Network.requestWillBeSent":
+                if params.get("type") not in {"Fetch", "XHR", "EventSource"}:
+                    continue
+                if self.pattern.search(params["request"]["url"].split("?")[0]):
+                    self.in_flight.add(params["requestId"])
+                    self.active_at = time.monotonic()
+            elif method in {"Network.loadingFinished", "Network.loadingFailed"}:
+                if params.get("requestId") in self.in_flight:
+                    self.in_flight.discard(params["requestId"])
+                    self.active_at = time.monotonic()
+        self.observe()
+        if self.active_at is None or self.in_flight:
+            return False
+        return time.monotonic() - self.active_at >= self.idle_period
 
 
 class BaseBrowser:
@@ -68,6 +351,31 @@ class BaseBrowser:
         user_data_dir (str, optional): The directory path to user profile.
         uc_params (dict, optional): Additional parameters for undetected Chrome (uc.Chrome).
             Some examples : driver_executable_path, browser_executable_path
+            Unless driver_executable_path is given, a patched driver is cached per browser
+            version under ~/.talkingheads/drivers, see `utils.resolve_driver`.
+        network_capture (bool, optional): If True, the responses are read from the network
+            stream of the provider through the DevTools protocol instead of the page, for the
+            clients implementing `parse_stream`. Default: False.
+        long_prompt_limit (int, optional): If set, prompts longer than this many characters
+            are attached as a text file, for the clients supporting file attachments,
+            and a short instruction is typed instead. Default: None.
+        completion_detector (CompletionDetector, optional): The strategy deciding whether a
+            response is complete, when the in-page watcher is unavailable.
+            Default: the strategy returned by `get_completion_detector`.
+        page_agent (bool, optional): If True, a script built from the markers is injected
+            into the page to submit prompts and read the state with one call. Default: False.
+        adaptive_timeout (bool | str, optional): If set, the latency of the interactions is
+            recorded and the response timeouts are derived from it, see `LatencyHistory`.
+            A path sets the history file, otherwise ~/.talkingheads/latency.json is used.
+            Default: False.
+        session_path (str, optional): The encrypted session snapshot. If it exists, the
+            session is restored before the page is loaded and the login is skipped while
+            the session is valid. After a login, the snapshot is saved. The passphrase is
+            read from the TALKINGHEADS_SESSION_KEY environment variable. Default: None.
+        start_async (bool, optional): If True, the constructor returns immediately and the
+            browser is launched, loaded and logged in on a background thread. The
+            interactions and the other methods driving the browser wait until the warm-up
+            is finished, see `wait_ready`. Default: False.
 
     Attributes:
         client_name (str): Client name provided during initialization.
@@ -75,6 +383,8 @@ class BaseBrowser:
         markers (dict): Markers used for locating elements on the page.
         logger (logging.Logger): Logger for the browser class.
         ready (bool): Whether the browser is fully initialized and ready.
+        ready_future (Future): Resolved with the client once the warm-up is finished,
+            or with the exception which stopped it.
         timeout_dur (int): Page load and element wait timeout duration.
         chat_history (pd.DataFrame): DataFrame that holds chat history.
     """
@@ -102,9 +412,17 @@ class BaseBrowser:
         uc_params: dict = None,
         tag: str = None,
         multihead=False,
+        network_capture: bool = False,
+        long_prompt_limit: int = None,
+        page_agent: bool = False,
+        completion_detector: CompletionDetector = None,
+        adaptive_timeout: Union[bool, str] = False,
+        session_path: str = None,
+        start_async: bool = False,
     ):
         self.client_name = client_name
         self.markers = markers[client_name]
+        self.selectors = SelectorRegistry(self.markers, fallbacks.get(client_name))
         self.url = url
         self.uname_var = uname_var or f"{client_name}_UNAME"
         self.pwd_var = pwd_var or f"{client_name}_PWD"
@@ -117,26 +435,45 @@ class BaseBrowser:
         self.timeout_dur = timeout_dur
         self.multihead = multihead
         self.interim_response = None
+        self.read_cursors = {}
+        self.element_cache = {}
+        self.cache_stats = {"hits": 0, "misses": 0}
+        self.long_prompt_limit = long_prompt_limit
+        self.page_agent = page_agent
+        self.network_log = network_capture
+        self.network_capture = network_capture and "stream_url_re" in self.markers
+        self.completion_detector = completion_detector or self.get_completion_detector()
+        self.page_states = [
+            [name, state.get("xq"), state.get("url_re")]
+            for name, state in {
+                **page_states.default, **page_states.get(client_name, {})
+            }.items()
+        ]
+        self.state_checked = 0.0
+        self.deadline = None
+        self.latency = None
+        if adaptive_timeout:
+            self.latency = LatencyHistory.shared(
+                adaptive_timeout if isinstance(adaptive_timeout, str) else LATENCY_PATH
+            )
+        self.submitted = None
+        self.session_path = session_path
+        self.ready_future = Future()
+        self.warm_up_thread = None
+        has_session = bool(session_path) and os.path.exists(session_path)
+
+        if credential_check and (username or password):
+            logging.warning(
+                "The username and password parameters are deprecated and will be removed soon."
+                " Please adjust your environment variables to pass username and password."
+            )
 
-        if credential_check:
-            if username or password:
-                logging.warning(
-                    "The username and password parameters are deprecated and will be removed soon."
-                    " Please adjust your environment variables to pass username and password."
-                )
-
-            username = username or os.environ.get(self.uname_var)
-            password = password or os.environ.get(self.pwd_var)
-
-            if not username:
-                raise NameError(
-                    f"Either provide username or set the environment variable {self.uname_var}"
-                )
-
-            if not password:
-                raise NameError(
-                    f"Either provide password or set the environment variable {self.pwd_var}"
-                )
+        # The credentials are resolved even if there is a session, as it may be invalid
+        username = username or os.environ.get(self.uname_var)
+        password = password or os.environ.get(self.pwd_var)
+        self.credential_check = credential_check
+        if credential_check and not has_session:
+            self.check_credentials(username, password)
 
         # Create a new of the logger
         r_level = logging.getLogger().getEffectiveLevel()
@@ -172,28 +509,109 @@ class BaseBrowser:
 
             _ = list(map(options.add_argument, driver_arguments))
 
+        if self.network_log:
+            options.set_capability("goog:loggingPrefs", {"performance": "ALL"})
+        if self.network_log and not self.network_capture:
+            self.logger.warning(
+                "Network capture is not supported by %s, only network events are recorded",
+                self.client_name,
+            )
+
+        self.chat_history = pd.DataFrame(columns=["role", "is_regen", "content"])
+        self.set_save_path(save_path)
+
+        warm_up_args = (
+            options, uc_params, user_data_dir, driver_version,
+            cold_start, skip_login, username, password,
+        )
+        if start_async:
+            self.warm_up_thread = threading.Thread(
+                target=self._run_warm_up, args=warm_up_args,
+                name=f"{self.tag}-warm-up", daemon=True,
+            )
+            self.warm_up_thread.start()
+        else:
+            self._run_warm_up(*warm_up_args)
+            self.ready_future.result()
+
+    def _run_warm_up(self, *args) -> None:
+        # The waits within the warm-up must not wait for the warm-up itself
+        self.warm_up_thread = threading.current_thread()
+        try:
+            self.warm_up(*args)
+        except BaseException as err:
+            self.logger.error("Unable to warm up %s: %s", self.client_name, err)
+            self.ready_future.set_exception(err)
+        else:
+            self.ready_future.set_result(self)
+
+    def warm_up(
+        self,
+        options: uc.ChromeOptions,
+        uc_params: dict,
+        user_data_dir: str,
+        driver_version: int,
+        cold_start: bool,
+        skip_login: bool,
+        username: Union[str, None],
+        password: Union[str, None],
+    ) -> None:
+        """
+        Launches the browser, loads the page, passes the verification and logs in.
+        It runs in the constructor, or on a background thread if start_async is set.
+
+        Args:
+            options (uc.ChromeOptions): The options of the browser.
+            uc_params (dict): Additional parameters for undetected Chrome.
+            user_data_dir (str): The directory path to user profile.
+            driver_version (int): Version of the ChromeDriver to use.
+            cold_start (bool): If True, load the page and return.
+            skip_login (bool): If True, skips the login procedure.
+            username (str): The username.
+            password (str): The password.
+
+        Raises:
+            RuntimeError: If the verification fails.
+        """
         self.logger.info("Loading undetected Chrome")
-        uc_params = uc_params or {}
+        uc_params = dict(uc_params or {})
+        version_main = detect_chrome_version(
+            driver_version, uc_params.get("browser_executable_path")
+        )
+        if version_main and not uc_params.get("driver_executable_path"):
+            try:
+                uc_params["driver_executable_path"] = resolve_driver(version_main)
+            except (OSError, ValueError) as err:
+                self.logger.warning("Unable to resolve a cached driver: %s", err)
         self.browser = uc.Chrome(
             user_data_dir=user_data_dir,
             options=options,
-            headless=headless,
-            version_main=detect_chrome_version(driver_version),
+            headless=self.headless,
+            version_main=version_main,
             **uc_params,
         )
         # self.browser.set_page_load_timeout(timeout_dur)
-        self.wait_object = WebDriverWait(self.browser, timeout_dur)
+        self.wait_object = WebDriverWait(self.browser, self.timeout_dur)
 
         agent = self.browser.execute_script("return navigator.userAgent")
         self.browser.execute_cdp_cmd(
             "Network.setUserAgentOverride", {"userAgent": agent.replace("Headless", "")}
         )
+        if self.network_log:
+            self.browser.execute_cdp_cmd("Network.enable", {})
 
         self.logger.info("Loaded undetected Chrome")
         self.logger.info("Opening %s", self.client_name)
 
+        session_path = self.session_path
+        has_session = bool(session_path) and os.path.exists(session_path)
+        restored = has_session and self.restore_session(session_path)
         self.preload_custom_func()
         self.browser.get(self.url)
+        if restored:
+            self.browser.execute_cdp_cmd(
+                "Page.removeScriptToEvaluateOnNewDocument", {"identifier": restored}
+            )
         if cold_start:
             return
 
@@ -201,21 +619,186 @@ class BaseBrowser:
         if not self.pass_verification():
             raise RuntimeError("Verification failed, please check your connection.")
 
-        if not skip_login:
-            self.login(username, password)
+        if restored and not self.is_session_valid():
+            self.logger.warning("Restored session is not valid, logging in")
+            restored = False
+        if not skip_login and not restored:
+            if self.credential_check:
+                self.check_credentials(username, password)
+            if self.login(username, password) and session_path:
+                self.save_session(session_path)
 
         self.logger.info("%s is ready to interact", self.client_name)
         self.ready = True
-        self.chat_history = pd.DataFrame(columns=["role", "is_regen", "content"])
-        self.set_save_path(save_path)
+
+    def check_credentials(self, username: Union[str, None], password: Union[str, None]) -> None:
+        """
+        Checks that the credentials required by the login are given.
+
+        Args:
+            username (str): The username.
+            password (str): The password.
+
+        Raises:
+            NameError: If the username or the password is missing.
+        """
+        if not username:
+            raise NameError(
+                f"Either provide username or set the environment variable {self.uname_var}"
+            )
+
+        if not password:
+            raise NameError(
+                f"Either provide password or set the environment variable {self.pwd_var}"
+            )
+
+    def wait_ready(self, timeout: float = None) -> bool:
+        """
+        Blocks until the warm-up is finished, for the clients started with start_async.
+
+        Args:
+            timeout (float, optional): The seconds to wait. Default: None, waits until
+                the warm-up is finished.
+
+        Returns:
+            bool: Whether the client is ready to interact, False after a cold start.
+
+        Raises:
+            TimeoutError: If the warm-up isn't finished before the timeout.
+            Exception: The exception which stopped the warm-up.
+        """
+        if not self.ready_future.done() and threading.current_thread() is self.warm_up_thread:
+            return self.ready
+        try:
+            self.ready_future.result(timeout)
+        except FutureTimeoutError as err:
+            raise TimeoutError(
+                f"{self.client_name} is not ready after {timeout} seconds"
+            ) from err
+        return self.ready
 
     def __del__(self):
+        self.close()
+
+        if self.auto_save:
+            self.save()
+
+    def close(self) -> None:
+        """Quits the browser, the client can't interact afterwards."""
+        if getattr(self, "latency", None):
+            self.latency.save()
         if self.browser is not None:
             self.browser.close()
             self.browser.quit()
+            self.browser = None
+        self.ready = False
 
-        if self.auto_save:
-            self.save()
+    def save_session(self, path: str, passphrase: str = None) -> bool:
+        """
+        Saves the cookies of the browser and the localStorage and sessionStorage of the
+        current page to an encrypted snapshot, to restore the login on the next start.
+
+        Args:
+            path (str): The path of the snapshot.
+            passphrase (str, optional): The passphrase of the encryption.
+                Default: the TALKINGHEADS_SESSION_KEY environment variable.
+
+        Returns:
+            bool: True if the snapshot is saved, False otherwise.
+        """
+        self.wait_ready()
+        try:
+            cookies = self.browser.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+            origin, local, session = self.browser.execute_script(scripts.READ_STORAGE)
+        except Exceptions.WebDriverException as err:
+            self.logger.error("Unable to read the session: %s", err.msg)
+            return False
+
+        snapshot = {
+            "client": self.client_name,
+            "saved": datetime.now().isoformat(),
+            "origin": origin,
+            "cookies": cookies,
+            "local": local,
+            "session": session,
+        }
+        try:
+            blob = encrypt_session(snapshot, get_passphrase(passphrase))
+        except (NameError, ImportError) as err:
+            self.logger.error("Unable to encrypt the session: %s", err)
+            return False
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, "wb") as file:
+            file.write(blob)
+        os.chmod(path, 0o600)
+        self.logger.info("Session is saved to %s", path)
+        return True
+
+    def restore_session(self, path: str, passphrase: str = None) -> Union[str, None]:
+        """
+        Restores an encrypted session snapshot before the page is loaded. The cookies are
+        set through the DevTools protocol and the storage is written by a script which
+        runs before the scripts of the page.
+
+        Args:
+            path (str): The path of the snapshot.
+            passphrase (str, optional): The passphrase of the encryption.
+                Default: the TALKINGHEADS_SESSION_KEY environment variable.
+
+        Returns:
+            str | None: The identifier of the storage script, to be removed after the
+                page is loaded, None if the session is not restored.
+        """
+        try:
+            with open(path, "rb") as file:
+                snapshot = decrypt_session(file.read(), get_passphrase(passphrase))
+        except (OSError, ValueError, NameError, ImportError) as err:
+            self.logger.error("Unable to read the session snapshot: %s", err)
+            return None
+        if not isinstance(snapshot, dict) or snapshot.get("client") != self.client_name:
+            self.logger.error("The session snapshot doesn't belong to %s", self.client_name)
+            return None
+
+        cookie_fields = {"name", "value", "domain", "path", "secure", "httpOnly", "sameSite"}
+        try:
+            cookies = []
+            for cookie in snapshot["cookies"]:
+                restored = {key: val for key, val in cookie.items() if key in cookie_fields}
+                if not cookie.get("session") and cookie.get("expires", -1) > 0:
+                    restored["expires"] = cookie["expires"]
+                cookies.append(restored)
+
+            self.browser.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+            # The block keeps the declarations out of the global scope of the page
+            source = "{\nconst [origin, local, session] = %s;\n%s}" % (
+                json.dumps([snapshot["origin"], snapshot["local"], snapshot["session"]]),
+                scripts.WRITE_STORAGE,
+            )
+            result = self.browser.execute_cdp_cmd(
+                "Page.addScriptToEvaluateOnNewDocument", {"source": source}
+            )
+        except (KeyError, TypeError, AttributeError, Exceptions.WebDriverException) as err:
+            self.logger.error("Unable to restore the session snapshot: %s", err)
+            return None
+        self.logger.info("Session is restored from %s", path)
+        return result["identifier"]
+
+    def is_session_valid(self) -> bool:
+        """
+        Checks whether the restored session is logged in, that is the prompt input is
+        present and neither the login page nor the login button is displayed.
+
+        Returns:
+            bool: True if the session is valid, False otherwise.
+        """
+        self.wait_ready()
+        by, elem_query, _ = self.get_input_marker()
+        if not self.wait_until_appear(by, elem_query, timeout_dur=15, fail_ok=True):
+            return False
+        if self.classify_page() == "login":
+            return False
+        return "login_xq" not in self.markers or not self.is_login_page()
 
     def set_timeout_dur(self, timeout_dur: int):
         """
@@ -258,6 +841,119 @@ class BaseBrowser:
         self.logger.error("Unsupported file type %s", self.file_type)
         return False
 
+    @contextlib.contextmanager
+    def deadline_scope(self, timeout: float = None, deadline: float = None) -> Iterator[None]:
+        """
+        Bounds every wait within the scope by a common deadline. The waits receive the
+        remaining time instead of their own timeout if it is shorter, and raise
+        TimeoutError once the deadline has passed. Nested scopes keep the earliest deadline.
+        The scope waits for the warm-up of the client first, within the same deadline.
+
+        Args:
+            timeout (float, optional): The time budget of the scope in seconds. Default: None.
+            deadline (float, optional): The absolute end time of the scope, as returned
+                by `time.time()`. Default: None.
+
+        Yields:
+            None
+        """
+        previous = self.deadline
+        bounds = [previous] if previous is not None else []
+        if timeout is not None:
+            bounds.append(time.monotonic() + timeout)
+        if deadline is not None:
+            bounds.append(time.monotonic() + deadline - time.time())
+        self.deadline = min(bounds) if bounds else None
+        try:
+            self.wait_ready(
+                None if self.deadline is None else max(self.deadline - time.monotonic(), 0)
+            )
+            yield
+        finally:
+            self.deadline = previous
+
+    def remaining_time(self, timeout_dur: float = None) -> float:
+        """
+        Returns the waiting time of a wait, bounded by the deadline of the current scope.
+
+        Args:
+            timeout_dur (float, optional): The timeout of the wait. Default: timeout_dur.
+
+        Returns:
+            float: The waiting time in seconds.
+
+        Raises:
+            TimeoutError: If the deadline has passed.
+        """
+        timeout_dur = timeout_dur or self.timeout_dur
+        if self.deadline is None:
+            return timeout_dur
+        self.check_deadline()
+        return min(timeout_dur, self.deadline - time.monotonic())
+
+    def check_deadline(self) -> None:
+        """
+        Raises TimeoutError if the deadline of the current scope has passed.
+
+        Raises:
+            TimeoutError: If the deadline has passed.
+        """
+        if self.deadline is not None and time.monotonic() >= self.deadline:
+            self.logger.error("The deadline of the interaction is exceeded")
+            raise TimeoutError(f"{self.client_name} exceeded the deadline of the interaction")
+
+    def waiter(self, timeout_dur: float = None) -> WebDriverWait:
+        """
+        Returns a WebDriverWait bounded by the deadline of the current scope.
+
+        Args:
+            timeout_dur (float, optional): The timeout of the wait. Default: timeout_dur.
+
+        Returns:
+            WebDriverWait: The wait object.
+        """
+        if self.deadline is None and timeout_dur is None:
+            return self.wait_object
+        return WebDriverWait(self.browser, self.remaining_time(timeout_dur))
+
+    def wait_for(
+        self, condition: Callable, timeout_dur: float = None, period: float = 0.1
+    ) -> Any:
+        """
+        Waits until the condition holds, in place of a fixed sleep.
+
+        Args:
+            condition (Callable): A function of the driver, e.g. an expected condition,
+                returning a truthy value once the page is in the expected state.
+            timeout_dur (float, optional): Waiting time before the timeout. Default: timeout_dur.
+            period (float, optional): Time between two checks. Default: 0.1.
+
+        Returns:
+            Any: The value returned by the condition, None if timed out.
+        """
+        try:
+            return WebDriverWait(
+                self.browser, self.remaining_time(timeout_dur), poll_frequency=period
+            ).until(condition)
+        except Exceptions.TimeoutException:
+            self.check_deadline()
+            return None
+
+    def wait_page_loaded(self, timeout_dur: float = None) -> bool:
+        """
+        Waits until the document of the current page is completely loaded.
+
+        Args:
+            timeout_dur (float, optional): Waiting time before the timeout. Default: timeout_dur.
+
+        Returns:
+            bool: True if the page is loaded, False if timed out.
+        """
+        return bool(self.wait_for(
+            lambda driver: driver.execute_script("return document.readyState") == "complete",
+            timeout_dur,
+        ))
+
     def find_or_fail(
         self,
         by: By,
@@ -266,6 +962,7 @@ class BaseBrowser:
         return_shadow: bool = False,
         fail_ok: bool = False,
         dom_element: WebElement = None,
+        use_cache: bool = False,
     ) -> Union[WebElement, None]:
         """
         Finds elements based on the provided query and locator method.
@@ -278,6 +975,8 @@ class BaseBrowser:
             return_shadow (bool, optional): If True, returns the shadow root of the element. Default is False.
             fail_ok (bool): o not produce error if it is ok to fail.
             dom_element (WebElement): If set, finds within that element.
+            use_cache (bool): If set, reuses the element found by the previous call
+                until it is detached from the page. Only for the 'first' return type.
         Returns:
             WebElement: The found web element or None if not found.
         """
@@ -285,12 +984,26 @@ class BaseBrowser:
         if return_type not in {"first", "last", "all"}:
             return ValueError("Unrecognized return type")
 
-        if dom_element is None:
-            dom_element = self.browser.find_elements(by, elem_query)
-        else:
-            dom_element = dom_element.find_elements(by, elem_query)
-
-        if not dom_element:
+        use_cache = use_cache and return_type == "first" and dom_element is None
+        element = None
+        if use_cache:
+            element = self.element_cache.get((by, elem_query))
+            if element is not None and self.is_attached(element):
+                self.cache_stats["hits"] += 1
+                self.logger.debug(" %s is reused from the cache.", elem_query)
+            else:
+                self.cache_stats["misses"] += 1
+                self.element_cache.pop((by, elem_query), None)
+                element = None
+
+        if element is None:
+            element = self.find_many(
+                {elem_query: (by, elem_query, return_type)}, dom_element=dom_element
+            )[elem_query]
+            if use_cache and element is not None:
+                self.element_cache[(by, elem_query)] = element
+
+        if element is None:
             if not fail_ok:
                 self.logger.error(
                     " %s is not located. Please raise an issue with verbose=True",
@@ -302,12 +1015,6 @@ class BaseBrowser:
 
         self.logger.info(" %s is located.", elem_query)
 
-        element = {
-            "first": lambda x: x[0],
-            "all": lambda x: x,
-            "last": lambda x: x[-1],
-        }[return_type](dom_element)
-
         if return_shadow and return_type == "all":
             self.logger.warning(
                 "Returning shadow root of a list of elements is not implemented."
@@ -317,6 +1024,234 @@ class BaseBrowser:
 
         return element
 
+    def read_last_text(self, by: By, elem_query: str) -> str:
+        """
+        Returns the text content of the last element matching the query, transferring
+        only the part appended since the previous read.
+
+        A cursor is kept in the page for each query. The length and the hash of the
+        text read so far are sent along, therefore an unchanged element costs a few bytes
+        and a stale cursor (e.g. after a page load) is detected and the text is re-read.
+
+        Args:
+            by (selenium.webdriver.common.by.By): The method used to locate the element.
+            elem_query (str): The query string to locate the element.
+
+        Returns:
+            str: The text content of the last element, empty string if it is not located.
+        """
+        key = f"{by}:{elem_query}"
+        for _ in range(2):
+            text, hash_ = self.read_cursors.pop(key, ("", text_hash("")))
+            result = self.browser.execute_script(
+                scripts.READ_DELTA, by, elem_query, key, utf16_length(text), hash_
+            )
+            if result["reset"]:
+                text, hash_ = "", text_hash("")
+            text += result["delta"]
+            hash_ = text_hash(result["delta"], hash_)
+            if utf16_length(text) == result["length"] and hash_ == result["hash"]:
+                self.read_cursors[key] = (text, hash_)
+                break
+            self.logger.warning("Incremental read of %s is inconsistent", elem_query)
+        return text
+
+    def attach_file(self, file_path: str) -> bool:
+        """
+        Attaches a file to the prompt through the file input of the provider
+        and waits until the upload is finished.
+
+        Requires the `file_upload_xq` marker, `file_loaded_xq` marks the finished upload.
+
+        Args:
+            file_path (str): The path to the file.
+
+        Returns:
+            bool: True if the file is attached, False otherwise.
+        """
+        if "file_upload_xq" not in self.markers:
+            self.logger.info("File attachment is not supported by %s", self.client_name)
+            return False
+        # Text files have no signature, their extension is checked instead.
+        extension = os.path.splitext(file_path)[1].lstrip(".")
+        if extension not in self.markers.file_types and \
+                not check_filetype(file_path, self.markers.file_types):
+            self.logger.error(
+                "File type should be one of the following: %s",
+                ", ".join(self.markers.file_types)
+            )
+            return False
+
+        file_input = self.find_or_fail(By.XPATH, self.markers.file_upload_xq)
+        if not file_input:
+            return False
+        file_input.send_keys(os.path.abspath(file_path))
+
+        if "file_loaded_xq" in self.markers:
+            if not self.wait_until_appear(By.XPATH, self.markers.file_loaded_xq):
+                self.logger.error("File upload failed.")
+                return False
+        self.logger.info("File %s is attached", file_path)
+        return True
+
+    def attach_long_prompt(self, prompt: str) -> str:
+        """
+        If the prompt exceeds `long_prompt_limit`, writes it to a temporary text file,
+        attaches the file and returns a short instruction to type instead.
+        The file is deleted once it is attached.
+
+        Args:
+            prompt (str): The interaction text.
+
+        Returns:
+            str: The text to type, the prompt itself if it is not attached.
+        """
+        if not self.long_prompt_limit or len(prompt) <= self.long_prompt_limit:
+            return prompt
+        if "file_upload_xq" not in self.markers:
+            return prompt
+
+        with tempfile.NamedTemporaryFile(
+            "w", suffix=".txt", prefix="prompt_", delete=False, encoding="utf-8"
+        ) as fd:
+            fd.write(prompt)
+        try:
+            attached = self.attach_file(fd.name)
+        finally:
+            os.remove(fd.name)
+
+        if not attached:
+            self.logger.warning("Unable to attach the long prompt, typing instead")
+            return prompt
+
+        self.logger.info("Prompt of %d characters is attached as a file", len(prompt))
+        return LONG_PROMPT_INSTRUCTION.format(os.path.basename(fd.name))
+
+    def type_prompt(self, text_area: WebElement, prompt: str) -> bool:
+        """
+        Writes the prompt into the text area without sending it.
+        Long prompts are attached as a file, see `attach_long_prompt`.
+
+        The prompt is inserted at once, through a paste event for rich text editors
+        or the DevTools Input.insertText command for text areas, so the duration
+        doesn't depend on the prompt length. If the inserted content can't be verified,
+        the text area is cleared and the prompt is typed line by line,
+        pressing SHIFT+ENTER for each line.
+
+        Args:
+            text_area (WebElement): The input element of the prompt.
+            prompt (str): The interaction text.
+
+        Returns:
+            bool: True if the prompt is inserted at once, False if it is typed.
+        """
+        prompt = self.attach_long_prompt(prompt)
+        try:
+            mode = self.browser.execute_script(scripts.INSERT_TEXT, text_area, prompt)
+            if mode == "native":
+                self.browser.execute_cdp_cmd("Input.insertText", {"text": prompt})
+            content = self.browser.execute_script(scripts.INPUT_VALUE, text_area) or ""
+            if "".join(prompt.split()) in "".join(content.split()):
+                self.logger.info("Prompt is inserted with %s input", mode)
+                return True
+            self.logger.warning("Inserted prompt doesn't match, typing instead")
+            text_area.send_keys(Keys.CONTROL + "a", Keys.DELETE)
+        except Exceptions.WebDriverException as err:
+            self.logger.warning("Unable to insert the prompt, typing instead: %s", err.msg)
+
+        for each_line in prompt.split("\n"):
+            text_area.send_keys(each_line)
+            text_area.send_keys(Keys.SHIFT + Keys.ENTER)
+        return False
+
+    def is_attached(self, element: WebElement) -> bool:
+        """
+        Checks if the element is still attached to the page, without locating it again.
+
+        Args:
+            element (WebElement): The element to check.
+
+        Returns:
+            bool: False if the element is removed or the page is navigated away.
+        """
+        try:
+            return self.browser.execute_script("return arguments[0].isConnected", element)
+        except Exceptions.WebDriverException:
+            return False
+
+    def find_many(
+        self,
+        queries: Dict[str, Tuple],
+        dom_element: WebElement = None,
+    ) -> Dict[str, Union[WebElement, List[WebElement], None]]:
+        """
+        Finds the elements of several queries with one script call.
+        The queries are compiled by the selector registry, which tries the CSS equivalent
+        of the XPath queries and the fallback queries of the markers.
+
+        Args:
+            queries (Dict[str, Tuple]): The queries by their names, each query is a tuple of
+                (by, elem_query) or (by, elem_query, return_type), where return_type is
+                one of 'first', 'all' or 'last'. Default return type is 'first'.
+            dom_element (WebElement, optional): If set, finds within that element.
+
+        Returns:
+            Dict[str, Union[WebElement, List[WebElement], None]]: The found element(s)
+                by query name, None if the query doesn't match any element.
+        """
+        queries = {
+            name: (query[0], query[1], query[2] if len(query) > 2 else "first")
+            for name, query in queries.items()
+        }
+        # XPath queries starting with '//' search the whole document even within an element,
+        # unlike their CSS equivalent, hence the scoped lookups are not compiled.
+        in_page = {
+            name: [
+                self.selectors.compile(by, elem_query)
+                if dom_element is None
+                else [(by, elem_query)],
+                return_type,
+            ]
+            for name, (by, elem_query, return_type) in queries.items()
+            if by in SCRIPT_LOCATORS
+        }
+        found = {}
+        if in_page:
+            results = self.browser.execute_script(scripts.FIND_MANY, in_page, dom_element)
+            for name, result in results.items():
+                by, elem_query, _ = queries[name]
+                if dom_element is None:
+                    self.selectors.record(by, elem_query, result["index"], result["cost"])
+                found[name] = result["value"]
+
+        for name, (by, elem_query, return_type) in queries.items():
+            if name in in_page:
+                continue
+            elements = (dom_element or self.browser).find_elements(by, elem_query)
+            found[name] = {
+                "first": lambda x: x[0],
+                "all": lambda x: x,
+                "last": lambda x: x[-1],
+            }[return_type](elements) if elements else None
+        return found
+
+    def probe(self, queries: Dict[str, Tuple[By, str]]) -> Dict[str, Dict[str, Any]]:
+        """
+        Checks the first element of several queries with one script call,
+        without transferring the elements.
+
+        Args:
+            queries (Dict[str, Tuple[By, str]]): The queries by their names.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The flags 'present', 'visible', 'enabled'
+                and the number of matches 'count' by query name.
+        """
+        return self.browser.execute_script(
+            scripts.PROBE,
+            {name: self.selectors.compile(*query[:2]) for name, query in queries.items()},
+        )
+
     def is_login_page(self):
         """
         Checks whether the login page is currently displayed.
@@ -324,8 +1259,46 @@ class BaseBrowser:
         Returns:
             bool: True if the login button is not present, False otherwise.
         """
-        login_button = self.browser.find_elements(By.XPATH, self.markers.login_xq)
-        return len(login_button) == 1
+        flags = self.probe({"login": (By.XPATH, self.markers.login_xq)})
+        return flags["login"]["count"] == 1
+
+    def classify_page(self) -> Union[str, None]:
+        """
+        Classifies the page by the page state markers of the client, with one script call.
+
+        Returns:
+            str | None: The name of the blocking state (e.g. 'challenge', 'login',
+                'usage_cap', 'error'), None if the page is not blocked.
+        """
+        try:
+            return self.browser.execute_script(scripts.PAGE_STATE, self.page_states)
+        except Exceptions.WebDriverException as err:
+            self.logger.debug("Unable to classify the page: %s", err.msg)
+            return None
+
+    def check_page_state(self, force: bool = False) -> None:
+        """
+        Aborts the current wait if the page is blocked, so that the waits fail immediately
+        instead of running until the timeout. The check is active once the client is ready,
+        as the challenge and login pages are expected before, and runs at most once per
+        PAGE_STATE_PERIOD seconds unless forced.
+
+        Args:
+            force (bool, optional): If True, checks regardless of the last check. Default: False.
+
+        Raises:
+            PageStateError: If the page is in a blocking state.
+        """
+        if not self.ready:
+            return
+        now = time.monotonic()
+        if not force and now - self.state_checked < PAGE_STATE_PERIOD:
+            return
+        self.state_checked = now
+        state = self.classify_page()
+        if state:
+            self.logger.error("Page is blocked by the %s state", state)
+            raise PageStateError(self.client_name, state)
 
     def wait_until_appear(
         self, by: By, elem_query: str, timeout_dur: int = None, fail_ok=False
@@ -345,15 +1318,20 @@ class BaseBrowser:
 
         Returns:
             WebElement | None: The web element if found, otherwise None.
+
+        Raises:
+            PageStateError: If the page gets blocked while waiting.
         """
         self.logger.info("Waiting element %s to appear.", elem_query)
         element = None
+        condition = EC.presence_of_element_located((by, elem_query))
         try:
-            element = WebDriverWait(
-                self.browser, timeout_dur or self.timeout_dur
-            ).until(EC.presence_of_element_located((by, elem_query)))
+            element = self.waiter(timeout_dur).until(
+                lambda driver: self.check_page_state() or condition(driver)
+            )
             self.logger.info("Element %s appeared.", elem_query)
         except Exceptions.TimeoutException:
+            self.check_deadline()
             if not fail_ok:
                 self.logger.error(
                     "Element %s is not present, something is wrong.", elem_query
@@ -375,16 +1353,21 @@ class BaseBrowser:
 
         Returns:
             (bool) : True if element disappears, false otherwise.
+
+        Raises:
+            PageStateError: If the page gets blocked while waiting.
         """
         if self.multihead:
             return self._multihead_wait(by, elem_query)
 
         self.logger.info("Waiting element %s to disappear.", elem_query)
+        condition = EC.invisibility_of_element_located((by, elem_query))
         try:
-            self.wait_object.until(EC.invisibility_of_element_located((by, elem_query)))
+            self.waiter().until(lambda driver: self.check_page_state() or condition(driver))
             self.logger.info("Element %s disappeared.", elem_query)
             return True
         except Exceptions.TimeoutException:
+            self.check_deadline()
             self.logger.info("Element %s still here, something is wrong.", elem_query)
             return False
 
@@ -405,16 +1388,481 @@ class BaseBrowser:
         """
         self.logger.info("Waiting element %s to disappear.", elem_query)
 
-        for _ in range(int(self.timeout_dur / pool_time)):
+        for _ in range(int(self.remaining_time() / pool_time)):
+            self.check_page_state()
             item = self.find_or_fail(by, elem_query, fail_ok=True)
             if not item:
                 self.logger.debug("The item %s %s is not located", by, elem_query)
                 return True
             logging.debug("The item is still present, waiting")
             time.sleep(pool_time)
+        self.check_deadline()
         logging.error("Item is still present")
         return False
 
+    def watch_response(
+        self,
+        by: By,
+        elem_query: str,
+        busy_query: str = None,
+        busy_by: By = By.XPATH,
+    ) -> bool:
+        """
+        Installs a MutationObserver based watcher on the last element matching the query.
+
+        The watcher must be installed before the prompt is sent, it records the number of
+        responses and the text of the last one as the baseline. Afterwards, `wait_response`
+        long-polls the watcher and returns once the response is settled.
+
+        Args:
+            by (selenium.webdriver.common.by.By): The method used to locate the responses.
+            elem_query (str): The query string to locate the responses.
+            busy_query (str, optional): The query of an element which is present while the
+                response is being generated (e.g. a stop button). Default: None.
+            busy_by (selenium.webdriver.common.by.By, optional): The method used to locate
+                the busy element. Default: By.XPATH.
+
+        Returns:
+            bool: True if the watcher is installed, False otherwise.
+        """
+        if self.network_log:
+            # Drop the events of the previous requests
+            self.browser.get_log("performance")
+        try:
+            self.browser.execute_script(
+                scripts.WATCH_RESPONSE, by, elem_query, busy_by, busy_query
+            )
+        except Exceptions.WebDriverException as err:
+            self.logger.warning("Unable to install the response watcher: %s", err.msg)
+            return False
+        self.logger.info("Response watcher is installed for %s", elem_query)
+        return True
+
+    def wait_response(
+        self,
+        quiet_period: float = 1.5,
+        timeout_dur: int = None,
+        poll_dur: float = 10,
+    ) -> Union[str, None]:
+        """
+        Waits until the response watched by `watch_response` is settled and returns it.
+
+        The waiting happens in the browser, `execute_async_script` resolves the moment the
+        busy element disappears or the response doesn't change for `quiet_period` seconds.
+        Each call is capped by `poll_dur` to stay below the script timeout of the driver.
+
+        Args:
+            quiet_period (float, optional): Seconds without a change in the response to
+                consider it complete, if the busy element is absent. Default: 1.5.
+            timeout_dur (int, optional): Waiting time before the timeout. Default: timeout_dur.
+            poll_dur (float, optional): The maximum duration of one long-poll. Default: 10.
+
+        Returns:
+            str | None: The response text, None if the watcher is not available, in which
+                case the caller may fall back to polling the page.
+
+        Raises:
+            PageStateError: If the page gets blocked while waiting.
+            TimeoutError: If the response is not settled before the timeout. The network
+                capture and the watcher share the same timeout.
+        """
+        timeout_dur = self.response_timeout(timeout_dur)
+        with self.deadline_scope(timeout_dur):
+            if self.network_capture:
+                response = self.capture_response(timeout_dur)
+                if response is not None:
+                    self.record_latency()
+                    return response
+
+            deadline = time.monotonic() + self.remaining_time(timeout_dur)
+            while (remaining := deadline - time.monotonic()) > 0:
+                try:
+                    result = self.browser.execute_async_script(
+                        scripts.AWAIT_RESPONSE,
+                        int(quiet_period * 1000),
+                        int(min(poll_dur, remaining) * 1000),
+                        self.page_states if self.ready else [],
+                    )
+                except Exceptions.WebDriverException as err:
+                    self.logger.warning("Response watcher failed: %s", err.msg)
+                    return None
+                if result is None:
+                    self.logger.info("Response watcher is not installed")
+                    return None
+                if result.get("state"):
+                    self.logger.error("Page is blocked by the %s state", result["state"])
+                    raise PageStateError(self.client_name, result["state"])
+                if result["done"]:
+                    self.logger.info("Response is settled")
+                    self.record_latency(result.get("sinceFirstChange"))
+                    return result["text"]
+                self.logger.debug(
+                    "Response is still generating, length: %d", result["length"]
+                )
+
+            self.check_deadline()
+        self.logger.error("Response is not settled before the timeout")
+        raise TimeoutError(
+            f"The response of {self.client_name} is not settled before the timeout"
+        )
+
+    def capture_response(
+        self, timeout_dur: int = None, poll_period: float = 0.1
+    ) -> Union[str, None]:
+        """
+        Reads the response from the network stream of the provider.
+
+        The DevTools network events are followed until the request matching the
+        `stream_url_re` marker finishes, then its body is fetched through
+        `Network.getResponseBody` and assembled by `parse_stream`.
+        Requires the client to be created with network_capture=True.
+
+        Args:
+            timeout_dur (int, optional): Waiting time before the timeout. Default: timeout_dur.
+            poll_period (float, optional): Sleep time between reads of the event log.
+                Default: 0.1 seconds.
+
+        Returns:
+            str | None: The response text, None if the request fails or can't be read.
+
+        Raises:
+            TimeoutError: If the response is not captured before the timeout.
+        """
+        stream_url = re.compile(self.markers.stream_url_re)
+        request_ids = set()
+        deadline = time.monotonic() + self.remaining_time(timeout_dur)
+        while time.monotonic() < deadline:
+            self.check_page_state()
+            for entry in self.browser.get_log("performance"):
+                message = json.loads(entry["message"])["message"]
+                method, params = message["method"], message.get("params", {})
+                if method == "Network.responseReceived":
+                    if stream_url.search(params["response"]["url"].split("?")[0]):
+                        request_ids.add(params["requestId"])
+                    continue
+                if params.get("requestId") not in request_ids:
+                    continue
+                if method == "Network.loadingFailed":
+                    self.logger.warning("Captured request failed: %s", params.get("errorText"))
+                    return None
+                if method != "Network.loadingFinished":
+                    continue
+                try:
+                    body = self.browser.execute_cdp_cmd(
+                        "Network.getResponseBody", {"requestId": params["requestId"]}
+                    )
+                except Exceptions.WebDriverException as err:
+                    self.logger.warning("Unable to read the captured response: %s", err.msg)
+                    return None
+                text = body["body"]
+                if body.get("base64Encoded"):
+                    text = base64.b64decode(text).decode("utf-8", errors="replace")
+                response = self.parse_stream(text)
+                if response:
+                    self.logger.info("Response is captured from the network")
+                    return response
+            time.sleep(poll_period)
+
+        self.check_deadline()
+        self.logger.error("Response is not captured before the timeout")
+        raise TimeoutError(
+            f"The response of {self.client_name} is not captured before the timeout"
+        )
+
+    def response_timeout(self, timeout_dur: float = None) -> float:
+        """
+        Returns the timeout of the response to the last submitted prompt. Unless given,
+        it is derived from the latency history of the client and the prompt size if
+        adaptive timeouts are enabled and there are enough samples.
+
+        Args:
+            timeout_dur (float, optional): The explicit timeout. Default: None.
+
+        Returns:
+            float: The timeout in seconds.
+        """
+        if timeout_dur or not (self.latency and self.submitted):
+            return timeout_dur or self.timeout_dur
+        learned = self.latency.timeout(self.get_latency_key(), self.submitted[1])
+        if learned is None:
+            return self.timeout_dur
+        self.logger.debug("Adaptive response timeout: %.1f seconds", learned)
+        return learned
+
+    def record_latency(self, since_first_change: float = None) -> None:
+        """
+        Records the latency of the response to the last submitted prompt
+        to the latency history, if adaptive timeouts are enabled.
+
+        Args:
+            since_first_change (float, optional): Milliseconds from the first change of
+                the response to its completion, as measured in the page. Default: None.
+        """
+        if not (self.latency and self.submitted):
+            return
+        submitted_at, prompt_size = self.submitted
+        self.submitted = None
+        completion = time.monotonic() - submitted_at
+        first_change = None
+        if since_first_change is not None:
+            first_change = max(completion - since_first_change / 1000, 0.0)
+        self.latency.record(self.get_latency_key(), prompt_size, completion, first_change)
+
+    def run_page_agent(self, operation: str, *args) -> Any:
+        """
+        Calls an operation of the page agent, injecting the agent if it is not present,
+        e.g. after a page load.
+
+        Args:
+            operation (str): One of 'submit', 'state' and 'readLast'.
+            *args: The arguments of the operation.
+
+        Returns:
+            Any: The return value of the operation, None if the call fails.
+        """
+        try:
+            result = self.browser.execute_script(scripts.PAGE_AGENT_CALL, operation, args)
+            if result is None:
+                self.logger.info("Injecting the page agent")
+                result = self.browser.execute_script(
+                    scripts.PAGE_AGENT, self.get_page_agent_config(), operation, args
+                )
+        except Exceptions.WebDriverException as err:
+            self.logger.warning("Page agent failed: %s", err.msg)
+            return None
+        if result is None:
+            self.logger.warning("Page agent is not available")
+            return None
+        return result.get("value")
+
+    def get_page_agent_config(self) -> Dict[str, Union[List[str], None]]:
+        """
+        Returns the locators used by the page agent, built from the markers.
+
+        Returns:
+            Dict[str, Union[List[str], None]]: The input, send button,
+                response and busy element locators.
+        """
+        input_by, input_query, send_query = self.get_input_marker()
+        response_by, response_query, busy_query = self.get_response_marker()
+        return {
+            "input": [input_by, input_query],
+            "send": [By.XPATH, send_query] if send_query else None,
+            "response": [response_by, response_query],
+            "busy": [By.XPATH, busy_query] if busy_query else None,
+        }
+
+    def submit_prompt(self, prompt: str) -> bool:
+        """
+        Sends the prompt without waiting for the response. If the page agent is enabled,
+        the prompt is written and sent with one call, otherwise or if the agent fails,
+        `send_prompt` of the client is used.
+
+        Args:
+            prompt (str): The interaction text.
+
+        Returns:
+            bool: True if the prompt is sent, False otherwise.
+        """
+        self.wait_ready()
+        self.submitted = (time.monotonic(), len(prompt))
+        if not self.page_agent:
+            return self.send_prompt(prompt)
+
+        prompt = self.attach_long_prompt(prompt)
+        status = self.run_page_agent("submit", prompt)
+        if status == "enter":
+            for event_type in ("keyDown", "keyUp"):
+                self.browser.execute_cdp_cmd("Input.dispatchKeyEvent", {
+                    "type": event_type, "key": "Enter", "code": "Enter",
+                    "windowsVirtualKeyCode": 13, "text": "\r",
+                })
+            status = "sent"
+        if status == "sent":
+            self.logger.info("Prompt is submitted by the page agent")
+            return True
+
+        self.logger.warning("Page agent couldn't submit the prompt (%s)", status)
+        return self.send_prompt(prompt)
+
+    def is_ready_to_prompt(self, timeout_dur: int = None, settle_period: float = 0.5) -> bool:
+        """
+        Waits until the client is ready to be prompted, without touching the input.
+
+        The state of the page is read by the page agent with one call. The input must be
+        enabled and the busy marker absent. If the input has text, the enabled send button
+        indicates readiness. Otherwise, as the send button is disabled for an empty input
+        as well, the responses must not change for `settle_period` seconds.
+
+        Args:
+            timeout_dur (int, optional): Waiting time before the timeout. Default: timeout_dur.
+            settle_period (float, optional): Time between two checks. Default: 0.5.
+
+        Returns:
+            bool : return if the system is ready to be prompted.
+        """
+        self.wait_ready()
+        previous = None
+        deadline = time.monotonic() + self.remaining_time(timeout_dur)
+        while time.monotonic() < deadline:
+            self.check_page_state()
+            state = self.run_page_agent("state")
+            if state is None:
+                return False
+            if state["inputReady"] and not state["busy"]:
+                if state["inputLength"] and state["sendEnabled"] is not None:
+                    if state["sendEnabled"]:
+                        return True
+                elif (state["responses"], state["lastLength"]) == previous:
+                    return True
+                previous = (state["responses"], state["lastLength"])
+            else:
+                previous = None
+            time.sleep(settle_period)
+
+        self.check_deadline()
+        self.logger.error("The client is not ready to be prompted before the timeout")
+        return False
+
+    def wait_completion(
+        self, detector: CompletionDetector = None, timeout_dur: int = None
+    ) -> bool:
+        """
+        Polls the completion detector until the response is complete.
+
+        Args:
+            detector (CompletionDetector, optional): The strategy to use.
+                Default: completion_detector.
+            timeout_dur (int, optional): Waiting time before the timeout. Default: timeout_dur.
+
+        Returns:
+            bool: True if the response is complete, False if timed out.
+        """
+        self.wait_ready()
+        detector = detector or self.completion_detector
+        detector.reset(self)
+        if self.latency and self.submitted:
+            period = self.latency.poll_period(self.get_latency_key(), self.submitted[1])
+            detector.period = max(detector.period, period or 0)
+        deadline = time.monotonic() + self.remaining_time(timeout_dur)
+        while time.monotonic() < deadline:
+            self.check_page_state()
+            if detector.check(self):
+                self.logger.info("%s reports the response as complete", type(detector).__name__)
+                return True
+            time.sleep(detector.period)
+        self.check_deadline()
+        self.logger.error("Response is not complete before the timeout")
+        return False
+
+    def get_completed_response(self, timeout_dur: int = None) -> str:
+        """
+        Waits until the completion detector reports the response as complete,
+        then returns the text of the last response.
+
+        Args:
+            timeout_dur (int, optional): Waiting time before the timeout. Default: timeout_dur.
+
+        Returns:
+            str: The last response, empty string if there is none.
+        """
+        self.wait_ready()
+        if self.wait_completion(timeout_dur=self.response_timeout(timeout_dur)):
+            self.record_latency()
+        by, elem_query, _ = self.get_response_marker()
+        response = self.find_or_fail(by, elem_query, return_type="last")
+        if not response:
+            return ""
+        return response.text
+
+    def interact_stream(
+        self,
+        prompt: str,
+        quiet_period: float = 1.5,
+        timeout_dur: int = None,
+        poll_dur: float = 10,
+        deadline: float = None,
+        timeout: float = None,
+    ) -> Iterator[str]:
+        """
+        Sends a prompt and yields the response as it is rendered by the provider.
+
+        The response is watched through the marker returned by `get_response_marker`.
+        Each yielded item is the text appended to the response since the previous item.
+        If the provider rewrites the already yielded part (e.g. markdown rendering),
+        only the text beyond the yielded length is emitted, the complete response
+        is recorded to the chat history. If the watcher is not available, the complete
+        response is polled and yielded at once.
+
+        Args:
+            prompt (str): The interaction text.
+            quiet_period (float, optional): Seconds without a change in the response to
+                consider it complete, if the busy element is absent. Default: 1.5.
+            timeout_dur (int, optional): Waiting time before the timeout. Default: timeout_dur.
+            poll_dur (float, optional): The maximum duration of one long-poll. Default: 10.
+            deadline (float, optional): The absolute time, as returned by `time.time()`,
+                by which the interaction must be complete. Default: None.
+            timeout (float, optional): The time budget of the interaction in seconds,
+                bounding every wait within it. Default: None.
+
+        Yields:
+            str: The text deltas of the response.
+
+        Raises:
+            PageStateError: If the page gets blocked while streaming.
+            TimeoutError: If the response is not settled before the timeout or the deadline.
+            WebDriverException: If the stream fails in the browser.
+        """
+        with self.deadline_scope(timeout, deadline):
+            self.watch_response(*self.get_response_marker())
+            if not self.submit_prompt(prompt):
+                self.logger.error("Unable to send the prompt, interaction fails.")
+                return
+            self.last_prompt = prompt
+            self.logger.info("Message sent, streaming the response")
+
+            response = ""
+            timeout_dur = self.response_timeout(timeout_dur)
+            end = time.monotonic() + self.remaining_time(timeout_dur)
+            while (remaining := end - time.monotonic()) > 0:
+                try:
+                    result = self.browser.execute_async_script(
+                        scripts.STREAM_RESPONSE,
+                        int(quiet_period * 1000),
+                        int(min(poll_dur, remaining) * 1000),
+                        self.page_states if self.ready else [],
+                    )
+                except Exceptions.WebDriverException as err:
+                    self.logger.error("Response stream failed: %s", err.msg)
+                    raise
+                if result is None:
+                    self.logger.info("Response watcher is not installed")
+                    text = self.get_completed_response(timeout_dur)
+                    if len(text) > len(response):
+                        yield text[len(response):]
+                    response = text
+                    break
+                if result.get("state"):
+                    self.logger.error("Page is blocked by the %s state", result["state"])
+                    raise PageStateError(self.client_name, result["state"])
+                text = result["text"]
+                if text is not None and len(text) > len(response):
+                    yield text[len(response):]
+                if text is not None:
+                    response = text
+                if result["done"]:
+                    self.logger.info("response is ready")
+                    self.record_latency(result.get("sinceFirstChange"))
+                    break
+            else:
+                self.check_deadline()
+                self.logger.error("Response is not settled before the timeout")
+                raise TimeoutError(
+                    f"The response of {self.client_name} is not settled before the timeout"
+                )
+
+        self.log_chat(prompt=prompt, response=response)
+
     def log_chat(
         self, prompt: str = None, response: str = None, regenerated: bool = False
     ) -> bool:
@@ -476,10 +1924,79 @@ class BaseBrowser:
             "If you are creating a custom automation, please implement this method!"
         )
 
+    def get_response_marker(self) -> Tuple[By, str, Union[str, None]]:
+        """
+        Returns the locator of the responses and the XPath of the element which is
+        present while a response is being generated, used to watch the responses.
+
+        Returns:
+            Tuple[By, str, Union[str, None]]: The method, the query and the busy query.
+        """
+        return By.XPATH, self.markers.chatbox_xq, self.markers.get("stop_gen_xq")
+
+    def get_latency_key(self) -> str:
+        """
+        Returns the key of the latency history of the client. Clients with several
+        models may include the selected model.
+
+        Returns:
+            str: The key of the latency history.
+        """
+        return self.client_name
+
+    def get_completion_detector(self) -> CompletionDetector:
+        """
+        Returns the default completion detector of the client. The requests of the
+        response are followed if the network is captured, otherwise the text of the
+        last response is polled until it stops changing.
+
+        Returns:
+            CompletionDetector: The completion detector.
+        """
+        if self.network_capture:
+            return NetworkIdleDetector()
+        by, elem_query, _ = self.get_response_marker()
+        return StableTextDetector(by, elem_query)
+
+    def get_input_marker(self) -> Tuple[By, str, Union[str, None]]:
+        """
+        Returns the locator of the prompt input and the XPath of the send button,
+        used by the page agent.
+
+        Returns:
+            Tuple[By, str, Union[str, None]]: The method, the query and the send button query.
+        """
+        return By.XPATH, self.markers.textarea_xq, self.markers.get("send_btn_xq")
+
+    @staticmethod
+    def parse_stream(body: str) -> Union[str, None]:
+        """
+        Assembles the response from the body of the streaming request of the provider.
+        Clients supporting network capture should override this method.
+
+        Args:
+            body (str): The body of the request matching the `stream_url_re` marker.
+
+        Returns:
+            str | None: The response text, None if it can't be parsed.
+        """
+        return None
+
+    @abc.abstractmethod
+    def send_prompt(self, prompt: str) -> bool:
+        """
+        Abstract function to type the prompt and submit it without waiting for the response.
+        """
+        self.logger.warning(
+            "If you are creating a custom automation, please implement this method!"
+        )
+        return False
+
     @abc.abstractmethod
-    def interact(self, prompt: str) -> str:
+    def interact(self, prompt: str, deadline: float = None, timeout: float = None) -> str:
         """
         Abstract function to interact with the language model.
+        The implementations run within `deadline_scope(timeout, deadline)`.
         """
         self.logger.warning(
             "If you are creating a custom automation, please implement this method!"
@@ -0,0 +1,273 @@
+"""
+This module keeps the latency history of the clients and derives the wait timeouts from it.
+
+Each interaction is recorded with the size of the prompt, the time to the first change of
+the response and the time to its completion. The samples are kept in a rolling window per
+client and prompt size bucket, and persisted as JSON so that the history survives restarts.
+The new samples are merged into the file under a lock, as several clients and processes
+may share it, and they are written at most once per save interval.
+The response timeout is derived from a high percentile of the completion times, so that
+hung sessions are detected early for fast providers while long generations are allowed
+for the providers which need them.
+"""
+
+import json
+import math
+import os
+import tempfile
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Union
+
+from .utils import file_lock
+
+# Upper bounds of the prompt size buckets, in characters
+SIZE_BUCKETS = (256, 1024, 4096, 16384)
+
+
+def percentile(values: List[float], ratio: float) -> float:
+    """Returns the percentile of the values with the nearest-rank method.
+
+    Args:
+        values (List[float]): The values, not necessarily sorted.
+        ratio (float): The percentile between 0 and 1.
+
+    Returns:
+        float: The percentile of the values.
+    """
+    ordered = sorted(values)
+    rank = max(math.ceil(ratio * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+def size_bucket(prompt_size: int) -> str:
+    """Returns the name of the bucket of a prompt size.
+
+    Args:
+        prompt_size (int): The number of characters of the prompt.
+
+    Returns:
+        str: The upper bound of the bucket, or 'inf' for the largest prompts.
+    """
+    for bound in SIZE_BUCKETS:
+        if prompt_size < bound:
+            return str(bound)
+    return "inf"
+
+
+class LatencyHistory:
+    """
+    Rolling latency samples of the clients, keyed by the client and the prompt size bucket.
+
+    Args:
+        path (str, optional): The JSON file to load the history from and persist it to.
+            If None, the history is kept in memory only. Default: None.
+        window (int, optional): The number of samples kept per key. Default: 200.
+        min_samples (int, optional): The number of samples required to derive
+            a timeout. Default: 10.
+        ratio (float, optional): The percentile of the completion times the timeout
+            is derived from. Default: 0.95.
+        margin (float, optional): The multiplier of the percentile. Default: 2.
+        floor (float, optional): The shortest timeout in seconds. Default: 15.
+        save_interval (float, optional): The shortest time between two writes of the
+            file in seconds, the samples recorded meanwhile are written together.
+            Default: 30.
+    """
+
+    _shared = {}
+    _shared_lock = threading.Lock()
+
+    def __init__(
+        self,
+        path: str = None,
+        window: int = 200,
+        min_samples: int = 10,
+        ratio: float = 0.95,
+        margin: float = 2.0,
+        floor: float = 15.0,
+        save_interval: float = 30.0,
+    ):
+        self.path = path
+        self.window = window
+        self.min_samples = min_samples
+        self.ratio = ratio
+        self.margin = margin
+        self.floor = floor
+        self.save_interval = save_interval
+        self.samples = {}
+        self.pending = {}
+        self.saved = None
+        self.lock = threading.Lock()
+        if path and os.path.exists(path):
+            self.load()
+
+    @classmethod
+    def shared(cls, path: str) -> "LatencyHistory":
+        """Returns the history of the path shared by the clients of the process.
+
+        Args:
+            path (str): The JSON file of the history.
+
+        Returns:
+            LatencyHistory: The history.
+        """
+        path = os.path.abspath(path)
+        with cls._shared_lock:
+            if path not in cls._shared:
+                cls._shared[path] = cls(path)
+            return cls._shared[path]
+
+    def read(self) -> Dict[str, deque]:
+        """Reads the samples from the JSON file, ignoring an unreadable file.
+
+        Returns:
+            Dict[str, deque]: The samples by key.
+        """
+        try:
+            with open(self.path, encoding="utf-8") as file:
+                stored = json.load(file)
+        except (OSError, ValueError):
+            return {}
+        return {
+            key: deque(map(tuple, samples), maxlen=self.window)
+            for key, samples in stored.items()
+        }
+
+    def load(self) -> None:
+        """Loads the samples from the JSON file."""
+        samples = self.read()
+        with self.lock:
+            self.samples.update(samples)
+
+    def save(self) -> None:
+        """Merges the samples recorded since the last save into the JSON file, and
+        reloads the samples recorded by the other clients. The file is locked during
+        the merge and replaced atomically."""
+        if not self.path:
+            return
+        with self.lock:
+            pending, self.pending = self.pending, {}
+            self.saved = time.monotonic()
+        if not pending:
+            return
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        with file_lock(self.path + ".lock"):
+            stored = self.read()
+            for key, samples in pending.items():
+                stored.setdefault(key, deque(maxlen=self.window)).extend(samples)
+            with tempfile.NamedTemporaryFile(
+                "w", dir=directory, suffix=".tmp", delete=False, encoding="utf-8"
+            ) as file:
+                json.dump({key: list(samples) for key, samples in stored.items()}, file)
+            os.replace(file.name, self.path)
+        with self.lock:
+            for key, samples in self.pending.items():
+                stored.setdefault(key, deque(maxlen=self.window)).extend(samples)
+            self.samples = stored
+
+    def record(
+        self,
+        client: str,
+        prompt_size: int,
+        completion: float,
+        first_change: Union[float, None] = None,
+    ) -> None:
+        """Records the latency of an interaction, and persists the history if the save
+        interval has passed since the last save.
+
+        Args:
+            client (str): The key of the client, e.g. the client name and the model.
+            prompt_size (int): The number of characters of the prompt.
+            completion (float): The seconds from the submission to the complete response.
+            first_change (float, optional): The seconds from the submission to the first
+                change of the response, None if unknown. Default: None.
+        """
+        key = f"{client}/{size_bucket(prompt_size)}"
+        with self.lock:
+            self.samples.setdefault(key, deque(maxlen=self.window)).append(
+                (completion, first_change)
+            )
+            self.pending.setdefault(key, []).append((completion, first_change))
+            due = self.saved is None or time.monotonic() - self.saved >= self.save_interval
+        if due:
+            self.save()
+
+    def get_samples(self, client: str, prompt_size: int) -> List[tuple]:
+        """Returns the samples of the bucket of the prompt size, or all the samples
+        of the client if the bucket doesn't have enough of them.
+
+        Args:
+            client (str): The key of the client.
+            prompt_size (int): The number of characters of the prompt.
+
+        Returns:
+            List[tuple]: The (completion, first_change) samples.
+        """
+        with self.lock:
+            samples = list(self.samples.get(f"{client}/{size_bucket(prompt_size)}", []))
+            if len(samples) >= self.min_samples:
+                return samples
+            return [
+                sample
+                for key, bucket in self.samples.items()
+                if key.rsplit("/", 1)[0] == client
+                for sample in bucket
+            ]
+
+    def timeout(self, client: str, prompt_size: int) -> Union[float, None]:
+        """Derives the response timeout from the completion times.
+
+        Args:
+            client (str): The key of the client.
+            prompt_size (int): The number of characters of the prompt.
+
+        Returns:
+            float | None: The timeout in seconds, None if there are not enough samples.
+        """
+        samples = self.get_samples(client, prompt_size)
+        if len(samples) < self.min_samples:
+            return None
+        completion = percentile([sample[0] for sample in samples], self.ratio)
+        return max(self.floor, self.margin * completion)
+
+    def poll_period(
+        self, client: str, prompt_size: int, low: float = 0.1, high: float = 1.0
+    ) -> Union[float, None]:
+        """Derives the initial polling period from the median time to the first change,
+        so that the responses which start late are not polled needlessly.
+
+        Args:
+            client (str): The key of the client.
+            prompt_size (int): The number of characters of the prompt.
+            low (float, optional): The shortest period. Default: 0.1.
+            high (float, optional): The longest period. Default: 1.
+
+        Returns:
+            float | None: The period in seconds, None if there are not enough samples.
+        """
+        first_changes = [
+            sample[1] for sample in self.get_samples(client, prompt_size) if sample[1] is not None
+        ]
+        if len(first_changes) < self.min_samples:
+            return None
+        return min(max(percentile(first_changes, 0.5) / 5, low), high)
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """Returns the median and the high percentile of the completion times per key.
+
+        Returns:
+            Dict[str, Dict[str, float]]: The 'count', 'p50' and 'p95' values by key.
+        """
+        with self.lock:
+            items = [(key, [s[0] for s in samples]) for key, samples in self.samples.items()]
+        return {
+            key: {
+                "count": len(values),
+                "p50": percentile(values, 0.5),
+                "p95": percentile(values, 0.95),
+            }
+            for key, values in items
+            if values
+        }
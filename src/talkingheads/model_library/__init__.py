@@ -1,12 +1,15 @@
-"""Model inits"""
+"""Model inits, the clients are imported on first access"""
+import importlib
 
-from .chatgpt import ChatGPTClient
-from .claude import ClaudeClient
-from .copilot import CopilotClient
-from .gemini import GeminiClient
-from .huggingchat import HuggingChatClient
-from .lechat import LeChatClient
-from .pi import PiClient
+_LAZY_ATTRIBUTES = {
+    "ChatGPTClient": ".chatgpt",
+    "ClaudeClient": ".claude",
+    "CopilotClient": ".copilot",
+    "GeminiClient": ".gemini",
+    "HuggingChatClient": ".huggingchat",
+    "LeChatClient": ".lechat",
+    "PiClient": ".pi",
+}
 
 __all__ = [
     "ChatGPTClient",
@@ -17,3 +20,16 @@ __all__ = [
     "LeChatClient",
     "PiClient",
 ]
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
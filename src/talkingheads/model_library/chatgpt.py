@@ -1,15 +1,16 @@
 """Class definition for ChatGPTClient"""
 
-import time
+import json
 from datetime import datetime
+from typing import Union
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import selenium.common.exceptions as Exceptions
 
-from .. import BaseBrowser
+from ..base_browser import BaseBrowser
+from ..utils import parse_sse_events
 
 
 class ChatGPTClient(BaseBrowser):
@@ -45,7 +46,9 @@ class ChatGPTClient(BaseBrowser):
                 self.logger.info("Clicked verification button")
             except Exceptions.ElementNotInteractableException:
                 self.logger.info("Verification button is not present or clickable")
-            time.sleep(wait_time)
+            self.wait_for(
+                lambda driver: not driver.find_elements(By.ID, "challenge-stage"), wait_time
+            )
         else:
             self.logger.error("It is not possible to pass verification")
             return False
@@ -71,7 +74,7 @@ class ChatGPTClient(BaseBrowser):
         # Find login button, click it
 
         login_button = self.wait_until_appear(By.XPATH, self.markers.login_xq)
-        self.wait_object.until(EC.element_to_be_clickable(login_button))
+        self.waiter().until(EC.element_to_be_clickable(login_button))
         login_button.click()
 
         # login_button = self.find_or_fail(By.XPATH, self.markers.login_xq, fail_ok=True)
@@ -115,7 +118,7 @@ class ChatGPTClient(BaseBrowser):
 
         try:
             # Pass introduction
-            WebDriverWait(self.browser, 2).until(
+            self.waiter(2).until(
                 EC.presence_of_element_located((By.XPATH, self.markers.tutorial_xq))
             ).click()
 
@@ -136,7 +139,7 @@ class ChatGPTClient(BaseBrowser):
         return False
 
     def get_last_response(
-        self, num_step: int = 200, period: float = 0.5, same_answer_limit=3
+        self, num_step: int = None, period: float = 0.5, same_answer_limit=3
     ) -> str:
         """
         Continuously checks for a response in a chatbox-like element and
@@ -144,7 +147,7 @@ class ChatGPTClient(BaseBrowser):
 
         Args:
             num_step (int): Number of cycles to check for updates to the response.
-                Defaults to 200.
+                Defaults to the response timeout, see `BaseBrowser.response_timeout`.
             period (float): Sleep time between each step, representing the delay between each check.
                 Defaults to 0.5 seconds.
             same_answer_limit (int): The maximum number of times the same response can
@@ -154,31 +157,28 @@ class ChatGPTClient(BaseBrowser):
             str: The last valid response from the chatbox element.
                 If no response is found, an empty string is returned.
 
+        Raises:
+            TimeoutError: If the watched response is not settled before the timeout.
+
         Behavior:
-            - The function first waits for the chatbox element to appear on the page.
-            - It continuously checks for updates to the response in the chatbox.
-            - The response is checked continuously, `period` seconds between each check.
-            - If the response remains the same for more than `same_answer_limit` consecutive times,
-                the loop breaks, assuming the response is complete.
+            - If a response watcher is installed, the function waits in the browser until
+                the stop button disappears or the response doesn't change for
+                `period` * `same_answer_limit` seconds and returns.
+            - Otherwise, the function waits for the chatbox element to appear on the page
+                and polls the completion detector, at most `num_step` * `period` seconds.
             - If no response is found, it returns an empty string.
             - If a response is found, it returns the last detected response.
         """
 
         self.logger.info("Checking the response")
 
-        self.interim_response = None
-        self.wait_until_appear(By.XPATH, self.markers.chatbox_xq)
-        counter = 0
-        for _ in range(num_step):
-            time.sleep(period)
-            l_response = self.find_or_fail(
-                By.XPATH, self.markers.chatbox_xq, return_type="last"
-            ).text
-            if l_response and l_response == self.interim_response:
-                counter += 1
-            if counter > same_answer_limit:
-                break
-            self.interim_response = l_response
+        timeout_dur = num_step * period if num_step else None
+        self.interim_response = self.wait_response(
+            quiet_period=period * same_answer_limit, timeout_dur=timeout_dur
+        )
+        if self.interim_response is None:
+            self.wait_until_appear(By.XPATH, self.markers.chatbox_xq)
+            self.interim_response = self.get_completed_response(timeout_dur=timeout_dur)
 
         if not self.interim_response:
             self.logger.error("There is no response, something is wrong")
@@ -187,40 +187,113 @@ class ChatGPTClient(BaseBrowser):
         self.logger.info("response is ready")
         return self.interim_response
 
-    def interact(self, prompt: str) -> str:
+    def get_response_marker(self):
+        return By.XPATH, self.markers.chatbox_xq, self.markers.wait_xq
+
+    @staticmethod
+    def parse_stream(body: str) -> Union[str, None]:
+        """
+        Assembles the assistant message from the event stream of a conversation request.
+
+        Both the full message events and the delta encoded events, where each event
+        appends to a path of the message, are supported.
+
+        Args:
+            body (str): The event stream of the conversation request.
+
+        Returns:
+            str | None: The response text, None if there is no assistant message.
+        """
+        parts_path = "/message/content/parts/0"
+        response, path = None, None
+
+        def apply(event):
+            nonlocal response, path
+            path = event.get("p", path)
+            value = event.get("v")
+            if isinstance(value, dict) and "message" in value:
+                value = value["message"]
+            elif "message" in event:
+                value = event["message"]
+            if isinstance(value, dict):
+                if value.get("author", {}).get("role") == "assistant":
+                    response = "".join(
+                        p for p in value.get("content", {}).get("parts", []) if isinstance(p, str)
+                    )
+                return
+            if event.get("o") == "patch" and isinstance(value, list):
+                for sub_event in value:
+                    apply(sub_event)
+            elif isinstance(value, str) and path == parts_path and response is not None:
+                response = value if event.get("o") == "replace" else response + value
+
+        for data in parse_sse_events(body):
+            try:
+                event = json.loads(data)
+            except json.JSONDecodeError:
+                continue
+            if isinstance(event, dict):
+                apply(event)
+        return response
+
+    def send_prompt(self, prompt: str) -> bool:
+        """Types the prompt into the text area and sends it.
+
+        The prompt is inserted at once, see `BaseBrowser.type_prompt`.
+
+        Args:
+            prompt (str): The interaction text.
+
+        Returns:
+            bool: True if the prompt is sent.
+        """
+        text_area = self.find_or_fail(
+            By.XPATH, self.markers.textarea_xq, fail_ok=True, use_cache=True
+        ) or self.wait_until_appear(By.XPATH, self.markers.textarea_xq)
+        if not text_area:
+            raise RuntimeError(
+                "Unable to find the text prompt area. Please raise an issue with verbose=True"
+            )
+        self.type_prompt(text_area, prompt)
+        text_area.send_keys(Keys.RETURN)
+        return True
+
+    def interact(
+        self,
+        prompt: str,
+        deadline: float = None,
+        timeout: float = None,
+    ) -> str:
         """Sends a prompt and retrieves the response from the ChatGPT system.
 
         This function interacts with the ChatGPT.
         It takes the prompt as input and sends it to the system.
-        The prompt may contain multiple lines separated by '\\n'.
-        In this case, the function simulates pressing SHIFT+ENTER for each line.
+        The prompt is inserted at once, see `BaseBrowser.type_prompt`.
         Upon arrival of the interaction, the function waits for the response.
         Once the response is ready, the function will return the response.
 
         Args:
             prompt (str): The interaction text.
+            deadline (float, optional): The absolute time, as returned by `time.time()`,
+                by which the interaction must be complete. Default: None.
+            timeout (float, optional): The time budget of the interaction in seconds,
+                bounding every wait within it. Default: None.
 
         Returns:
             str: The generated response.
         """
+        with self.deadline_scope(timeout, deadline):
+            self.watch_response(*self.get_response_marker())
+            self.submit_prompt(prompt)
 
-        text_area = self.wait_until_appear(By.XPATH, self.markers.textarea_xq)
-        if not text_area:
-            raise RuntimeError(
-                "Unable to find the text prompt area. Please raise an issue with verbose=True"
-            )
-        for each_line in prompt.split("\n"):
-            text_area.send_keys(each_line)
-            text_area.send_keys(Keys.SHIFT + Keys.ENTER)
-        text_area.send_keys(Keys.RETURN)
-
-        response = self.get_last_response()
+            response = self.get_last_response()
 
-        self.log_chat(prompt=prompt, response=response)
-        return response
+            self.log_chat(prompt=prompt, response=response)
+            return response
 
     def reset_thread(self) -> bool:
         """Function to close the current thread and start new one"""
+        self.wait_ready()
         self.browser.get(self.url)
         text_area = self.wait_until_appear(By.TAG_NAME, self.markers.textarea_tq)
         if text_area:
@@ -241,6 +314,7 @@ class ChatGPTClient(BaseBrowser):
         Returns:
             str: The newly generated response text. If the regeneration fails, returns an empty string.
         """
+        self.wait_ready()
         regen_button = self.find_or_fail(
             By.XPATH, self.markers.regen_1_xq, return_type="first"
         )
@@ -254,6 +328,7 @@ class ChatGPTClient(BaseBrowser):
         )
         if not try_again_button:
             return ""
+        self.watch_response(*self.get_response_marker())
         try_again_button.click()
         self.logger.info("Clicked Try again button")
 
@@ -275,6 +350,7 @@ class ChatGPTClient(BaseBrowser):
         Returns:
             bool: True on success, False on fail
         """
+        self.wait_ready()
         if model_name in ["GPT-3.5", "GPT-4"]:
             self.logger.info("Switching model to %s", model_name)
             try:
@@ -294,7 +370,7 @@ class ChatGPTClient(BaseBrowser):
         Returns:
             bool: True if the process is successful, False otherwise
         """
-
+        self.wait_ready()
         menu_button = self.find_or_fail(By.XPATH, self.markers.menu_xq)
         menu_button.click()
         custom_button = self.find_or_fail(By.XPATH, self.markers.custom_xq)
@@ -314,7 +390,9 @@ class ChatGPTClient(BaseBrowser):
             self.logger.info("Custom instructions is enabled")
         else:
             custom_switch.click()
-        time.sleep(0.2)
+            self.wait_for(
+                lambda _: custom_switch.get_attribute("data-state") == "checked", 2
+            )
 
         return True
 
@@ -348,10 +426,11 @@ class ChatGPTClient(BaseBrowser):
             mode (str): Either 'extra_information' or 'modulation'. Check OpenAI help pages.
             instruction (str): _description_
         """
+        self.wait_ready()
         if not self.open_custom_instruction_tab():
             return False
 
-        WebDriverWait(self.browser, 5).until(
+        self.waiter(5).until(
             EC.presence_of_element_located((By.XPATH, self.markers.cust_txt_xq))
         )
         text_areas = self.find_or_fail(
@@ -360,11 +439,12 @@ class ChatGPTClient(BaseBrowser):
         text_area = text_areas[{"extra_information": 0, "modulation": 1}[mode]]
 
         text_area.send_keys(Keys.CONTROL + "a")
-        time.sleep(0.1)
         text_area.send_keys(Keys.DELETE)
-        time.sleep(0.1)
+        self.wait_for(lambda _: not text_area.get_attribute("value"), 2, period=0.05)
         text_area.send_keys(instruction)
-        time.sleep(0.1)
+        self.wait_for(
+            lambda _: text_area.get_attribute("value").endswith(instruction), 2, period=0.05
+        )
         text_area.send_keys(" ")
         self.logger.info("Custom instruction-%s has provided", mode)
 
@@ -1,11 +1,10 @@
 """Class definition for Claude client"""
 import logging
-import time
 
-from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from ..base_browser import BaseBrowser
+from selenium.webdriver.support import expected_conditions as EC
+from ..base_browser import BaseBrowser, ButtonStateDetector
 
 
 class ClaudeClient(BaseBrowser):
@@ -47,75 +46,89 @@ class ClaudeClient(BaseBrowser):
         start_button.click()
         return True
 
-    def is_ready_to_prompt(self) -> bool:
-        """
-        Checks if the Claude is ready to be prompted.
-        The indication for an ongoing message generation process
-        is a disabled send button. The indication for no input is the same
-        disabled button. Therefore we put a dummy dot into the textarea
-        and we are left with the only reason for the button to be disabled,
-        that is, a message being generated.
+    def get_response_marker(self):
+        return By.XPATH, self.markers.chatarea_xq, None
+
+    def get_completion_detector(self):
+        # The send button is replaced by the stop button while responding,
+        # it is back, disabled for the empty input, once the response is over.
+        return ButtonStateDetector(By.XPATH, self.markers.send_button_xq, enabled=False)
+
+    def get_input_marker(self):
+        return By.CLASS_NAME, self.markers.textarea_cq, self.markers.send_button_xq
+
+    def send_prompt(self, prompt: str) -> bool:
+        """Types the prompt into the text area and sends it.
+
+        Args:
+            prompt (str): The interaction text.
 
         Returns:
-            bool : return if the system is ready to be prompted.
+            bool: True if the prompt is sent, False otherwise.
         """
-        text_area = self.find_or_fail(By.CLASS_NAME, self.markers.textarea_cq)
-        text_area.send_keys(".")
+        text_area = self.find_or_fail(By.CLASS_NAME, self.markers.textarea_cq, use_cache=True)
 
-        button = self.find_or_fail(By.XPATH, self.markers.send_button_xq)
-        if not button:
+        if not text_area:
+            logging.error("Unable to locate text area, interaction fails.")
             return False
 
-        self.wait_object.until(EC.element_to_be_clickable(button))
+        self.type_prompt(text_area, prompt)
 
-        # Then, we clear the text area to make space for new interacton :)
-        text_area.send_keys(Keys.CONTROL + "a", Keys.DELETE)
+        # Click enter and send the message
+        text_area.send_keys(Keys.ENTER)
         return True
 
-    def interact(self, prompt: str) -> str:
+    def get_last_response(self) -> str:
+        """
+        Waits for the response watched by `watch_response`. If the watcher is not
+        available, falls back to the completion detector and returns the last response.
+
+        Returns:
+            str: The last response, empty string in case of failure.
+
+        Raises:
+            TimeoutError: If the watched response is not settled before the timeout.
+        """
+        response = self.wait_response()
+        if response is None:
+            response = self.get_completed_response()
+        return response
+
+    def interact(
+        self,
+        prompt: str,
+        deadline: float = None,
+        timeout: float = None,
+    ) -> str:
         """Sends a prompt and retrieves the response from the ChatGPT system.
 
         This function interacts with the Claude.
         It takes the prompt as input and sends it to the system.
-        The prompt may contain multiple lines separated by '\\n'.
-        In this case, the function simulates pressing SHIFT+ENTER for each line.
+        The prompt is inserted at once, see `BaseBrowser.type_prompt`.
         Upon arrival of the interaction, the function waits for the response.
         Once the response is ready, the function will return the response.
 
         Args:
             prompt (str): The interaction text.
+            deadline (float, optional): The absolute time, as returned by `time.time()`,
+                by which the interaction must be complete. Default: None.
+            timeout (float, optional): The time budget of the interaction in seconds,
+                bounding every wait within it. Default: None.
 
         Returns:
             str: The generated response.
         """
-
-        text_area = self.find_or_fail(By.CLASS_NAME, self.markers.textarea_cq)
-
-        if not text_area:
-            logging.error("Unable to locate text area, interaction fails.")
-            return ""
-
-        for each_line in prompt.split("\n"):
-            text_area.send_keys(each_line)
-            text_area.send_keys(Keys.SHIFT + Keys.ENTER)
-
-        # Click enter and send the message
-        text_area.send_keys(Keys.ENTER)
-
-        if not self.is_ready_to_prompt():
-            logging.info("Cannot retrieve the response, something is wrong")
-            return ""
-
-        response = self.find_or_fail(
-            By.XPATH,
-            self.markers.chatarea_xq,
-            return_type="last",
-        )
-        if not response:
-            return ""
-        logging.info("response is ready")
-        self.log_chat(prompt=prompt, response=response.text)
-        return response.text
+        with self.deadline_scope(timeout, deadline):
+            self.watch_response(*self.get_response_marker())
+            if not self.submit_prompt(prompt):
+                return ""
+
+            response = self.get_last_response()
+            if not response:
+                return ""
+            logging.info("response is ready")
+            self.log_chat(prompt=prompt, response=response)
+            return response
 
     def reset_thread(self) -> bool:
         """
@@ -124,9 +137,14 @@ class ClaudeClient(BaseBrowser):
         Returns:
             bool: True if reset is successful, false otherwise.
         """
+        self.wait_ready()
         text_area = self.find_or_fail(By.CLASS_NAME, self.markers.textarea_cq)
         text_area.send_keys(Keys.CONTROL + "K")
-        time.sleep(0.5)
+        # The new chat page replaces the text area
+        self.wait_for(EC.any_of(
+            EC.staleness_of(text_area),
+            EC.presence_of_element_located((By.XPATH, self.markers.start_btn_xq)),
+        ), 5)
         start_button = self.wait_until_appear(By.XPATH, self.markers.start_btn_xq)
         if not start_button:
             return False
@@ -138,23 +156,17 @@ class ClaudeClient(BaseBrowser):
         raise NotImplementedError("Claude only has one model")
 
     def regenerate_response(self) -> str:
+        self.wait_ready()
         regen_button = self.find_or_fail(By.XPATH, self.markers.regen_xq)
         if not regen_button:
             return ""
+        self.watch_response(*self.get_response_marker())
         regen_button.click()
 
-        if not self.is_ready_to_prompt():
-            logging.info("Cannot retrieve the response, something is wrong")
-            return ""
-
-        response = self.find_or_fail(
-            By.XPATH,
-            self.markers.chatarea_xq,
-            return_type="last",
-        )
+        response = self.get_last_response()
         if not response:
             return ""
 
         logging.info("response is ready")
-        self.log_chat(response=response.text, regenerated=True)
-        return response.text
+        self.log_chat(response=response, regenerated=True)
+        return response
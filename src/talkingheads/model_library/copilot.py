@@ -1,14 +1,13 @@
 """Class definition for Copilot client"""
 
-import time
 from pathlib import Path
 from typing import Union
 
-from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from ..base_browser import BaseBrowser
+import selenium.common.exceptions as Exceptions
+from ..base_browser import BaseBrowser, ButtonStateDetector
 from ..utils import check_filetype, is_url
 
 class CopilotClient(BaseBrowser):
@@ -50,32 +49,7 @@ class CopilotClient(BaseBrowser):
         """Copilot requires to accept privacy terms, the cookie below provides the response."""
         self.browser.add_cookie({"name": "BCP", "value": "AD=0&AL=0&SM=0"})
         self.browser.get(self.url)
-        time.sleep(1)
-
-    def is_ready_to_prompt(self) -> bool:
-        """
-        Checks if the Copilot is ready to be prompted.
-        The indication for an ongoing message generation process
-        is a disabled send button. The indication for no input is the same
-        disabled button. Therefore we put a dummy dot into the textarea
-        and we are left with the only reason for the button to be disabled,
-        that is, a message being generated.
-
-        Returns:
-            bool : return if the system is ready to be prompted.
-        """
-        text_area = self.find_or_fail(By.XPATH, self.markers.textarea_xq)
-        text_area.send_keys(".")
-
-        submit_button = self.find_or_fail(By.XPATH, self.markers.submit_xq)
-        if not submit_button:
-            return False
-
-        self.wait_object.until(EC.element_to_be_clickable(submit_button))
-
-        # Then, we clear the text area to make space for new interacton :)
-        text_area.send_keys(Keys.CONTROL + "a", Keys.DELETE)
-        return True
+        self.wait_until_appear(By.XPATH, self.markers.textarea_xq)
 
     def get_last_response(self) -> str:
         """Returns the last response in the chat view.
@@ -109,6 +83,7 @@ class CopilotClient(BaseBrowser):
         Returns:
             bool: True if the image loaded properly, False otherwise
         """
+        self.wait_ready()
         if isinstance(image_path, Path):
             image_path = str(image_path)
         url = is_url(image_path)
@@ -122,7 +97,12 @@ class CopilotClient(BaseBrowser):
         im_input_element.send_keys(image_path)
 
         condition = EC.element_to_be_clickable((By.XPATH, self.markers.dismiss_xq))
-        WebDriverWait(self.browser, 10).until(condition)
+        try:
+            self.waiter(10).until(condition)
+        except Exceptions.TimeoutException:
+            self.check_deadline()
+            self.logger.error("Image upload failed.")
+            return False
         return True
 
     def remove_attached_image(self) -> bool:
@@ -131,6 +111,7 @@ class CopilotClient(BaseBrowser):
         Returns:
             bool: True if the action is valid
         """
+        self.wait_ready()
         discard_button = self.find_or_fail(By.XPATH, self.markers.dismiss_xq)
         if discard_button:
             self.logger.info("Clicking remove image button")
@@ -139,51 +120,79 @@ class CopilotClient(BaseBrowser):
 
         return False
 
-    def interact(self, prompt: str, image_path: Union[str, Path] = None) -> str:
-        """Sends a prompt and retrieves the response from the Copilot system.
+    def get_response_marker(self):
+        return By.XPATH, self.markers.answer_xq, None
 
-        This function interacts with the Copilot.
-        It takes the prompt as input and sends it to the system.
-        The prompt may contain multiple lines separated by '\\n'.
-        In this case, the function simulates pressing SHIFT+ENTER for each line.
-        Upon arrival of the interaction, the function waits for the response.
-        Once the response is ready, the function will return the response.
+    def get_completion_detector(self):
+        # The submit button turns into the stop button while responding,
+        # it is back, disabled for the empty input, once the response is over.
+        return ButtonStateDetector(By.XPATH, self.markers.submit_xq, enabled=False)
+
+    def get_input_marker(self):
+        return By.XPATH, self.markers.textarea_xq, self.markers.submit_xq
+
+    def send_prompt(self, prompt: str) -> bool:
+        """Types the prompt into the text area and sends it.
 
         Args:
             prompt (str): The interaction text.
-            image_path (str, Optional): The path to image from local, or the url of the image.
 
         Returns:
-            Dict[str]: The generated response.
+            bool: True if the prompt is sent, False otherwise.
         """
-
-        text_area = self.find_or_fail(By.XPATH, self.markers.textarea_xq)
+        text_area = self.find_or_fail(By.XPATH, self.markers.textarea_xq, use_cache=True)
 
         if not text_area:
             self.logger.error("Unable to locate text area, interaction fails.")
-            return ""
-        if image_path:
-            self.upload_image(image_path)
+            return False
 
-        for each_line in prompt.split("\n"):
-            text_area.send_keys(each_line)
-            text_area.send_keys(Keys.SHIFT + Keys.ENTER)
+        self.type_prompt(text_area, prompt)
 
         # Click enter and send the message
         text_area.send_keys(Keys.ENTER)
+        return True
 
-        self.close_location_modal()
-        if image_path:
-            time.sleep(1)
+    def interact(
+        self,
+        prompt: str,
+        image_path: Union[str, Path] = None,
+        deadline: float = None,
+        timeout: float = None,
+    ) -> str:
+        """Sends a prompt and retrieves the response from the Copilot system.
 
-        if not self.is_ready_to_prompt():
-            self.logger.info("Cannot retrieve the response, something is wrong")
-            return ""
+        This function interacts with the Copilot.
+        It takes the prompt as input and sends it to the system.
+        The prompt is inserted at once, see `BaseBrowser.type_prompt`.
+        Upon arrival of the interaction, the function waits for the response.
+        Once the response is ready, the function will return the response.
 
-        text = self.get_last_response()
-        self.logger.info("response is ready")
-        self.log_chat(prompt=prompt, response=text)
-        return text
+        Args:
+            prompt (str): The interaction text.
+            image_path (str, Optional): The path to image from local, or the url of the image.
+            deadline (float, optional): The absolute time, as returned by `time.time()`,
+                by which the interaction must be complete. Default: None.
+            timeout (float, optional): The time budget of the interaction in seconds,
+                bounding every wait within it. Default: None.
+
+        Returns:
+            Dict[str]: The generated response.
+        """
+        with self.deadline_scope(timeout, deadline):
+            if image_path:
+                self.upload_image(image_path)
+
+            self.watch_response(*self.get_response_marker())
+            if not self.submit_prompt(prompt):
+                return ""
+
+            self.close_location_modal()
+            text = self.wait_response()
+            if text is None:
+                text = self.get_completed_response()
+            self.logger.info("response is ready")
+            self.log_chat(prompt=prompt, response=text)
+            return text
 
     def reset_thread(self) -> bool:
         """
@@ -192,6 +201,7 @@ class CopilotClient(BaseBrowser):
         Returns:
             bool: False always, it is not possible to reset in Pi.
         """
+        self.wait_ready()
 
         # Find home button, but it may be fine even the button is not there.
         home_button = self.find_or_fail(By.XPATH, self.markers.home_xq)
@@ -218,6 +228,7 @@ class CopilotClient(BaseBrowser):
         raise NotImplementedError("Copilot doesn't provide response regeneration")
 
     def close_location_modal(self):
+        self.wait_ready()
         maybe_later = self.find_or_fail(By.XPATH, self.markers.location_xq, fail_ok=True)
         if maybe_later:
             maybe_later.click()
@@ -1,12 +1,10 @@
 """Class definition for GeminiClient"""
 
-import time
 from typing import Union
 from pathlib import Path
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
-from selenium.webdriver.support.wait import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from talkingheads.base_browser import BaseBrowser
 from ..utils import check_filetype
@@ -61,26 +59,20 @@ class GeminiClient(BaseBrowser):
     def postload_custom_func(self):
         self.browser.get(self.url)
 
-    def get_response(self, tick_step: int = 40, tick_period : float = 0.5, max_same_ans : int = 3) -> str:
+    def get_response(self, tick_step: int = None, tick_period : float = 0.5, max_same_ans : int = 3) -> str:
         """Get the response from chat board
 
         Returns:
             str: The interaction text
         """
         self.logger.info("Message sent, waiting for response")
-        self.interim_response = None
-        self.wait_until_appear(By.TAG_NAME, self.markers.chatbox_tq)
-        counter = 0
-        for _ in range(tick_step):
-            time.sleep(tick_period)
-            l_response = self.find_or_fail(
-                By.TAG_NAME, self.markers.chatbox_tq, return_type="last"
-            ).text
-            if l_response and l_response == self.interim_response:
-                counter += 1
-            if counter > max_same_ans:
-                break
-            self.interim_response = l_response
+        timeout_dur = tick_step * tick_period if tick_step else None
+        self.interim_response = self.wait_response(
+            quiet_period=tick_period * max_same_ans, timeout_dur=timeout_dur
+        )
+        if self.interim_response is None:
+            self.wait_until_appear(By.TAG_NAME, self.markers.chatbox_tq)
+            self.interim_response = self.get_completed_response(timeout_dur=timeout_dur)
 
         if not self.interim_response:
             self.logger.error("There is no response, something is wrong")
@@ -89,9 +81,6 @@ class GeminiClient(BaseBrowser):
         self.logger.info("response is ready")
         return self.interim_response
 
-        # return response.text
-
-
     def upload_image(self, image_path: Union[str, Path]) -> bool:
         """Upload an image or a url and wait until it is uploaded,
         then returns.
@@ -102,6 +91,7 @@ class GeminiClient(BaseBrowser):
         Returns:
             bool: True if the image loaded properly, False otherwise.
         """
+        self.wait_ready()
         if isinstance(image_path, Path):
             image_path = str(image_path)
         if not check_filetype(image_path, self.markers.file_types):
@@ -129,7 +119,7 @@ class GeminiClient(BaseBrowser):
             got_it_button = self.find_or_fail(By.XPATH, self.markers.got_it_xq, fail_ok=True)
             if got_it_button:
                 got_it_button.click()
-                time.sleep(0.3)
+                self.wait_for(EC.invisibility_of_element(got_it_button), 5)
                 im_button.click()
 
             im_input_element = self.wait_until_appear(By.XPATH, self.markers.img_upload_xq)
@@ -145,42 +135,68 @@ class GeminiClient(BaseBrowser):
         self.logger.info('Image uploaded.')
         return True
 
-    def interact(self, prompt: str, image_path: Union[str, Path] = None) -> str:
+    def get_response_marker(self):
+        return By.TAG_NAME, self.markers.chatbox_tq, None
+
+    def send_prompt(self, prompt: str) -> bool:
+        """Types the prompt into the text area and sends it.
+
+        Args:
+            prompt (str): The interaction text.
+
+        Returns:
+            bool: True if the prompt is sent, False otherwise.
+        """
+        text_area = self.find_or_fail(By.XPATH, self.markers.textarea_xq, use_cache=True)
+        if not text_area:
+            return False
+        self.type_prompt(text_area, prompt)
+        text_area.send_keys(Keys.RETURN)
+        return True
+
+    def interact(
+        self,
+        prompt: str,
+        image_path: Union[str, Path] = None,
+        deadline: float = None,
+        timeout: float = None,
+    ) -> str:
         """
         Sends a prompt and retrieves the response from the ChatGPT system.
 
         This function interacts with the Gemini.
         It takes the prompt as input and sends it to the system.
-        The prompt may contain multiple lines separated by '\\n'.
-        In this case, the function simulates pressing SHIFT+ENTER for each line.
+        The prompt is inserted at once, see `BaseBrowser.type_prompt`.
         Upon arrival of the interaction, the function waits for the response.
         Once the response is ready, the function will return the response.
 
         Args:
             prompt (str): The interaction text.
             image_path (str, optional): The image path for multimodal functionality
+            deadline (float, optional): The absolute time, as returned by `time.time()`,
+                by which the interaction must be complete. Default: None.
+            timeout (float, optional): The time budget of the interaction in seconds,
+                bounding every wait within it. Default: None.
+
         Returns:
             str: The generated response.
         """
-        if image_path:
-            uploaded = self.upload_image(image_path)
-            if not uploaded:
+        with self.deadline_scope(timeout, deadline):
+            if image_path:
+                uploaded = self.upload_image(image_path)
+                if not uploaded:
+                    return ""
+
+            self.watch_response(*self.get_response_marker())
+            if not self.submit_prompt(prompt):
                 return ""
 
-        text_area = self.find_or_fail(By.XPATH, self.markers.textarea_xq)
-        if not text_area:
-            return ""
-        for each_line in prompt.split("\n"):
-            text_area.send_keys(each_line)
-            text_area.send_keys(Keys.SHIFT + Keys.ENTER)
-        text_area.send_keys(Keys.RETURN)
-
-        response = self.get_response()
-        if not response:
-            return ""
-        self.last_prompt = prompt
-        self.log_chat(prompt=prompt, response=response)
-        return response
+            response = self.get_response()
+            if not response:
+                return ""
+            self.last_prompt = prompt
+            self.log_chat(prompt=prompt, response=response)
+            return response
 
     def reset_thread(self) -> bool:
         """Function to close the current thread and start new one
@@ -188,6 +204,7 @@ class GeminiClient(BaseBrowser):
         Returns:
             bool: True new chat button is clicked, false otherwise
         """
+        self.wait_ready()
         new_chat_button = self.find_or_fail(By.XPATH, self.markers.new_chat_xq)
         if not new_chat_button:
             return False
@@ -199,9 +216,10 @@ class GeminiClient(BaseBrowser):
             dialog_confirm.click()
             self.logger.info('Confirmed New Chat in dialog window')
 
-        time.sleep(0.5)
-        responses = self.browser.find_elements(By.TAG_NAME, self.markers.chatbox_tq)
-        if len(responses) > 0:
+        cleared = self.wait_for(
+            lambda driver: not driver.find_elements(By.TAG_NAME, self.markers.chatbox_tq), 5
+        )
+        if not cleared:
             self.logger.error("Couldn\'t reset the chat")
             return False
 
@@ -217,15 +235,18 @@ class GeminiClient(BaseBrowser):
         Returns:
             str: The regenerated response or empty string in case of failure.
         """
+        self.wait_ready()
         draft_button = self.find_or_fail(By.XPATH, self.markers.regen_1_xq)
         if not draft_button:
             return ""
         draft_button.click()
         self.logger.info("Clicked drafts button")
 
-        self.wait_object.until(
+        regen_button = self.waiter().until(
             EC.element_to_be_clickable((By.CLASS_NAME, self.markers.regen_2_cq))
-        ).click()
+        )
+        self.watch_response(*self.get_response_marker())
+        regen_button.click()
         self.logger.info("Clicked regenerate button")
 
         response = self.get_response()
@@ -243,6 +264,7 @@ class GeminiClient(BaseBrowser):
         Returns:
             str: The regenerated response or empty string in case of failure.
         """
+        self.wait_ready()
         modify_button = self.find_or_fail(By.XPATH, self.markers.modify_xq)
         if not modify_button:
             return ""
@@ -266,6 +288,7 @@ class GeminiClient(BaseBrowser):
             )
             list(options.values())[0].send_keys(Keys.ESCAPE)
             return ""
+        self.watch_response(*self.get_response_marker())
         selected_option.click()
 
         response = self.get_response()
@@ -273,5 +296,6 @@ class GeminiClient(BaseBrowser):
         return response
 
     def switch_model(self, model_name: str) -> bool:
+        self.wait_ready()
         self.logger.info("Gemini doesn't have a model selection")
         return False
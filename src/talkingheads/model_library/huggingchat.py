@@ -1,9 +1,13 @@
 """Class definition for HuggingChat client"""
 
+import json
+from typing import Union
+
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
-from .. import BaseBrowser
+from ..base_browser import BaseBrowser
+from ..base_browser import MarkerDisappearanceDetector
 
 
 class HuggingChatClient(BaseBrowser):
@@ -60,49 +64,101 @@ class HuggingChatClient(BaseBrowser):
         # self.logger.info("Clicked login button")
         return True
 
-    def interact(self, prompt: str):
+    @staticmethod
+    def parse_stream(body: str) -> Union[str, None]:
+        """
+        Assembles the response from the JSON lines stream of a conversation request.
+
+        Args:
+            body (str): The stream of the conversation request.
+
+        Returns:
+            str | None: The final answer, or the streamed tokens if the stream is cut.
+        """
+        tokens = []
+        for line in body.splitlines():
+            try:
+                event = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if not isinstance(event, dict):
+                continue
+            if event.get("type") == "finalAnswer":
+                return event.get("text", "")
+            if event.get("type") == "stream":
+                tokens.append(event.get("token", "").replace("\u0000", ""))
+        return "".join(tokens) or None
+
+    def get_completion_detector(self):
+        if self.network_capture:
+            return super().get_completion_detector()
+        return MarkerDisappearanceDetector(By.XPATH, self.markers.stop_gen_xq)
+
+    def send_prompt(self, prompt: str) -> bool:
+        """Types the prompt into the text area and sends it.
+
+        Args:
+            prompt (str): The interaction text.
+
+        Returns:
+            bool: True if the prompt is sent, False otherwise.
+        """
+        text_area = self.find_or_fail(By.XPATH, self.markers.textarea_xq, use_cache=True)
+        if not text_area:
+            return False
+
+        self.type_prompt(text_area, prompt)
+        text_area.send_keys(Keys.RETURN)
+        return True
+
+    def interact(
+        self,
+        prompt: str,
+        deadline: float = None,
+        timeout: float = None,
+    ) -> str:
         """Sends a prompt and retrieves the response from the HuggingChat system.
 
         This function interacts with the HuggingChat.
         It takes the prompt as input and sends it to the system.
-        The prompt may contain multiple lines seperated by '\\n'.
-        In this case, the function simulates pressing SHIFT+ENTER for each line.
+        The prompt is inserted at once, see `BaseBrowser.type_prompt`.
         Upon arrival of the interaction, the function waits for the response.
         Once the response is ready, the function will return the response.
 
         Args:
             prompt (str): The interaction text.
+            deadline (float, optional): The absolute time, as returned by `time.time()`,
+                by which the interaction must be complete. Default: None.
+            timeout (float, optional): The time budget of the interaction in seconds,
+                bounding every wait within it. Default: None.
 
         Returns:
             str: The generated response.
         """
-
-        text_area = self.find_or_fail(By.XPATH, self.markers.textarea_xq)
-        if not text_area:
-            return ""
-
-        for each_line in prompt.split("\n"):
-            text_area.send_keys(each_line)
-            text_area.send_keys(Keys.SHIFT + Keys.ENTER)
-        text_area.send_keys(Keys.RETURN)
-        self.logger.info("Message sent, waiting for response")
-        self.wait_until_disappear(By.XPATH, self.markers.stop_gen_xq)
-        response = self.find_or_fail(
-            By.XPATH, self.markers.chatbox_xq, return_type="last"
-        )
-        if not response:
-            return ""
-        self.logger.info("response is ready")
-        self.log_chat(prompt=prompt, response=response.text)
-        return response.text
+        with self.deadline_scope(timeout, deadline):
+            self.watch_response(*self.get_response_marker())
+            if not self.submit_prompt(prompt):
+                return ""
+            self.logger.info("Message sent, waiting for response")
+
+            response = self.wait_response()
+            if response is None:
+                response = self.get_completed_response()
+            if not response:
+                return ""
+            self.logger.info("response is ready")
+            self.log_chat(prompt=prompt, response=response)
+            return response
 
     def reset_thread(self) -> bool:
         """Function to close the current thread and start new one"""
+        self.wait_ready()
         self.browser.get(self.url)
         return True
 
     def toggle_search_web(self) -> bool:
         """Function to enable/disable web search feature"""
+        self.wait_ready()
         search_web_toggle = self.find_or_fail(By.XPATH, self.markers.search_xq)
         if not search_web_toggle:
             return False
@@ -122,12 +178,13 @@ class HuggingChatClient(BaseBrowser):
         Returns:
             bool: True on success, False on fail
         """
+        self.wait_ready()
         model_button = self.find_or_fail(By.XPATH, self.markers.model_xq)
         if not model_button:
             return False
         model_button.click()
 
-        self.wait_object.until(
+        self.waiter().until(
             EC.presence_of_element_located((By.XPATH, self.markers.settings_xq))
         )
         models = self.find_or_fail(
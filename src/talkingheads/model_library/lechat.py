@@ -1,5 +1,4 @@
 """Class definition for LeChat client"""
-import time
 
 from selenium.webdriver.common.by import By
 from selenium.webdriver.common.keys import Keys
@@ -50,24 +49,20 @@ class LeChatClient(BaseBrowser):
 
         return True
 
-    def get_last_response(self, tick_time : int = 200, tick_period : float = 0.5) -> str:
+    def get_last_response(self, tick_time : int = None, tick_period : float = 0.5) -> str:
         """Retrieves the last response given by ChatGPT
 
         Returns:
             str: The last response
         """
         self.logger.info("Checking the response")
-        self.wait_until_appear(By.XPATH, self.markers.chatbox_xq)
-        # self.wait_until_disappear(By.XPATH, self.markers.stop_gen_xq)
-
-        for _ in range(tick_time):
-            time.sleep(tick_period)
-            l_response = self.find_or_fail(
-                By.XPATH, self.markers.chatbox_xq, return_type="last"
-            ).text
-            if l_response and l_response == self.interim_response:
-                break
-            self.interim_response = l_response
+        timeout_dur = tick_time * tick_period if tick_time else None
+        self.interim_response = self.wait_response(
+            quiet_period=tick_period, timeout_dur=timeout_dur
+        )
+        if self.interim_response is None:
+            self.wait_until_appear(By.XPATH, self.markers.chatbox_xq)
+            self.interim_response = self.get_completed_response(timeout_dur=timeout_dur)
 
         if not self.interim_response:
             self.logger.error("There is no response, something is wrong")
@@ -76,43 +71,63 @@ class LeChatClient(BaseBrowser):
         self.logger.info("response is ready")
         return self.interim_response
 
+    def send_prompt(self, prompt: str) -> bool:
+        """Types the prompt into the text area and sends it.
+
+        Args:
+            prompt (str): The interaction text.
+
+        Returns:
+            bool: True if the prompt is sent, False otherwise.
+        """
+        text_area = self.find_or_fail(By.XPATH, self.markers.textarea_xq, use_cache=True)
+        if not text_area:
+            return False
+
+        self.type_prompt(text_area, prompt)
+        text_area.send_keys(Keys.RETURN)
+        return True
 
-    def interact(self, prompt: str):
+    def interact(
+        self,
+        prompt: str,
+        deadline: float = None,
+        timeout: float = None,
+    ) -> str:
         """Sends a prompt and retrieves the response.
 
         This function interacts with the LeChat.
         It takes the prompt as input and sends it to the system.
-        The prompt may contain multiple lines seperated by '\\n'.
-        In this case, the function simulates pressing SHIFT+ENTER for each line.
+        The prompt is inserted at once, see `BaseBrowser.type_prompt`.
         Upon arrival of the interaction, the function waits for the response.
         Once the response is ready, the function will return the response.
 
         Args:
             prompt (str): The interaction text.
+            deadline (float, optional): The absolute time, as returned by `time.time()`,
+                by which the interaction must be complete. Default: None.
+            timeout (float, optional): The time budget of the interaction in seconds,
+                bounding every wait within it. Default: None.
 
         Returns:
             str: The generated response.
         """
-
-        text_area = self.find_or_fail(By.XPATH, self.markers.textarea_xq)
-        if not text_area:
-            return ""
-
-        for each_line in prompt.split("\n"):
-            text_area.send_keys(each_line)
-            text_area.send_keys(Keys.SHIFT + Keys.ENTER)
-        text_area.send_keys(Keys.RETURN)
-        self.logger.info("Message sent, waiting for response")
-        self.last_prompt = prompt
-        response = self.get_last_response()
-        if not response:
-            return ""
-        self.logger.info("response is ready")
-        self.log_chat(prompt=prompt, response=response)
-        return response
+        with self.deadline_scope(timeout, deadline):
+            self.watch_response(*self.get_response_marker())
+            if not self.submit_prompt(prompt):
+                return ""
+            self.logger.info("Message sent, waiting for response")
+            self.last_prompt = prompt
+            response = self.get_last_response()
+            if not response:
+                return ""
+            self.logger.info("response is ready")
+            self.log_chat(prompt=prompt, response=response)
+            return response
 
     def reset_thread(self):
         """Function to close the current thread and start new one"""
+        self.wait_ready()
         self.browser.get(self.url)
         return True
 
@@ -126,6 +141,7 @@ class LeChatClient(BaseBrowser):
         Returns:
             bool: True on success, False on fail
         """
+        self.wait_ready()
         model_button = self.find_or_fail(By.XPATH, self.markers.model_xq)
         if not model_button:
             return False
@@ -150,9 +166,11 @@ class LeChatClient(BaseBrowser):
         return True
 
     def regenerate_response(self):
+        self.wait_ready()
         regen_button = self.find_or_fail(By.XPATH, self.markers.regen_xq)
         if not regen_button:
             return ""
+        self.watch_response(*self.get_response_marker())
         regen_button.click()
         self.logger.info("Clicked regenerate button")
 
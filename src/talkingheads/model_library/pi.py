@@ -1,9 +1,6 @@
 """Class definition for PI client"""
-import time
-
 from selenium.webdriver.common.by import By
-from selenium.webdriver.common.keys import Keys
-from ..base_browser import BaseBrowser
+from ..base_browser import BaseBrowser, ButtonStateDetector
 
 
 class PiClient(BaseBrowser):
@@ -43,74 +40,75 @@ class PiClient(BaseBrowser):
 
     def postload_custom_func(self) -> None:
         """Pi starts with a welcome message, we should wait until the message to finish."""
-        time.sleep(2)
+        # The welcome message is rendered once the visitor session of the first load is set
+        self.wait_until_appear(By.XPATH, self.markers.chatbox_xq, fail_ok=True)
         self.browser.get(self.url)
         self.is_ready_to_prompt()
 
-    def is_ready_to_prompt(self) -> bool:
-        """
-        Checks if the Pi is ready to be prompted.
-        The indication for an ongoing message generation process
-        is a disabled send button. The indication for no input is the same
-        disabled button. Therefore we put a dummy dot into the textarea
-        and we are left with the only reason for the button to be disabled,
-        that is, a message being generated.
+    def get_response_marker(self):
+        # The send button is disabled for an empty input as well, so the disabled
+        # input is the busy marker, the input is never typed into while waiting.
+        return By.XPATH, self.markers.chatbox_xq, self.markers.wait_xq
+
+    def get_completion_detector(self):
+        return ButtonStateDetector(By.XPATH, self.markers.textarea_xq, enabled=True)
+
+    def get_input_marker(self):
+        return By.XPATH, self.markers.textarea_xq, self.markers.sendkeys_xq
+
+    def send_prompt(self, prompt: str) -> bool:
+        """Types the prompt into the text area and clicks the submit button.
+
+        Args:
+            prompt (str): The interaction text.
 
         Returns:
-            bool : return if the system is ready to be prompted.
+            bool: True if the prompt is sent, False otherwise.
         """
-
-        text_area = self.wait_until_appear(By.XPATH, self.markers.textarea_xq)
+        text_area = self.find_or_fail(By.XPATH, self.markers.textarea_xq, use_cache=True)
         if not text_area:
             return False
-        text_area.send_keys(".")
-        self.wait_until_disappear(By.XPATH, self.markers.wait_xq)
-
-        # Then, we clear the text area to make space for new interacton :)
-        text_area.send_keys(Keys.CONTROL + "a")
-        time.sleep(0.1)
-        text_area.send_keys(Keys.DELETE)
-        time.sleep(0.1)
+
+        self.type_prompt(text_area, prompt)
+
+        self.find_or_fail(By.XPATH, self.markers.sendkeys_xq, use_cache=True).click()
         return True
 
-    def interact(self, prompt: str):
+    def interact(
+        self,
+        prompt: str,
+        deadline: float = None,
+        timeout: float = None,
+    ) -> str:
         """Sends a prompt and retrieves the response from the ChatGPT system.
 
         This function interacts with the PI.
         It takes the prompt as input and sends it to the system.
-        The prompt may contain multiple lines separated by '\\n'.
-        In this case, the function simulates pressing SHIFT+ENTER for each line.
+        The prompt is inserted at once, see `BaseBrowser.type_prompt`.
         Upon arrival of the interaction, the function waits for the response.
         Once the response is ready, the function will return the response.
 
         Args:
             prompt (str): The interaction text.
+            deadline (float, optional): The absolute time, as returned by `time.time()`,
+                by which the interaction must be complete. Default: None.
+            timeout (float, optional): The time budget of the interaction in seconds,
+                bounding every wait within it. Default: None.
 
         Returns:
             str: The generated response.
         """
-
-        text_area = self.find_or_fail(By.XPATH, self.markers.textarea_xq)
-        if not text_area:
-            return ""
-
-        for each_line in prompt.split("\n"):
-            text_area.send_keys(each_line)
-            text_area.send_keys(Keys.SHIFT + Keys.ENTER)
-
-        self.find_or_fail(By.XPATH, self.markers.sendkeys_xq).click()
-        self.logger.info("Message sent, waiting for response")
-
-        if not self.is_ready_to_prompt():
-            return False
-
-        response = self.find_or_fail(
-            By.XPATH, self.markers.chatbox_xq, return_type="last"
-        )
-        if not response:
-            return ""
-        self.logger.info("response is ready")
-        return response.text
+        with self.deadline_scope(timeout, deadline):
+            self.watch_response(*self.get_response_marker())
+            if not self.submit_prompt(prompt):
+                return ""
+            self.logger.info("Message sent, waiting for response")
+
+            response = self.wait_response()
+            if response is None:
+                response = self.get_completed_response()
+            self.logger.info("response is ready")
+            return response
 
     def reset_thread(self) -> bool:
         """
@@ -119,6 +117,7 @@ class PiClient(BaseBrowser):
         Returns:
             bool: False always, it is not possible to reset in Pi.
         """
+        self.wait_ready()
         self.browser.delete_all_cookies()
         self.browser.get(self.url)
         self.postload_custom_func()
@@ -1,5 +1,16 @@
-"""Init file for multiagent subpackage"""
-
-from .multiagent import MultiAgent, Conversation
+"""Init file for multiagent subpackage, imported on first access"""
+import importlib
 
 __all__ = ['MultiAgent', 'Conversation']
+
+
+def __getattr__(name):
+    if name not in __all__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(".multiagent", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
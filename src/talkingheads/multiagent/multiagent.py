@@ -1,47 +1,89 @@
 """Multiagent"""
 
-import time
 import logging
+import threading
+import time
+import weakref
+from contextlib import contextmanager
 from datetime import datetime
 from collections import OrderedDict
-from typing import Any, Callable, Dict, List, Tuple, Union
-from concurrent.futures.thread import ThreadPoolExecutor
-from random import random, randint
+from typing import Any, Callable, Dict, Iterator, List, Tuple, Union
+from concurrent.futures import Future, ThreadPoolExecutor
 
 import yaml
 import pandas as pd
 from mergedeep import merge
 import emoji
-from .. import (
-    ChatGPTClient, ClaudeClient, CopilotClient, GeminiClient,
-    HuggingChatClient, LeChatClient, PiClient
-)
 from ..base_browser import BaseBrowser
+from ..registry import get_client
 from ..utils import save_func_map
 
-def get_client(client_name):
-    """Returns the client by their tag name"""
-    return {
-        "ChatGPT": ChatGPTClient,
-        "Claude": ClaudeClient,
-        "Copilot": CopilotClient,
-        "Gemini": GeminiClient,
-        "HuggingChat": HuggingChatClient,
-        "LeChat": LeChatClient,
-        "Pi": PiClient,
-    }.get(client_name, None)
+class TokenBucket:
+    """
+    Spaces out events deterministically, allowing a burst of events at once
+    and one event per interval afterwards.
+
+    Args:
+        interval (float): The seconds between two events after the burst.
+        burst (int, optional): The number of events allowed at once. Default: 1.
+    """
+
+    def __init__(self, interval: float, burst: int = 1):
+        self.interval = interval
+        self.capacity = max(burst, 1)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Reserves a token and blocks until it is due.
+
+        Returns:
+            float: The seconds waited.
+        """
+        with self.lock:
+            now = time.monotonic()
+            if self.interval > 0:
+                self.tokens = min(
+                    self.capacity, self.tokens + (now - self.updated) / self.interval
+                )
+            else:
+                self.tokens = self.capacity
+            self.updated = now
+            self.tokens -= 1
+            wait = max(-self.tokens * self.interval, 0)
+        if wait:
+            time.sleep(wait)
+        return wait
+
 
 class MultiAgent:
-    """An interface to use multiple instances together."""
+    """An interface to use multiple instances together.
+
+    The agents are launched in parallel, see the `multiagent_settings` of the configuration:
+    max_parallel_starts limits the number of agents launching at the same time, and
+    start_interval with start_burst spaces out their launches. An agent which fails to
+    launch is left out of the swarm, its error is kept in `failed_agents`.
+
+    If lazy_start is set, the agents are launched on their first use instead. If
+    idle_timeout is set, the agents unused for that many seconds are closed, and
+    launched again on their next use, restoring their session if they have a session_path.
+
+    Attributes:
+        agent_names (List[str]): The tags of the agents in the swarm, launched or not.
+        agent_swarm (Dict[str, BaseBrowser]): The launched agents by their tags.
+        failed_agents (Dict[str, Exception]): The launch errors by agent tag.
+        startup_report (Dict[str, Dict[str, Any]]): The 'status', 'queued' (seconds waited
+            for a launch slot), 'duration' (seconds to launch) and 'error' by agent tag.
+    """
 
     def __init__(self, configuration_path: str):
         with open(configuration_path) as fd:
             self.config = yaml.safe_load(fd)
 
-        ma_settings = self.config.get("multiagent_settings")
-        if ma_settings:
-            self.auto_save = ma_settings.get("auto_save") or False
-            self.save_path = ma_settings.get("save_path") or None
+        ma_settings = self.config.get("multiagent_settings") or {}
+        self.auto_save = ma_settings.get("auto_save") or False
+        self.save_path = ma_settings.get("save_path") or None
 
         if self.auto_save:
             self.chat_history = pd.DataFrame(columns=["agent", "is_regen", "content"])
@@ -54,41 +96,473 @@ class MultiAgent:
             self.logger.info("Verbose mode active")
 
         self.agent_swarm = {}
-        driver_settings = self.config["driver_settings"]
-        shared_config = driver_settings.get("shared")
-        nodes = driver_settings.get("nodes")
-
-        self.agent_swarm = {
-            vals.get("tag", key) : self.open_agent(
-                key,
-                merge(shared_config, vals, {"auto_save": False, "multihead": True}),
+        self.failed_agents = {}
+        self.startup_report = {}
+        self.shared_config = self.config["driver_settings"].get("shared")
+        self.agent_configs = self.get_node_configs(self.config)
+        self.lock = threading.Lock()
+        self.agent_locks = {tag: threading.Lock() for tag in self.agent_configs}
+        self.holders = {}
+        self.retired = set()
+        self.last_used = {}
+        self.start_slots = threading.BoundedSemaphore(
+            ma_settings.get("max_parallel_starts") or max(len(self.agent_configs), 1)
+        )
+        self.start_bucket = TokenBucket(
+            ma_settings.get("start_interval", 0), ma_settings.get("start_burst", 1)
+        )
+        self.executor_size = max(len(self.agent_configs), 1)
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.executor_size, thread_name_prefix="MultiAgent"
+        )
+        self.idle_timeout = ma_settings.get("idle_timeout")
+        self.lazy_start = ma_settings.get("lazy_start") or False
+        self.stopped = threading.Event()
+        self.broadcast_errors = {}
+
+        if self.lazy_start:
+            self.agent_names = list(self.agent_configs)
+            self.logger.info("%d models will be loaded on use", len(self.agent_names))
+        else:
+            self.start_swarm()
+            if not self.agent_swarm:
+                raise RuntimeError(f"No agent could be launched: {self.failed_agents}")
+            self.agent_names = list(self.agent_swarm)
+            self.logger.info(
+                "%d of %d models are successfully loaded",
+                len(self.agent_swarm), len(self.agent_configs),
             )
-            for key, vals in nodes.items()
-        }
+
+        if self.idle_timeout:
+            threading.Thread(
+                target=self._evict_loop,
+                args=(weakref.ref(self), self.stopped, min(max(self.idle_timeout / 4, 1), 60)),
+                name="MultiAgent-eviction",
+                daemon=True,
+            ).start()
         self.ready = True
-        self.logger.info("All models are successfully loaded")
 
     def __del__(self):
-        self.agent_swarm.clear()
-        if self.auto_save:
+        if getattr(self, "stopped", None) is not None:
+            self.stopped.set()
+        if getattr(self, "executor", None) is not None:
+            self.executor.shutdown(wait=False)
+        getattr(self, "agent_swarm", {}).clear()
+        if getattr(self, "auto_save", False):
             self.save()
 
     @staticmethod
-    def dictmap(lambda_func: Callable, dictionary: Dict) -> Dict[str, Any]:
-        """Takes a lambda function which accepts two parameters,
-        and returns a dictionary based on this lambda function
+    def _evict_loop(swarm_ref: weakref.ref, stopped: threading.Event, period: float) -> None:
+        while not stopped.wait(period):
+            swarm = swarm_ref()
+            if swarm is None:
+                return
+            swarm.evict_idle()
+            del swarm
+
+    def get_node_configs(self, config: Dict[str, Any]) -> Dict[str, Tuple[str, Dict]]:
+        """Returns the client names and the configs of the nodes of a configuration.
+
+        Args:
+            config (Dict[str, Any]): The configuration.
+
+        Returns:
+            Dict[str, Tuple[str, Dict]]: The client name and the config by agent tag.
+        """
+        driver_settings = config["driver_settings"]
+        shared_config = driver_settings.get("shared")
+        return {
+            vals.get("tag", key): (key, self.merge_config(vals, shared_config))
+            for key, vals in driver_settings.get("nodes").items()
+        }
+
+    def merge_config(self, config: Dict[str, Any], shared_config: Dict = None) -> Dict:
+        """Merges the config of an agent into the shared config.
+
+        Args:
+            config (Dict[str, Any]): The config of the agent.
+            shared_config (Dict, optional): The shared config. Default: the current one.
+
+        Returns:
+            Dict: The constructor arguments of the agent.
+        """
+        shared_config = self.shared_config if shared_config is None else shared_config
+        return merge(
+            {}, shared_config or {}, config or {}, {"auto_save": False, "multihead": True}
+        )
+
+    def resize_executor(self) -> None:
+        """Replaces the executor of the swarm by a larger one if the swarm has outgrown it,
+        the tasks submitted to the previous one are completed in the background."""
+        with self.lock:
+            size = max(len(self.agent_configs), 1)
+            if size <= self.executor_size:
+                return
+            executor, self.executor = self.executor, ThreadPoolExecutor(
+                max_workers=size, thread_name_prefix="MultiAgent"
+            )
+            self.executor_size = size
+            executor.shutdown(wait=False)
+
+    def submit(self, func: Callable, *args) -> Future:
+        """Submits a task to the executor of the swarm, the executor can't be
+        replaced meanwhile.
+
+        Args:
+            func (Callable): The task to run.
+            *args: The arguments of the task.
+
+        Returns:
+            Future: The future of the task.
+        """
+        with self.lock:
+            return self.executor.submit(func, *args)
+
+    def start_swarm(self, agents: List[str] = None) -> Dict[str, Dict[str, Any]]:
+        """Launches the agents in parallel, adding the launched ones to the swarm
+        in the order of the configuration and recording the failed ones.
+
+        Args:
+            agents (List[str], optional): The tags of the agents to launch.
+                Default: None, all the configured agents.
+
+        Returns:
+            Dict[str, Dict[str, Any]]: The startup report of the launched agents.
+        """
+        agents = list(agents or self.agent_configs)
+        started = time.monotonic()
+        with ThreadPoolExecutor(
+            max_workers=max(len(agents), 1), thread_name_prefix="MultiAgent"
+        ) as executor:
+            list(executor.map(self.launch_agent, agents))
+
+        with self.lock:
+            self.agent_swarm = {
+                tag: self.agent_swarm[tag] for tag in self.agent_configs if tag in self.agent_swarm
+            }
+        self.logger.info("The swarm is started in %.1f seconds", time.monotonic() - started)
+        return {tag: self.startup_report[tag] for tag in agents}
+
+    def launch_agent(self, tag: str) -> Union[BaseBrowser, None]:
+        """Launches an agent within the limits of max_parallel_starts and start_interval,
+        and records its startup report.
+
+        Args:
+            tag (str): The tag of the agent.
+
+        Returns:
+            BaseBrowser | None: The agent, None if it fails to launch.
+        """
+        client_name, config = self.agent_configs[tag]
+        requested = time.monotonic()
+        with self.start_slots:
+            self.start_bucket.acquire()
+            launched = time.monotonic()
+            report = {"status": "ready", "queued": launched - requested, "error": None}
+            try:
+                agent = self.open_agent(client_name, config)
+            except Exception as err:
+                agent = None
+                report.update(status="failed", error=repr(err))
+                self.logger.error("Unable to launch %s: %s", tag, err)
+                self.failed_agents[tag] = err
+        report["duration"] = time.monotonic() - launched
+        self.logger.info(
+            "%s is %s in %.1f seconds, after %.1f seconds in the queue",
+            tag, report["status"], report["duration"], report["queued"],
+        )
+        with self.lock:
+            removed = tag not in self.agent_configs
+            if not removed:
+                self.startup_report[tag] = report
+            if agent is not None and not removed:
+                self.agent_swarm[tag] = agent
+                self.last_used[tag] = time.monotonic()
+                self.failed_agents.pop(tag, None)
+        if agent is not None and removed:
+            self.close_agent(agent)
+            return None
+        return agent
+
+    def get_agent(self, tag: str) -> BaseBrowser:
+        """Returns an agent, launching it if it isn't launched yet or it was evicted.
+
+        Args:
+            tag (str): The tag of the agent.
+
+        Returns:
+            BaseBrowser: The agent.
+
+        Raises:
+            KeyError: If the agent is not in the swarm.
+            RuntimeError: If the agent fails to launch.
+        """
+        agent = self.agent_swarm.get(tag)
+        if agent is not None:
+            return agent
+        agent_lock = self.agent_locks.get(tag)
+        if agent_lock is None:
+            raise KeyError(f"{tag} is not in the swarm")
+        with agent_lock:
+            agent = self.agent_swarm.get(tag)
+            if agent is None:
+                agent = self.launch_agent(tag)
+        if tag not in self.agent_configs:
+            raise KeyError(f"{tag} is removed from the swarm")
+        if agent is None:
+            raise RuntimeError(f"Unable to launch {tag}") from self.failed_agents.get(tag)
+        return agent
+
+    @contextmanager
+    def use_agent(self, tag: str) -> Iterator[BaseBrowser]:
+        """Holds an agent for the duration of a with block, so that it isn't evicted,
+        and it isn't closed until the block ends if it is removed or replaced meanwhile.
 
         Args:
-            executor (ThreadPoolExecutor): Executer to carry parallel execution.
-            lambda_func (Callable): the function to be applied each of dictionary items.
-            dictionary (Dict): the dictionary of the the application.
+            tag (str): The tag of the agent.
+
+        Yields:
+            BaseBrowser: The agent.
+
+        Raises:
+            KeyError: If the agent is not in the swarm.
+            RuntimeError: If the agent fails to launch.
+        """
+        while True:
+            agent = self.get_agent(tag)
+            with self.lock:
+                # The agent may be evicted or replaced between the lookup and the hold
+                if self.agent_swarm.get(tag) is agent:
+                    self.holders[agent] = self.holders.get(agent, 0) + 1
+                    break
+        try:
+            yield agent
+        finally:
+            with self.lock:
+                self.holders[agent] -= 1
+                self.last_used[tag] = time.monotonic()
+                close = not self.holders[agent] and agent in self.retired
+                if not self.holders[agent]:
+                    del self.holders[agent]
+                    self.retired.discard(agent)
+            if close:
+                self.close_agent(agent)
+
+    def evict_idle(self, idle_timeout: float = None) -> List[str]:
+        """Closes the agents unused for longer than the idle timeout,
+        they are launched again on their next use.
+
+        Args:
+            idle_timeout (float, optional): The idle seconds. Default: idle_timeout setting.
+
+        Returns:
+            List[str]: The tags of the closed agents.
+        """
+        idle_timeout = idle_timeout if idle_timeout is not None else self.idle_timeout
+        if idle_timeout is None:
+            return []
+        now = time.monotonic()
+        with self.lock:
+            evicted = {
+                tag: self.agent_swarm.pop(tag)
+                for tag in list(self.agent_swarm)
+                if not self.holders.get(self.agent_swarm[tag])
+                and now - self.last_used.get(tag, now) >= idle_timeout
+            }
+        for tag, agent in evicted.items():
+            self.logger.info("%s is idle, closing it", tag)
+            self.close_agent(agent)
+        return list(evicted)
+
+    def add_agent(
+        self, tag: str, client_name: str, config: Dict[str, Any] = None
+    ) -> Union[BaseBrowser, None]:
+        """Adds an agent to the running swarm. It is launched before it receives any prompt,
+        unless lazy_start is set.
+
+        Args:
+            tag (str): The tag of the agent.
+            client_name (str): The client name, e.g. 'ChatGPT'.
+            config (Dict[str, Any], optional): The config of the agent, merged into the
+                shared config. Default: None.
 
         Returns:
-            Dict[str, Any]: A dictionary in the form defined by lambda_func
+            BaseBrowser | None: The agent, None if it will be launched on its first use.
+
+        Raises:
+            ValueError: If the tag is already in the swarm.
+            RuntimeError: If the agent fails to launch, it is not added then.
         """
-        with ThreadPoolExecutor() as executor:
-            result = OrderedDict(executor.map(lambda_func, *zip(*dictionary.items())))
-        return result
+        with self.lock:
+            if tag in self.agent_configs:
+                raise ValueError(f"{tag} is already in the swarm")
+            self.agent_configs[tag] = (client_name, self.merge_config(config))
+            self.agent_locks[tag] = threading.Lock()
+        self.resize_executor()
+
+        agent = None
+        if not self.lazy_start:
+            agent = self.launch_agent(tag)
+            if agent is None:
+                with self.lock:
+                    self.agent_configs.pop(tag)
+                    self.agent_locks.pop(tag)
+                raise RuntimeError(f"Unable to launch {tag}") from self.failed_agents.get(tag)
+        with self.lock:
+            if tag in self.agent_configs and tag not in self.agent_names:
+                self.agent_names = self.agent_names + [tag]
+        self.logger.info("%s is added to the swarm", tag)
+        return agent
+
+    def remove_agent(self, tag: str) -> bool:
+        """Removes an agent from the running swarm. It is closed once its ongoing
+        interactions end, the broadcasts in flight still wait for its response.
+
+        Args:
+            tag (str): The tag of the agent.
+
+        Returns:
+            bool: True if the agent is removed, False if it is not in the swarm.
+        """
+        with self.lock:
+            if tag not in self.agent_configs:
+                return False
+            self.agent_names = [name for name in self.agent_names if name != tag]
+            del self.agent_configs[tag]
+            del self.agent_locks[tag]
+            self.last_used.pop(tag, None)
+            self.startup_report.pop(tag, None)
+            self.failed_agents.pop(tag, None)
+            agent = self.agent_swarm.pop(tag, None)
+        if agent is not None:
+            self.retire_agent(agent)
+        self.logger.info("%s is removed from the swarm", tag)
+        return True
+
+    def replace_agent(
+        self, tag: str, client_name: str = None, config: Dict[str, Any] = None
+    ) -> Union[BaseBrowser, None]:
+        """Launches a new instance of an agent, e.g. to recover a crashed one or to apply
+        a new config. The current instance keeps serving until the new one is launched,
+        and it is closed once its ongoing interactions end.
+
+        Args:
+            tag (str): The tag of the agent.
+            client_name (str, optional): The new client name. Default: the current one.
+            config (Dict[str, Any], optional): The new config of the agent, merged into the
+                shared config. Default: None, the current config.
+
+        Returns:
+            BaseBrowser | None: The new agent, None if the agent isn't launched yet
+                and lazy_start is set.
+
+        Raises:
+            KeyError: If the agent is not in the swarm.
+            RuntimeError: If the new instance fails to launch, the current one is kept then.
+        """
+        agent_lock = self.agent_locks.get(tag)
+        if agent_lock is None:
+            raise KeyError(f"{tag} is not in the swarm")
+        with agent_lock:
+            with self.lock:
+                previous = self.agent_configs[tag]
+                self.agent_configs[tag] = (
+                    client_name or previous[0],
+                    previous[1] if config is None else self.merge_config(config),
+                )
+                old_agent = self.agent_swarm.get(tag)
+            if old_agent is None and self.lazy_start:
+                return None
+
+            agent = self.launch_agent(tag)
+            if agent is None:
+                with self.lock:
+                    if tag in self.agent_configs:
+                        self.agent_configs[tag] = previous
+                raise RuntimeError(f"Unable to replace {tag}") from self.failed_agents.get(tag)
+
+        with self.lock:
+            if tag in self.agent_configs and tag not in self.agent_names:
+                self.agent_names = self.agent_names + [tag]
+        if old_agent is not None:
+            self.retire_agent(old_agent)
+        self.logger.info("%s is replaced", tag)
+        return agent
+
+    def reload_config(self, configuration_path: str) -> Dict[str, List[str]]:
+        """Applies the nodes of a configuration to the running swarm: the new nodes are
+        added, the missing ones are removed and only the changed ones are replaced.
+
+        Args:
+            configuration_path (str): The path of the configuration.
+
+        Returns:
+            Dict[str, List[str]]: The 'added', 'removed', 'replaced' and 'failed' tags.
+        """
+        with open(configuration_path) as fd:
+            config = yaml.safe_load(fd)
+        new_configs = self.get_node_configs(config)
+        nodes = {
+            vals.get("tag", key): vals for key, vals in config["driver_settings"]["nodes"].items()
+        }
+        self.config["driver_settings"] = config["driver_settings"]
+        self.shared_config = config["driver_settings"].get("shared")
+
+        changes = {"added": [], "removed": [], "replaced": [], "failed": []}
+        for tag in [tag for tag in self.agent_configs if tag not in new_configs]:
+            self.remove_agent(tag)
+            changes["removed"].append(tag)
+
+        def apply(tag, client_name, node_config):
+            current = self.agent_configs.get(tag)
+            if current == (client_name, node_config):
+                return None
+            try:
+                if current is None:
+                    self.add_agent(tag, client_name, nodes[tag])
+                else:
+                    self.replace_agent(tag, client_name, nodes[tag])
+            except RuntimeError as err:
+                self.logger.error("Unable to apply the config of %s: %s", tag, err)
+                return tag, "failed"
+            return tag, "added" if current is None else "replaced"
+
+        with ThreadPoolExecutor(
+            max_workers=max(len(new_configs), 1), thread_name_prefix="MultiAgent"
+        ) as executor:
+            results = executor.map(
+                lambda item: apply(item[0], *item[1]), new_configs.items()
+            )
+        for result in filter(None, results):
+            changes[result[1]].append(result[0])
+        self.logger.info("The configuration is reloaded: %s", changes)
+        return changes
+
+    def retire_agent(self, agent: BaseBrowser) -> None:
+        """Closes an agent which is out of the swarm, once its ongoing interactions end.
+
+        Args:
+            agent (BaseBrowser): The agent.
+        """
+        with self.lock:
+            if self.holders.get(agent):
+                self.retired.add(agent)
+                return
+        self.close_agent(agent)
+
+    def close_agent(self, agent: BaseBrowser) -> None:
+        """Saves the session of an agent if it has a session_path, and closes it.
+
+        Args:
+            agent (BaseBrowser): The agent.
+        """
+        session_path = getattr(agent, "session_path", None)
+        if session_path and agent.ready:
+            try:
+                agent.save_session(session_path)
+            except (NameError, ImportError) as err:
+                self.logger.warning("Unable to save the session: %s", err)
+        agent.close()
 
     def open_agent(self, client_name: str, config: Dict[str, str]) -> BaseBrowser:
         """Open the given client
@@ -100,8 +574,9 @@ class MultiAgent:
         Returns:
             BaseBrowser: The agent object
         """
-        time.sleep(random() * randint(1, 4))
         client_constructor = get_client(client_name)
+        if client_constructor is None:
+            raise KeyError(f"{client_name} is not a known client")
         return client_constructor(**config)
 
     def set_save_path(self, save_path: str):
@@ -115,11 +590,42 @@ class MultiAgent:
 
     def interact(self, head_name: str, prompt: str) -> str:
         """interact with the given head"""
-        client = self.agent_swarm[head_name]
-        response = client.interact(prompt)
+        with self.use_agent(head_name) as client:
+            response = client.interact(prompt)
         self.log_chat(client_name=client.client_name, response=response)
         return response
 
+    def interact_stream(
+        self, head_name: str, prompt: str, deadline: float = None, timeout: float = None
+    ) -> Iterator[str]:
+        """interact with the given head and yield the response as it is generated,
+        see `BaseBrowser.interact_stream` for the deadline and the timeout"""
+        response = ""
+        with self.use_agent(head_name) as client:
+            for delta in client.interact_stream(prompt, deadline=deadline, timeout=timeout):
+                response += delta
+                yield delta
+        self.log_chat(client_name=client.client_name, response=response)
+
+    def broadcast_async(self, prompt: str, exclude: List[str] = None) -> Dict[str, Future]:
+        """Sends the prompt to the agent swarm without waiting for the responses,
+        before interacting, the agents defined in the exclude list will be removed.
+
+        Args:
+            prompt (str): The prompt to broadcast agents.
+            exclude (List[str], optional): The list of agents to be excluded. Defaults to None.
+
+        Returns:
+            Dict[str, Future]: The futures of the responses of each included agent. The future
+                of an agent removed from the swarm meanwhile raises KeyError.
+        """
+        agents = [agent for agent in self.agent_names if not exclude or agent not in exclude]
+        self.log_chat(prompt=prompt)
+        return OrderedDict(
+            (agent_name, self.submit(self.interact, agent_name, prompt))
+            for agent_name in agents
+        )
+
     def broadcast(self, prompt: str, exclude: List[str] = None) -> Dict[str, str]:
         """Interacts with the agent swarm and returns back the results,
         before interacting, the agents defined in the exclude list will be removed.
@@ -130,20 +636,24 @@ class MultiAgent:
 
         Returns:
             Dict[str, str]: A dictionary contains the responses of each included agent.
+                The agents which fail are left out, their exceptions are kept in
+                broadcast_errors.
         """
-
-        agents = self.agent_swarm
-        if exclude is not None:
-            agents = dict(filter(lambda kv: kv[0] not in exclude, agents.items()))
-
-        self.log_chat(prompt=prompt)
-        responses = self.dictmap(
-            lambda agent_name, _: (
-                agent_name,
-                self.interact(agent_name, prompt),
-            ),
-            agents,
-        )
+        responses = OrderedDict()
+        errors = {}
+        for agent_name, future in self.broadcast_async(prompt, exclude).items():
+            try:
+                responses[agent_name] = future.result()
+            except KeyError as err:
+                if agent_name not in self.agent_configs:
+                    self.logger.warning("%s is removed during the broadcast", agent_name)
+                    continue
+                self.logger.error("%s failed during the broadcast: %r", agent_name, err)
+                errors[agent_name] = err
+            except Exception as err:
+                self.logger.error("%s failed during the broadcast: %r", agent_name, err)
+                errors[agent_name] = err
+        self.broadcast_errors = errors
         return responses
 
     def aggregate(
@@ -183,7 +693,7 @@ class MultiAgent:
             reset_before_agg (bool, optional): If set, resets the chathead. Defaults to True.
         """
 
-        exclude_agents = list(filter(lambda k: k not in agents, self.agent_swarm))
+        exclude_agents = list(filter(lambda k: k not in agents, self.agent_names))
         responses = " \n".join(
             [f"{idx}: {response}" for idx, response in enumerate(responses.values())]
         )
@@ -268,7 +778,7 @@ class MultiAgent:
 
         return self.broadcast_and_aggregate(
             prompt=prompt,
-            agg_agents=self.agent_swarm,
+            agg_agents=self.agent_names,
             agg_prompt=voting_prompt,
             exclude_agg_agents=False,
         )
@@ -278,6 +788,7 @@ class MultiAgent:
         it resets all of them.
 
         Note: Some chat bots doesn't have reset feature.
+        The agents which are not launched, or evicted, have no conversation to reset.
 
         Args:
             agents (List[str], optional): If given, only resets the given agents,
@@ -286,17 +797,15 @@ class MultiAgent:
         Returns:
             List[bool]: The reset status of each agent
         """
-        agents_to_reset = (
-            list(map(self.agent_swarm.get, agents))
-            if agents
-            else self.agent_swarm.values()
-        )
-        with ThreadPoolExecutor() as executor:
-            reset_status = executor.map(
-                lambda agent: agent.reset_thread(),
-                agents_to_reset,
-            )
-        return reset_status
+
+        def reset(tag):
+            if tag not in self.agent_swarm:
+                return True
+            with self.use_agent(tag) as agent:
+                return agent.reset_thread()
+
+        futures = [self.submit(reset, tag) for tag in agents or self.agent_names]
+        return [future.result() for future in futures]
 
     def log_chat(
         self,
@@ -349,11 +858,11 @@ class Conversation(MultiAgent):
     """A special Multiagent setting where two agents carry a conversation"""
     def __init__(self, configuration):
         super().__init__(configuration)
-        if len(self.agent_swarm.keys()) != 2:
+        if len(self.agent_names) != 2:
             self.logger.error("Only two agents are allowed in a conversation")
             return
 
-        self.head_1, self.head_2 = self.agent_swarm.keys()
+        self.head_1, self.head_2 = self.agent_names
         self.head_1_response = None
         self.head_2_response = None
 
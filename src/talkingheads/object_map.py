@@ -5,6 +5,9 @@ from easydict import EasyDict
 markers = EasyDict(
     {
         "ChatGPT": {
+            "file_types"    : [
+                "txt", "md", "json", "csv", "py", "html", "xml", "yaml", "yml", "pdf"
+            ],
             "login_xq"      : "//button[@data-testid='login-button']",
             "email_xq"     : "//input[contains(@class, 'email-input') or @id='username']",
             "pwd_iq"        : "password",
@@ -28,7 +31,10 @@ markers = EasyDict(
             "textarea_tq"   : "textarea",
             "send_btn_xq"   : "//button[@data-testid='send-button']",
             "textarea_xq"   : "//div[@contenteditable='true']",
-            "gpt_xq"        : "//span[text()='{}']"
+            "gpt_xq"        : "//span[text()='{}']",
+            "stream_url_re" : r"/backend-api/(f/)?conversation$",
+            "file_upload_xq": "//input[@type='file']",
+            "file_loaded_xq": "//button[@data-testid='send-button'][not(@disabled)]"
         },
         "Claude": {
             "file_types"    : [
@@ -47,6 +53,8 @@ markers = EasyDict(
             "send_button_xq": '//button[@aria-label="Send Message"]',
             "chatarea_xq"   : '//div[contains(@class, "grid-cols-1")]/div[@class="contents"]',
             "regen_xq"      : "//button[text()='Retry']",
+            "file_upload_xq": "//input[@type='file']",
+            "file_loaded_xq": '//button[@aria-label="Send Message"][not(@disabled)]',
         },
         "Copilot": {
             "file_types"    : ["gif", "jpg", "jpeg", "png", "webp"],
@@ -101,12 +109,13 @@ markers = EasyDict(
             "settings_xq"   : "//h2[text()='Settings']",
             "model_li_xq"   : "//div/a/div[@class='mr-auto truncate']",
             "model_a_xq"    : "//div[h2/text()='Settings']//button",
-            "model_act_xq"  : "//button[@name='Activate model']"
+            "model_act_xq"  : "//button[@name='Activate model']",
+            "stream_url_re" : r"/chat/conversation/[0-9a-f]+$"
         },
         "Pi": {
             "textarea_xq"   : "//textarea[@role='textbox']",
             "sendkeys_xq"   : "//button[@aria-label='Submit text']",
-            "wait_xq"       : "//button[@disabled]",
+            "wait_xq"       : "//textarea[@role='textbox'][@disabled]",
             "chatbox_xq"    : "//div[@class='flex items-center']",
             "model_1_xq"    : "//div[contains(@class, 'shadow-input')]//button",
             "model_2_xq"    : "//button[contains(@class, 't-body-s')]",
@@ -114,3 +123,70 @@ markers = EasyDict(
         }
     }
 )
+
+# Notice containers of the providers: alerts, toasts, banners and dialogs, outside of the
+# conversation. The page states match texts only within them, as the prompts and the
+# responses may quote the same words.
+NOTICE_XQ = (
+    "//*[@role='alert' or @role='alertdialog' or @role='status' or @role='dialog'"
+    " or contains(@class, 'toast') or contains(@class, 'banner')"
+    " or self::snack-bar-container or self::mat-snack-bar-container]"
+    "[not(ancestor-or-self::*[self::article or self::message-content or self::user-query"
+    " or @data-message-author-role or @data-testid='user-message'"
+    " or contains(@class, 'font-claude-message')])]"
+)
+
+
+def notice_xq(*phrases: str, container: str = NOTICE_XQ) -> str:
+    """Returns the xpath of a notice containing any of the phrases, case insensitively.
+
+    Args:
+        *phrases (str): The lowercase phrases.
+        container (str, optional): The xpath of the notice containers. Default: NOTICE_XQ.
+
+    Returns:
+        str: The xpath query.
+    """
+    text = "translate(., 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz')"
+    return f"{container}[{' or '.join(f'contains({text}, {phrase!r})' for phrase in phrases)}]"
+
+
+# Page states blocking the interaction, by the xpath of their visible marker or the
+# pattern of the url path. The default states apply to every client.
+page_states = EasyDict(
+    {
+        "default": {
+            "challenge"     : {
+                "xq": "//*[@id='challenge-stage'] | //iframe[contains(@src, 'challenges.cloudflare.com')]"
+            },
+            "login"         : {"url_re": r"/(log-?in|sign-?in|auth)(/|$)"},
+        },
+        "ChatGPT": {
+            "usage_cap"     : {"xq": notice_xq("reached our limit", "usage cap")},
+            "error"         : {"xq": notice_xq("went wrong", "error")},
+        },
+        "Claude": {
+            "usage_cap"     : {"xq": notice_xq("out of free messages", "message limit")},
+            "error"         : {"xq": notice_xq("error")},
+        },
+        "Copilot": {
+            "usage_cap"     : {"xq": notice_xq("reached the limit")},
+        },
+        "Gemini": {
+            "error"         : {"xq": notice_xq("went wrong", "error", "try again")},
+        },
+        "HuggingChat": {
+            "usage_cap"     : {"xq": notice_xq("too many messages")},
+        },
+    }
+)
+
+# Ordered fallback queries of the markers, tried when the marker doesn't match
+fallbacks = EasyDict(
+    {
+        "ChatGPT": {
+            "textarea_xq"   : ["//textarea[@id='prompt-textarea']"],
+            "send_btn_xq"   : ["//button[@aria-label='Send prompt']"],
+        },
+    }
+)
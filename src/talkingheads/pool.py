@@ -0,0 +1,261 @@
+"""
+This module provides `BrowserPool`, which keeps pre-launched clients ready to hand out.
+
+Constructing a client launches Chrome, loads the provider page and logs in, which takes
+tens of seconds. The pool starts the clients in the background, hands out the idle ones
+on `acquire` and refills itself. The released clients are recycled after their thread
+is reset, or closed if the reset fails or the pool is full.
+"""
+
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator
+
+from .base_browser import BaseBrowser
+from .registry import get_client
+
+# The seconds between two checks of a waiting acquire for failed launches
+ACQUIRE_POLL = 0.5
+
+
+class BrowserPool:
+    """
+    A pool of pre-launched clients per provider.
+
+    Args:
+        sizes (Dict[str, int]): The number of idle clients to keep by client name,
+            e.g. {"ChatGPT": 2, "Pi": 1}.
+        configs (Dict[str, Dict], optional): The constructor arguments by client name.
+            Pass skip_login=False (default) to keep the clients logged in. Default: None.
+        max_workers (int, optional): The number of clients launched at the same time.
+            Default: the total size of the pool.
+        factory (Callable[[str, Dict], BaseBrowser], optional): Creates a client from its
+            name and config. Default: the client class of the name.
+        max_retries (int, optional): The number of relaunches of a client after a failed
+            launch. Default: 3.
+        retry_delay (float, optional): The seconds before the first relaunch, doubled for
+            each of the next ones. Default: 5.
+
+    Attributes:
+        idle (Dict[str, queue.Queue]): The clients ready to hand out by client name.
+        errors (Dict[str, Exception]): The last launch error by client name.
+    """
+
+    def __init__(
+        self,
+        sizes: Dict[str, int],
+        configs: Dict[str, Dict] = None,
+        max_workers: int = None,
+        factory: Callable[[str, Dict], BaseBrowser] = None,
+        max_retries: int = 3,
+        retry_delay: float = 5.0,
+    ):
+        self.sizes = dict(sizes)
+        self.configs = configs or {}
+        self.factory = factory or (lambda name, config: get_client(name)(**config))
+        self.idle = {name: queue.Queue() for name in self.sizes}
+        self.pending = dict.fromkeys(self.sizes, 0)
+        self.recycling = dict.fromkeys(self.sizes, 0)
+        self.errors = {}
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self.closed = False
+        self.lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(
+            max_workers=max_workers or max(sum(self.sizes.values()), 1),
+            thread_name_prefix="BrowserPool",
+        )
+        self.logger = logging.getLogger("BrowserPool")
+        for name in self.sizes:
+            self.refill(name)
+
+    def __del__(self):
+        self.close()
+
+    def refill(self, name: str) -> None:
+        """Launches clients in the background until the idle, the launching and the
+        recycling ones reach the size of the pool.
+
+        Args:
+            name (str): The client name.
+        """
+        with self.lock:
+            if self.closed:
+                return
+            missing = (
+                self.sizes[name]
+                - self.idle[name].qsize()
+                - self.pending[name]
+                - self.recycling[name]
+            )
+            self.pending[name] += max(missing, 0)
+        for _ in range(missing):
+            self.executor.submit(self._launch, name)
+
+    def _launch(self, name: str, attempt: int = 0) -> None:
+        with self.lock:
+            if self.closed:
+                self.pending[name] -= 1
+                return
+        started = time.monotonic()
+        client = None
+        try:
+            client = self.factory(name, dict(self.configs.get(name, {})))
+            self.logger.info("%s is launched in %.1f seconds", name, time.monotonic() - started)
+        except Exception as err:
+            self.logger.error("Unable to launch %s: %s", name, err)
+            self.errors[name] = err
+        with self.lock:
+            retry = client is None and attempt < self.max_retries and not self.closed
+            if not retry:
+                self.pending[name] -= 1
+            keep = client is not None and not self.closed
+            if keep:
+                self.idle[name].put(client)
+        if client is not None and not keep:
+            self.discard(client)
+        if retry:
+            delay = self.retry_delay * 2 ** attempt
+            self.logger.info("%s will be relaunched in %.1f seconds", name, delay)
+            timer = threading.Timer(delay, self._relaunch, (name, attempt + 1))
+            timer.daemon = True
+            timer.start()
+
+    def _relaunch(self, name: str, attempt: int) -> None:
+        with self.lock:
+            if not self.closed:
+                self.executor.submit(self._launch, name, attempt)
+                return
+            self.pending[name] -= 1
+
+    def acquire(self, name: str, timeout: float = None) -> BaseBrowser:
+        """Hands out an idle client and launches its replacement in the background.
+
+        Args:
+            name (str): The client name.
+            timeout (float, optional): The seconds to wait for a client if none is idle.
+                Default: None, waits until one is ready.
+
+        Returns:
+            BaseBrowser: The client, for the exclusive use of the caller until released.
+
+        Raises:
+            KeyError: If the client name is not in the pool.
+            TimeoutError: If no client is ready before the timeout.
+            RuntimeError: If no client is idle and the launches have failed after their
+                retries, the launches are restarted for the next calls then.
+        """
+        if name not in self.sizes:
+            raise KeyError(f"{name} is not in the pool")
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            wait = ACQUIRE_POLL
+            if deadline is not None:
+                wait = min(wait, max(deadline - time.monotonic(), 0))
+            try:
+                client = self.idle[name].get(timeout=wait)
+                break
+            except queue.Empty as err:
+                with self.lock:
+                    stalled = not self.pending[name] and not self.recycling[name]
+                if stalled and name in self.errors:
+                    self.refill(name)
+                    raise RuntimeError(
+                        f"No {name} client could be launched: {self.errors[name]}"
+                    ) from err
+                if deadline is not None and time.monotonic() >= deadline:
+                    raise TimeoutError(
+                        f"No {name} client is ready, last error: {self.errors.get(name)}"
+                    ) from err
+        self.refill(name)
+        return client
+
+    def release(self, client: BaseBrowser, recycle: bool = True) -> None:
+        """Returns a client to the pool. It is recycled in the background after its
+        thread is reset, if the pool is not full, otherwise it is closed.
+
+        Args:
+            client (BaseBrowser): The client handed out by `acquire`.
+            recycle (bool, optional): If False, the client is closed. Default: True.
+        """
+        with self.lock:
+            recycle = recycle and not self.closed
+            if recycle:
+                self.recycling[client.client_name] += 1
+        if not recycle:
+            self.discard(client)
+            return
+        self.executor.submit(self._recycle, client)
+
+    def _recycle(self, client: BaseBrowser) -> None:
+        name = client.client_name
+        reset = False
+        try:
+            reset = not self.closed and client.reset_thread()
+        except Exception as err:
+            self.logger.warning("Unable to reset %s: %s", name, err)
+        with self.lock:
+            self.recycling[name] -= 1
+            keep = reset and not self.closed and self.idle[name].qsize() < self.sizes[name]
+            if keep:
+                self.idle[name].put(client)
+                self.logger.info("%s is recycled", name)
+        if not keep:
+            self.discard(client)
+        self.refill(name)
+
+    def discard(self, client: BaseBrowser) -> None:
+        """Closes a client which leaves the pool, quitting its browser.
+
+        Args:
+            client (BaseBrowser): The client.
+        """
+        try:
+            client.close()
+        except Exception as err:
+            self.logger.warning("Unable to close %s: %s", client.client_name, err)
+
+    @contextmanager
+    def lease(self, name: str, timeout: float = None) -> Iterator[BaseBrowser]:
+        """Acquires a client for the duration of a with block and releases it afterwards.
+
+        Args:
+            name (str): The client name.
+            timeout (float, optional): The seconds to wait for a client. Default: None.
+
+        Yields:
+            BaseBrowser: The client.
+        """
+        client = self.acquire(name, timeout)
+        try:
+            yield client
+        finally:
+            self.release(client)
+
+    def available(self) -> Dict[str, int]:
+        """Returns the number of idle clients by client name.
+
+        Returns:
+            Dict[str, int]: The number of idle clients.
+        """
+        return {name: idle.qsize() for name, idle in self.idle.items()}
+
+    def close(self) -> None:
+        """Stops refilling and closes the idle clients. The queued launches are dropped,
+        the clients being launched or recycled are closed once they are ready,
+        the acquired ones are left to the caller."""
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            clients = []
+            for idle in self.idle.values():
+                while not idle.empty():
+                    clients.append(idle.get_nowait())
+        self.executor.shutdown(wait=False)
+        for client in clients:
+            self.discard(client)
@@ -0,0 +1,98 @@
+"""
+This module resolves the client classes by their names, importing them on demand.
+
+The built-in clients are listed below, other packages can provide clients through the
+'talkingheads.clients' entry point group, e.g. in their pyproject.toml:
+
+    [project.entry-points."talkingheads.clients"]
+    MyChat = "my_package.client:MyChatClient"
+"""
+
+import importlib
+import logging
+import sys
+from importlib import metadata
+from typing import Dict, List, Type, Union
+
+ENTRY_POINT_GROUP = "talkingheads.clients"
+
+BUILTIN_CLIENTS = {
+    "ChatGPT": "talkingheads.model_library.chatgpt:ChatGPTClient",
+    "Claude": "talkingheads.model_library.claude:ClaudeClient",
+    "Copilot": "talkingheads.model_library.copilot:CopilotClient",
+    "Gemini": "talkingheads.model_library.gemini:GeminiClient",
+    "HuggingChat": "talkingheads.model_library.huggingchat:HuggingChatClient",
+    "LeChat": "talkingheads.model_library.lechat:LeChatClient",
+    "Pi": "talkingheads.model_library.pi:PiClient",
+}
+
+_registered = {}
+_resolved = {}
+
+
+def _entry_points() -> Dict[str, str]:
+    if sys.version_info >= (3, 10):
+        entry_points = metadata.entry_points(group=ENTRY_POINT_GROUP)
+    else:
+        entry_points = metadata.entry_points().get(ENTRY_POINT_GROUP, [])
+    return {entry_point.name: entry_point.value for entry_point in entry_points}
+
+
+def register_client(client_name: str, target: Union[str, type]) -> None:
+    """Registers a client class, overriding the built-in and the entry point clients.
+
+    Args:
+        client_name (str): The name of the client.
+        target (str | type): The client class, or its path as 'module:attribute'.
+    """
+    _registered[client_name] = target
+    _resolved.pop(client_name, None)
+
+
+def unregister_client(client_name: str) -> bool:
+    """Removes a client class registered by `register_client`,
+    the built-in or the entry point client of the name is used again.
+
+    Args:
+        client_name (str): The name of the client.
+
+    Returns:
+        bool: True if the client was registered, False otherwise.
+    """
+    _resolved.pop(client_name, None)
+    return _registered.pop(client_name, None) is not None
+
+
+def available_clients() -> List[str]:
+    """Returns the names of the clients, without importing them.
+
+    Returns:
+        List[str]: The client names.
+    """
+    return sorted({**BUILTIN_CLIENTS, **_entry_points(), **_registered})
+
+
+def get_client(client_name: str) -> Union[Type, None]:
+    """Returns the client class by its name, importing its module on first use.
+
+    Args:
+        client_name (str): The name of the client, e.g. 'ChatGPT'.
+
+    Returns:
+        type | None: The client class, None if there is no such client.
+    """
+    if client_name in _resolved:
+        return _resolved[client_name]
+
+    target = _registered.get(client_name)
+    if target is None:
+        target = BUILTIN_CLIENTS.get(client_name) or _entry_points().get(client_name)
+    if target is None:
+        logging.error("Client %s is not found", client_name)
+        return None
+
+    if isinstance(target, str):
+        module_name, _, attribute = target.partition(":")
+        target = getattr(importlib.import_module(module_name), attribute)
+    _resolved[client_name] = target
+    return target
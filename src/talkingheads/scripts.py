@@ -0,0 +1,422 @@
+"""Storage of the javascript snippets injected into the pages"""
+
+# Resolves a selenium locator (By.XPATH, By.TAG_NAME, ...) to an array of nodes.
+LOCATE = """
+const thLocate = (by, query, root) => {
+    root = root || document;
+    switch (by) {
+        case "xpath": {
+            const snap = document.evaluate(
+                query, root, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null
+            );
+            const nodes = [];
+            for (let i = 0; i < snap.snapshotLength; i++) nodes.push(snap.snapshotItem(i));
+            return nodes;
+        }
+        case "css selector": return Array.from(root.querySelectorAll(query));
+        case "tag name": return Array.from(root.getElementsByTagName(query));
+        case "class name": return Array.from(root.getElementsByClassName(query));
+        case "id": return Array.from(root.querySelectorAll(`[id="${CSS.escape(query)}"]`));
+        case "name": return Array.from(root.querySelectorAll(`[name="${CSS.escape(query)}"]`));
+    }
+    return [];
+};
+"""
+
+# Returns the name of the first page state whose marker is visible or whose url pattern
+# matches the current path, null if the page is not blocked. The states are given as
+# [name, xpath, urlRe] in the order of precedence.
+CLASSIFY = LOCATE + """
+const thClassify = (states) => {
+    for (const [name, query, urlRe] of states) {
+        if (urlRe && new RegExp(urlRe).test(location.pathname)) return name;
+        if (query && thLocate("xpath", query).some((node) => node.getClientRects().length)) {
+            return name;
+        }
+    }
+    return null;
+};
+"""
+
+PAGE_STATE = CLASSIFY + """
+return thClassify(arguments[0]);
+"""
+
+# Installs a MutationObserver on the page which keeps track of the last element
+# matching the chatbox locator. Must be called before the prompt is sent, so that
+# the baseline (number of messages and the text of the last one) is known.
+WATCH_RESPONSE = LOCATE + """
+const [by, query, busyBy, busyQuery] = arguments;
+if (window.__thWatch) window.__thWatch.observer.disconnect();
+
+const signature = () => {
+    const nodes = thLocate(by, query);
+    const last = nodes[nodes.length - 1];
+    return [nodes.length, last ? last.textContent : ""];
+};
+const [count, text] = signature();
+const state = {
+    by, query, busyBy, busyQuery,
+    baseCount: count, baseText: text, count, text,
+    changed: false, busySeen: false, lastChange: performance.now(), firstChange: null,
+};
+state.isBusy = () => {
+    if (!state.busyQuery) return false;
+    const busy = thLocate(state.busyBy, state.busyQuery).length > 0;
+    state.busySeen = state.busySeen || busy;
+    return busy;
+};
+state.check = () => {
+    const [c, t] = signature();
+    if (c !== state.count || t !== state.text) {
+        state.count = c;
+        state.text = t;
+        state.lastChange = performance.now();
+        state.changed = state.changed || c > state.baseCount || t !== state.baseText;
+        if (state.changed && state.firstChange === null) state.firstChange = state.lastChange;
+    }
+    state.isBusy();
+};
+state.settled = (quietMs) => {
+    const busy = state.isBusy();
+    const idle = performance.now() - state.lastChange;
+    const hasText = state.text.trim().length > 0;
+    return state.changed && hasText && !busy && (state.busySeen || idle >= quietMs);
+};
+state.sinceFirstChange = () => (
+    state.firstChange === null ? null : performance.now() - state.firstChange
+);
+state.last = () => {
+    const nodes = thLocate(by, query);
+    return nodes[nodes.length - 1];
+};
+state.observer = new MutationObserver(state.check);
+state.observer.observe(document.body, {childList: true, subtree: true, characterData: true});
+window.__thWatch = state;
+return count;
+"""
+
+# Long-poll on the watcher installed by WATCH_RESPONSE. Resolves as soon as the
+# response is settled, that is, the busy marker has disappeared or the chatbox
+# has not mutated for quietMs. Otherwise, resolves with done=false after pollMs,
+# so that the caller can poll again without hitting the script timeout.
+# Resolves with the name of the state if the page gets blocked, see CLASSIFY.
+AWAIT_RESPONSE = CLASSIFY + """
+const [quietMs, pollMs, pageStates, done] = arguments;
+const state = window.__thWatch;
+if (!state) {
+    done(null);
+    return;
+}
+const started = performance.now();
+let classified = 0;
+const tick = () => {
+    if (performance.now() - classified >= 500) {
+        classified = performance.now();
+        const blocked = thClassify(pageStates);
+        if (blocked) {
+            done({done: false, state: blocked});
+            return;
+        }
+    }
+    state.check();
+    if (state.settled(quietMs)) {
+        state.observer.disconnect();
+        window.__thWatch = null;
+        const last = state.last();
+        done({
+            done: true,
+            text: last ? last.innerText : state.text,
+            sinceFirstChange: state.sinceFirstChange(),
+        });
+        return;
+    }
+    if (performance.now() - started >= pollMs) {
+        done({done: false, length: state.text.length});
+        return;
+    }
+    setTimeout(tick, 50);
+};
+tick();
+"""
+
+# Long-poll on the watcher installed by WATCH_RESPONSE for streaming. Resolves with
+# the current text of the response whenever it changes after the previous call,
+# with done=true once the response is settled, or the name of the blocking state.
+STREAM_RESPONSE = CLASSIFY + """
+const [quietMs, pollMs, pageStates, done] = arguments;
+const state = window.__thWatch;
+if (!state) {
+    done(null);
+    return;
+}
+const started = performance.now();
+let classified = 0;
+const tick = () => {
+    if (performance.now() - classified >= 500) {
+        classified = performance.now();
+        const blocked = thClassify(pageStates);
+        if (blocked) {
+            done({done: false, state: blocked});
+            return;
+        }
+    }
+    state.check();
+    const last = state.last();
+    if (state.settled(quietMs)) {
+        state.observer.disconnect();
+        window.__thWatch = null;
+        done({
+            done: true,
+            text: last ? last.innerText : state.text,
+            sinceFirstChange: state.sinceFirstChange(),
+        });
+        return;
+    }
+    if (state.changed && last && state.text !== state.streamed) {
+        state.streamed = state.text;
+        done({done: false, text: last.innerText});
+        return;
+    }
+    if (performance.now() - started >= pollMs) {
+        done({done: false, text: null});
+        return;
+    }
+    setTimeout(tick, 50);
+};
+tick();
+"""
+
+# 32-bit FNV-1a over UTF-16 code units, mirrored by utils.text_hash.
+HASH = """
+const thHash = (text, seed) => {
+    let hash = seed === undefined ? 0x811c9dc5 : seed;
+    for (let i = 0; i < text.length; i++) {
+        hash ^= text.charCodeAt(i);
+        hash = Math.imul(hash, 0x01000193) >>> 0;
+    }
+    return hash;
+};
+"""
+
+# Returns the text appended to the last element matching the locator since the
+# previous read. The cursor is kept in the page and validated against the length
+# and the hash known by the caller, if they don't match or the already read part
+# has changed, the whole text is returned with reset=true.
+READ_DELTA = LOCATE + HASH + """
+const [by, query, key, knownLength, knownHash] = arguments;
+const cursors = window.__thCursors = window.__thCursors || {};
+const nodes = thLocate(by, query);
+const last = nodes[nodes.length - 1];
+const text = last ? last.textContent : "";
+
+let cursor = cursors[key];
+if (!cursor || cursor.length !== knownLength || cursor.hash !== knownHash) {
+    cursor = {length: 0, hash: thHash("")};
+}
+if (text.length === cursor.length && thHash(text) === cursor.hash) {
+    return {reset: false, delta: "", length: cursor.length, hash: cursor.hash};
+}
+let result;
+if (text.length >= cursor.length && thHash(text.slice(0, cursor.length)) === cursor.hash) {
+    const delta = text.slice(cursor.length);
+    result = {reset: cursor.length === 0, delta, hash: thHash(delta, cursor.hash)};
+} else {
+    result = {reset: true, delta: text, hash: thHash(text)};
+}
+result.length = text.length;
+cursors[key] = {length: result.length, hash: result.hash};
+return result;
+"""
+
+# Focuses the input element and moves the caret to the end. Rich text editors
+# (contenteditable) receive the text as a synthetic paste event, which they handle
+# as a whole. Returns "paste" if the editor consumed the event, "native" otherwise,
+# in which case the text is inserted through the DevTools Input.insertText command.
+INSERT_TEXT = """
+const [element, text] = arguments;
+element.focus();
+if (element instanceof HTMLTextAreaElement || element instanceof HTMLInputElement) {
+    element.setSelectionRange(element.value.length, element.value.length);
+    return "native";
+}
+const range = document.createRange();
+range.selectNodeContents(element);
+range.collapse(false);
+const selection = window.getSelection();
+selection.removeAllRanges();
+selection.addRange(range);
+
+const data = new DataTransfer();
+data.setData("text/plain", text);
+const event = new ClipboardEvent("paste", {clipboardData: data, bubbles: true, cancelable: true});
+element.dispatchEvent(event);
+return event.defaultPrevented ? "paste" : "native";
+"""
+
+# Returns the current content of an input element or a rich text editor.
+INPUT_VALUE = """
+const element = arguments[0];
+return element.value !== undefined ? element.value : element.innerText;
+"""
+
+# Calls an operation of the page agent, returns null if the agent is not injected.
+PAGE_AGENT_CALL = """
+const [operation, args] = arguments;
+const agent = window.__thAgent;
+return agent ? {value: agent[operation](...args)} : null;
+"""
+
+# Injects the page agent, built from the markers of the client, and calls an operation.
+# submit(prompt) writes the prompt and clicks the send button, returns "sent", or
+# "enter" if the button is not available yet, then the caller presses enter.
+# state() returns the readiness of the input and the status of the responses.
+# readLast() returns the rendered text of the last response.
+PAGE_AGENT = LOCATE + """
+const [config, operation, args] = arguments;
+const all = (locator) => locator ? thLocate(locator[0], locator[1]) : [];
+const first = (locator) => all(locator)[0];
+const isField = (element) => (
+    element instanceof HTMLTextAreaElement || element instanceof HTMLInputElement
+);
+const valueOf = (element) => isField(element) ? element.value : element.innerText;
+const compact = (text) => text.replace(/\\s/g, "");
+
+const selectEnd = (element, all) => {
+    if (isField(element)) {
+        element.setSelectionRange(all ? 0 : element.value.length, element.value.length);
+        return;
+    }
+    const range = document.createRange();
+    range.selectNodeContents(element);
+    if (!all) range.collapse(false);
+    const selection = window.getSelection();
+    selection.removeAllRanges();
+    selection.addRange(range);
+};
+
+window.__thAgent = {
+    config,
+    state() {
+        const input = first(config.input);
+        const send = first(config.send);
+        const responses = all(config.response);
+        const last = responses[responses.length - 1];
+        return {
+            inputReady: !!input && !input.disabled,
+            inputLength: input ? valueOf(input).trim().length : 0,
+            sendEnabled: send ? !send.disabled && send.getAttribute("aria-disabled") !== "true" : null,
+            busy: all(config.busy).length > 0,
+            responses: responses.length,
+            lastLength: last ? last.textContent.length : 0,
+        };
+    },
+    readLast() {
+        const responses = all(config.response);
+        const last = responses[responses.length - 1];
+        return last ? last.innerText : "";
+    },
+    submit(prompt) {
+        const input = first(config.input);
+        if (!input) return "no_input";
+        input.focus();
+        selectEnd(input, false);
+        let handled = false;
+        if (!isField(input)) {
+            const data = new DataTransfer();
+            data.setData("text/plain", prompt);
+            const event = new ClipboardEvent(
+                "paste", {clipboardData: data, bubbles: true, cancelable: true}
+            );
+            input.dispatchEvent(event);
+            handled = event.defaultPrevented;
+        }
+        if (!handled) document.execCommand("insertText", false, prompt);
+
+        if (!compact(valueOf(input)).includes(compact(prompt))) {
+            selectEnd(input, true);
+            document.execCommand("delete");
+            return "mismatch";
+        }
+        const send = first(config.send);
+        if (send && !send.disabled && send.getAttribute("aria-disabled") !== "true") {
+            send.click();
+            return "sent";
+        }
+        return "enter";
+    },
+};
+return {value: window.__thAgent[operation](...args)};
+"""
+
+# Resolves the candidate locators in order, returns the matches of the first
+# candidate that matches, its index and the time spent in milliseconds.
+MATCH_CANDIDATES = LOCATE + """
+const thMatch = (candidates, root) => {
+    const started = performance.now();
+    for (let idx = 0; idx < candidates.length; idx++) {
+        const nodes = thLocate(candidates[idx][0], candidates[idx][1], root);
+        if (nodes.length) return {nodes, index: idx, cost: performance.now() - started};
+    }
+    return {nodes: [], index: -1, cost: performance.now() - started};
+};
+"""
+
+# Resolves several lookups at once, {name: [candidates, returnType]}, within the root
+# element if given. Each name maps to the first, last or all matches (null if none),
+# the index of the matching candidate and the lookup cost.
+FIND_MANY = MATCH_CANDIDATES + """
+const [queries, root] = arguments;
+const found = {};
+for (const [name, [candidates, returnType]] of Object.entries(queries)) {
+    const {nodes, index, cost} = thMatch(candidates, root);
+    let value = null;
+    if (nodes.length) {
+        if (returnType === "all") value = nodes;
+        else value = returnType === "last" ? nodes[nodes.length - 1] : nodes[0];
+    }
+    found[name] = {value, index, cost};
+}
+return found;
+"""
+
+# Returns the presence, visibility and enabled state of the first match of each
+# lookup, {name: candidates}, without transferring the elements.
+PROBE = MATCH_CANDIDATES + """
+const [queries] = arguments;
+const flags = {};
+for (const [name, candidates] of Object.entries(queries)) {
+    const {nodes} = thMatch(candidates);
+    const node = nodes[0];
+    flags[name] = {
+        count: nodes.length,
+        present: !!node,
+        visible: !!node && node.getClientRects().length > 0
+            && getComputedStyle(node).visibility !== "hidden",
+        enabled: !!node && !node.disabled && node.getAttribute("aria-disabled") !== "true",
+    };
+}
+return flags;
+"""
+
+# Returns the origin, the localStorage and the sessionStorage of the page.
+READ_STORAGE = """
+const dump = (storage) => {
+    const items = {};
+    for (let i = 0; i < storage.length; i++) {
+        const key = storage.key(i);
+        items[key] = storage.getItem(key);
+    }
+    return items;
+};
+return [location.origin, dump(localStorage), dump(sessionStorage)];
+"""
+
+# Writes the storage read by READ_STORAGE, evaluated before the scripts of the page,
+# preceded by the declaration of origin, local and session.
+WRITE_STORAGE = """
+if (location.origin === origin) {
+    for (const [key, value] of Object.entries(local)) localStorage.setItem(key, value);
+    for (const [key, value] of Object.entries(session)) sessionStorage.setItem(key, value);
+}
+"""
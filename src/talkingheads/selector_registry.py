@@ -0,0 +1,132 @@
+"""
+This module compiles the markers of a client into the fastest available locator strategy.
+
+Simple XPath queries, consisting of tag names, attribute tests and child or descendant
+steps, are translated into CSS selectors which browsers resolve considerably faster.
+Each marker may have ordered fallback queries, defined in `object_map.fallbacks`, which
+are tried when the primary query doesn't match. The registry records the query that
+matched and its lookup cost, and promotes it to the front for the next lookups.
+"""
+
+import re
+from typing import Dict, List, Tuple, Union
+
+from selenium.webdriver.common.by import By
+
+# Suffixes of the marker names and their locator strategies
+SUFFIX_MAP = {
+    "_xq": By.XPATH,
+    "_cq": By.CLASS_NAME,
+    "_tq": By.TAG_NAME,
+    "_iq": By.ID,
+}
+
+_STEP = r"(//|/)(\*|[A-Za-z][\w-]*)((?:\[[^\[\]]+\])*)"
+_PREDICATES = [
+    (re.compile(r"@([\w-]+)\s*=\s*(['\"])(.*)\2"), "[{}=\"{}\"]"),
+    (re.compile(r"contains\(\s*@([\w-]+)\s*,\s*(['\"])(.*)\2\s*\)"), "[{}*=\"{}\"]"),
+    (re.compile(r"starts-with\(\s*@([\w-]+)\s*,\s*(['\"])(.*)\2\s*\)"), "[{}^=\"{}\"]"),
+]
+
+
+def xpath_to_css(xpath: str) -> Union[str, None]:
+    """Translates a simple XPath query into an equivalent CSS selector.
+
+    Args:
+        xpath (str): The XPath query, starting with '//'.
+
+    Returns:
+        str | None: The CSS selector, None if the query can't be expressed in CSS,
+            e.g. it tests the text or uses axes, positions or functions.
+    """
+    xpath = xpath.strip()
+    if not xpath.startswith("//") or not re.fullmatch(f"(?:{_STEP})+", xpath):
+        return None
+
+    selector = []
+    for idx, (axis, tag, predicates) in enumerate(re.findall(_STEP, xpath)):
+        if idx:
+            selector.append(" > " if axis == "/" else " ")
+        selector.append(tag)
+        for predicate in re.findall(r"\[([^\[\]]+)\]", predicates):
+            css = _predicate_to_css(predicate.strip())
+            if css is None:
+                return None
+            selector.append(css)
+    return "".join(selector)
+
+
+def _predicate_to_css(predicate: str) -> Union[str, None]:
+    if re.fullmatch(r"@[\w-]+", predicate):
+        return f"[{predicate[1:]}]"
+    for pattern, template in _PREDICATES:
+        match = pattern.fullmatch(predicate)
+        if match and match.group(2) not in match.group(3):
+            value = match.group(3).replace("\\", "\\\\").replace('"', '\\"')
+            return template.format(match.group(1), value)
+    return None
+
+
+class SelectorRegistry:
+    """
+    Keeps the compiled and ranked candidate queries of the lookups of a client.
+
+    Args:
+        markers (Dict): The markers of the client.
+        fallbacks (Dict[str, List[str]], optional): The fallback queries by marker name.
+
+    Attributes:
+        stats (Dict[Tuple[str, str], Dict]): The query that matched, its lookup cost in
+            milliseconds and the number of lookups, by the primary query.
+    """
+
+    def __init__(self, markers: Dict, fallbacks: Dict[str, List[str]] = None):
+        self.fallbacks = {}
+        self.candidates = {}
+        self.stats = {}
+        for name, queries in (fallbacks or {}).items():
+            by = SUFFIX_MAP.get(name[-3:])
+            if by is None or name not in markers:
+                continue
+            self.fallbacks[(by, markers[name])] = queries
+
+    def compile(self, by: str, elem_query: str) -> List[Tuple[str, str]]:
+        """Returns the candidate queries of a lookup, in the order of trial.
+
+        Args:
+            by (str): The method used to locate the element.
+            elem_query (str): The primary query.
+
+        Returns:
+            List[Tuple[str, str]]: The candidate (by, query) pairs.
+        """
+        key = (by, elem_query)
+        if key not in self.candidates:
+            compiled = []
+            for query in [elem_query] + self.fallbacks.get(key, []):
+                css = xpath_to_css(query) if by == By.XPATH else None
+                candidate = (By.CSS_SELECTOR, css) if css else (by, query)
+                if candidate not in compiled:
+                    compiled.append(candidate)
+            self.candidates[key] = compiled
+        return self.candidates[key]
+
+    def record(self, by: str, elem_query: str, index: int, cost: float) -> None:
+        """Records the result of a lookup and promotes the matching candidate.
+
+        Args:
+            by (str): The method used to locate the element.
+            elem_query (str): The primary query.
+            index (int): The index of the matching candidate, -1 if none matched.
+            cost (float): The lookup time in milliseconds.
+        """
+        key = (by, elem_query)
+        stats = self.stats.setdefault(key, {"winner": None, "cost": 0.0, "lookups": 0})
+        stats["lookups"] += 1
+        stats["cost"] = cost
+        if index < 0:
+            return
+        candidates = self.compile(by, elem_query)
+        stats["winner"] = candidates[index]
+        if index > 0:
+            candidates.insert(0, candidates.pop(index))
@@ -0,0 +1,93 @@
+"""
+This module encrypts and decrypts the session snapshots of the clients.
+
+A snapshot holds the cookies, the localStorage and the sessionStorage of a logged-in
+client, which is as sensitive as the credentials. It is encrypted with a key derived
+from a passphrase (PBKDF2-SHA256) and Fernet, which requires the optional
+`cryptography` package: pip install talkingheads[session]
+"""
+
+import base64
+import json
+import os
+from typing import Any, Dict
+
+# Environment variable holding the passphrase of the session snapshots
+SESSION_KEY_VAR = "TALKINGHEADS_SESSION_KEY"
+
+SALT_SIZE = 16
+KDF_ITERATIONS = 390000
+
+
+def _fernet(passphrase: str, salt: bytes):
+    try:
+        from cryptography.fernet import Fernet
+        from cryptography.hazmat.primitives import hashes
+        from cryptography.hazmat.primitives.kdf.pbkdf2 import PBKDF2HMAC
+    except ImportError as err:
+        raise ImportError(
+            "Session snapshots require cryptography, install it with "
+            "pip install talkingheads[session]"
+        ) from err
+
+    kdf = PBKDF2HMAC(
+        algorithm=hashes.SHA256(), length=32, salt=salt, iterations=KDF_ITERATIONS
+    )
+    return Fernet(base64.urlsafe_b64encode(kdf.derive(passphrase.encode())))
+
+
+def get_passphrase(passphrase: str = None) -> str:
+    """Returns the given passphrase or the one in the environment.
+
+    Args:
+        passphrase (str, optional): The passphrase. Default: None.
+
+    Returns:
+        str: The passphrase.
+
+    Raises:
+        NameError: If there is no passphrase.
+    """
+    passphrase = passphrase or os.environ.get(SESSION_KEY_VAR)
+    if not passphrase:
+        raise NameError(
+            f"Either provide a passphrase or set the environment variable {SESSION_KEY_VAR}"
+        )
+    return passphrase
+
+
+def encrypt_session(snapshot: Dict[str, Any], passphrase: str) -> bytes:
+    """Encrypts a session snapshot.
+
+    Args:
+        snapshot (Dict[str, Any]): The JSON serializable snapshot.
+        passphrase (str): The passphrase.
+
+    Returns:
+        bytes: The salt followed by the Fernet token.
+    """
+    salt = os.urandom(SALT_SIZE)
+    token = _fernet(passphrase, salt).encrypt(json.dumps(snapshot).encode())
+    return salt + token
+
+
+def decrypt_session(blob: bytes, passphrase: str) -> Dict[str, Any]:
+    """Decrypts a session snapshot.
+
+    Args:
+        blob (bytes): The output of `encrypt_session`.
+        passphrase (str): The passphrase.
+
+    Returns:
+        Dict[str, Any]: The snapshot.
+
+    Raises:
+        ValueError: If the passphrase is wrong or the snapshot is corrupted.
+    """
+    fernet = _fernet(passphrase, blob[:SALT_SIZE])
+    from cryptography.fernet import InvalidToken
+
+    try:
+        return json.loads(fernet.decrypt(blob[SALT_SIZE:]))
+    except InvalidToken as err:
+        raise ValueError("The session snapshot can't be decrypted") from err
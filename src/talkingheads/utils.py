@@ -1,13 +1,31 @@
 """Utility functions of talkingheads library"""
+import contextlib
+import json
+import os
 import re
 import subprocess
 import logging
-from typing import List, Union
+import sys
+import tempfile
+from typing import Iterator, List, Union
 
 import filetype
 from undetected_chromedriver import find_chrome_executable
+from undetected_chromedriver.patcher import Patcher
 import validators
 
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+# Directory of the files kept across runs, e.g. the patched drivers and the latency history
+CACHE_DIR = os.path.join(os.path.expanduser("~"), ".talkingheads")
+
+BROWSER_VERSION_RE = re.compile(
+    r"(?:Google\s+Chrome|Chromium)(?:\s+for\s+Testing|\s+Beta|\s+Canary)?\s+(\d{2,3})"
+)
+
 
 def check_filetype(filepath, extensions: List[str]) -> bool:
     """Checks if the given file is expected, return False if the extension
@@ -26,20 +44,57 @@ def check_filetype(filepath, extensions: List[str]) -> bool:
     return extension in extensions
 
 
-def detect_chrome_version(version_num: int = None) -> Union[int, None]:
+@contextlib.contextmanager
+def file_lock(path: str) -> Iterator[None]:
+    """Holds an exclusive lock on the file, shared by the processes on the machine.
+
+    Args:
+        path (str): The path of the lock file, created if missing.
+
+    Yields:
+        None
     """
-    Detects the Google Chrome version on Linux and macOS machines.
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "a+b") as handle:
+        if os.name == "nt":
+            handle.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(handle.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    continue
+        else:
+            fcntl.flock(handle, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            if os.name == "nt":
+                handle.seek(0)
+                msvcrt.locking(handle.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(handle, fcntl.LOCK_UN)
+
+
+def detect_chrome_version(
+    version_num: int = None, browser_path: str = None, cache_dir: str = CACHE_DIR
+) -> Union[int, None]:
+    """
+    Detects the major version of Google Chrome or Chromium.
 
     Args
         version_num (int, optional): The chromedriver version number. Default: None.
+        browser_path (str, optional): The browser executable. Default: the one found in PATH.
+        cache_dir (str, optional): The directory of the version cache. Default: CACHE_DIR.
 
     Returns:
-        int: The detected Google Chrome version number.
+        int: The detected browser version number.
 
     Note:
     - If version_num is provided, it will be returned without any detection.
 
-    - Uses subprocess to execute the 'google-chrome --version' command for detection.
+    - The version is cached by the path and the modification time of the executable,
+      the executable is only run with '--version' when it changes.
 
     - If the command output doesn't match the expected format, it returns None.
 
@@ -50,10 +105,24 @@ def detect_chrome_version(version_num: int = None) -> Union[int, None]:
         logging.debug("Version number is provided: %d", version_num)
         return version_num
 
-    chrome_path = find_chrome_executable()
+    chrome_path = browser_path or find_chrome_executable()
+    if not chrome_path:
+        logging.error("Chrome or Chromium executable is not found")
+        return None
+
+    cache_path = os.path.join(cache_dir, "browsers.json")
+    key = f"{os.path.realpath(chrome_path)}:{os.stat(chrome_path).st_mtime_ns}"
+    try:
+        with open(cache_path, encoding="utf-8") as file:
+            versions = json.load(file)
+    except (OSError, ValueError):
+        versions = {}
+    if key in versions:
+        logging.debug("The cached version is %d", versions[key])
+        return versions[key]
 
     out = subprocess.check_output([chrome_path, "--version"])
-    out = re.search(r"Google\s+Chrome\s+(\d{3})", out.decode())
+    out = BROWSER_VERSION_RE.search(out.decode())
 
     if not out:
         logging.error("There was an error obtaining Chrome version")
@@ -61,9 +130,99 @@ def detect_chrome_version(version_num: int = None) -> Union[int, None]:
 
     version_num = int(out.group(1))
     logging.info("The version is %d", version_num)
+
+    versions[key] = version_num
+    os.makedirs(cache_dir, exist_ok=True)
+    with tempfile.NamedTemporaryFile(
+        "w", dir=cache_dir, suffix=".tmp", delete=False, encoding="utf-8"
+    ) as file:
+        json.dump(versions, file)
+    os.replace(file.name, cache_path)
     return version_num
 
 
+def resolve_driver(version_num: int, cache_dir: str = CACHE_DIR) -> str:
+    """
+    Returns a patched chromedriver for the browser version, cached on disk by version.
+
+    The driver is downloaded and patched only if the cache doesn't have it, under a file
+    lock so that the processes starting at the same time download it once. A cached
+    driver is used without touching the network.
+
+    Args:
+        version_num (int): The major version of the browser.
+        cache_dir (str, optional): The directory of the drivers. Default: CACHE_DIR.
+
+    Returns:
+        str: The path of the patched chromedriver.
+    """
+    suffix = ".exe" if sys.platform.startswith("win") else ""
+    target = os.path.join(cache_dir, "drivers", f"chromedriver_{version_num}{suffix}")
+    with file_lock(os.path.join(cache_dir, "drivers", ".lock")):
+        patcher = Patcher(version_main=version_num)
+        if patcher.is_binary_patched(target):
+            logging.debug("Using the cached driver %s", target)
+            return target
+
+        logging.info("Downloading chromedriver %d", version_num)
+        patcher.executable_path = target
+        patcher.auto()
+        # Keeps the patcher from removing the cached driver
+        patcher._custom_exe_path = True
+    return target
+
+
+def parse_sse_events(body: str) -> List[str]:
+    """Splits a server-sent events body into the data payloads of its events.
+
+    Args:
+        body (str): The raw text of an event stream.
+
+    Returns:
+        List[str]: The data of each event, multi-line data is joined with '\\n'.
+            The terminating '[DONE]' event is omitted.
+    """
+    events, data = [], []
+    for line in body.splitlines() + [""]:
+        if not line:
+            if data and data != ["[DONE]"]:
+                events.append("\n".join(data))
+            data = []
+        elif line.startswith("data:"):
+            data.append(line[5:].lstrip(" "))
+    return events
+
+
+def text_hash(text: str, seed: int = 0x811C9DC5) -> int:
+    """Computes the 32-bit FNV-1a hash of the text over its UTF-16 code units,
+    the same hash is computed in the browser to validate incremental reads.
+
+    Args:
+        text (str): The text to hash.
+        seed (int, optional): The hash of the preceding text, to extend it.
+
+    Returns:
+        int: The hash of the text
+    """
+    data = text.encode("utf-16-le")
+    for idx in range(0, len(data), 2):
+        seed ^= data[idx] | data[idx + 1] << 8
+        seed = (seed * 0x01000193) & 0xFFFFFFFF
+    return seed
+
+
+def utf16_length(text: str) -> int:
+    """Returns the length of the text in UTF-16 code units, as `String.length` in javascript.
+
+    Args:
+        text (str): The text.
+
+    Returns:
+        int: The number of UTF-16 code units.
+    """
+    return len(text.encode("utf-16-le")) // 2
+
+
 def is_url(possible_url: str) -> bool:
     """Checks if the given string is a valid url
 
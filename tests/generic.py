@@ -11,6 +11,17 @@ def test_interaction():
     ), f'response is not "book.", the full response: {response}'
     time.sleep(0.5)
 
+def test_interaction_stream():
+    deltas = list(pytest.chathead.interact_stream(
+        "What object is most often found on a bookshelf?"
+    ))
+    response = "".join(deltas)
+    assert deltas, "No delta is streamed"
+    assert (
+        "book" in response.lower()
+    ), f'response is not "book.", the full response: {response}'
+    time.sleep(0.5)
+
 def test_delete_chathead():
     del pytest.chathead
     assert not any(
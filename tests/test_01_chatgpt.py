@@ -18,6 +18,10 @@ def test_interaction():
     return generic.test_interaction()
 
 
+def test_interaction_stream():
+    return generic.test_interaction_stream()
+
+
 def test_reset():
     assert pytest.chathead.reset_thread()
     assert (
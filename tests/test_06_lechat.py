@@ -20,6 +20,10 @@ def test_interaction():
     generic.test_interaction()
 
 
+def test_interaction_stream():
+    generic.test_interaction_stream()
+
+
 def test_reset():
     assert pytest.chathead.reset_thread()
     assert (
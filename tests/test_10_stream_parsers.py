@@ -0,0 +1,58 @@
+"""Network stream parser tests"""
+
+import json
+
+from talkingheads.utils import parse_sse_events
+from talkingheads.model_library import ChatGPTClient, HuggingChatClient
+
+
+def sse(*events):
+    return "".join(f"data: {event}\n\n" for event in events)
+
+
+def test_parse_sse_events():
+    body = "event: delta\ndata: first\n\ndata: multi\ndata: line\n\ndata: [DONE]\n\n"
+    assert parse_sse_events(body) == ["first", "multi\nline"]
+
+
+def test_chatgpt_full_message_stream():
+    message = lambda text: json.dumps({
+        "message": {"author": {"role": "assistant"}, "content": {"parts": [text]}}
+    })
+    body = sse(message("A"), message("A book"), "[DONE]")
+    assert ChatGPTClient.parse_stream(body) == "A book"
+
+
+def test_chatgpt_delta_stream():
+    body = sse(
+        json.dumps({"v": {"message": {"author": {"role": "user"}, "content": {"parts": ["Hi"]}}}}),
+        json.dumps({
+            "v": {"message": {"author": {"role": "assistant"}, "content": {"parts": [""]}}},
+            "c": 0,
+        }),
+        json.dumps({"p": "/message/content/parts/0", "o": "append", "v": "A"}),
+        json.dumps({"v": " book"}),
+        json.dumps({"p": "", "o": "patch", "v": [
+            {"p": "/message/content/parts/0", "o": "append", "v": "."},
+            {"p": "/message/status", "o": "replace", "v": "finished_successfully"},
+        ]}),
+        "[DONE]",
+    )
+    assert ChatGPTClient.parse_stream(body) == "A book."
+
+
+def test_chatgpt_empty_stream():
+    assert ChatGPTClient.parse_stream(sse("[DONE]")) is None
+
+
+def test_huggingchat_stream():
+    lines = [
+        {"type": "status", "status": "started"},
+        {"type": "stream", "token": "A"},
+        {"type": "stream", "token": " book\u0000\u0000"},
+    ]
+    body = "\n".join(map(json.dumps, lines))
+    assert HuggingChatClient.parse_stream(body) == "A book"
+
+    body += "\n" + json.dumps({"type": "finalAnswer", "text": "A book."})
+    assert HuggingChatClient.parse_stream(body) == "A book."
@@ -0,0 +1,44 @@
+"""Selector registry tests"""
+
+from selenium.webdriver.common.by import By
+
+from talkingheads.selector_registry import SelectorRegistry, xpath_to_css
+
+
+def test_xpath_to_css():
+    assert xpath_to_css("//button[@data-testid='send-button']") == 'button[data-testid="send-button"]'
+    assert xpath_to_css("//div[contains(@class, 'prose')]/div") == 'div[class*="prose"] > div'
+    assert xpath_to_css("//div[@role='list']//input[@disabled]") == 'div[role="list"] input[disabled]'
+    assert xpath_to_css("//a[starts-with(@href, '/c/')]") == 'a[href^="/c/"]'
+    assert xpath_to_css("//*[@id='main']//textarea") == '*[id="main"] textarea'
+    assert xpath_to_css(
+        "//div[contains(@class, 'a')][contains(@class, 'b')]/span"
+    ) == 'div[class*="a"][class*="b"] > span'
+
+
+def test_xpath_to_css_unsupported():
+    assert xpath_to_css("//button[text()='Retry']") is None
+    assert xpath_to_css("//div[@role='menuitem'][2]") is None
+    assert xpath_to_css("//input[@a='x' or @b='y']") is None
+    assert xpath_to_css("(//div)[last()]") is None
+    assert xpath_to_css("//button[@aria-label='Send' and @disabled]") is None
+    assert xpath_to_css("//div[contains(text(), 'error')]") is None
+    assert xpath_to_css(".//div") is None
+    assert xpath_to_css("//div[@id='a']/..") is None
+
+
+def test_registry_promotes_fallback():
+    markers = {"textarea_xq": "//div[@contenteditable='true']", "send_cq": "send"}
+    registry = SelectorRegistry(markers, {"textarea_xq": ["//textarea[@id='prompt']"]})
+    assert registry.compile(By.XPATH, markers["textarea_xq"]) == [
+        (By.CSS_SELECTOR, 'div[contenteditable="true"]'),
+        (By.CSS_SELECTOR, 'textarea[id="prompt"]'),
+    ]
+    assert registry.compile(By.CLASS_NAME, "send") == [(By.CLASS_NAME, "send")]
+
+    registry.record(By.XPATH, markers["textarea_xq"], 1, 0.4)
+    assert registry.compile(By.XPATH, markers["textarea_xq"])[0] == (
+        By.CSS_SELECTOR, 'textarea[id="prompt"]'
+    )
+    stats = registry.stats[(By.XPATH, markers["textarea_xq"])]
+    assert stats["lookups"] == 1 and stats["winner"][1] == 'textarea[id="prompt"]'
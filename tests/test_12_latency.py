@@ -0,0 +1,59 @@
+"""Latency history tests"""
+
+from talkingheads.latency import LatencyHistory, percentile, size_bucket
+
+
+def test_percentile():
+    values = [5, 1, 4, 2, 3]
+    assert percentile(values, 0.5) == 3
+    assert percentile(values, 0.95) == 5
+    assert percentile(values, 0.0) == 1
+
+
+def test_size_bucket():
+    assert size_bucket(10) == "256"
+    assert size_bucket(256) == "1024"
+    assert size_bucket(100000) == "inf"
+
+
+def test_timeout_from_history(tmp_path):
+    path = tmp_path / "latency.json"
+    history = LatencyHistory(str(path), min_samples=5, floor=1)
+    assert history.timeout("Pi", 10) is None
+
+    for idx in range(10):
+        history.record("Pi", 10, completion=2.0 + idx / 10, first_change=1.0)
+    assert history.timeout("Pi", 10) == 2 * 2.9
+    assert history.poll_period("Pi", 10) == 0.2
+
+    # Falls back to the other buckets of the client, persists across instances
+    history.save()
+    restored = LatencyHistory(str(path), min_samples=5, floor=1)
+    assert restored.timeout("Pi", 5000) == 2 * 2.9
+    assert restored.timeout("ChatGPT", 10) is None
+    assert restored.summary()["Pi/256"]["count"] == 10
+
+
+def test_saves_are_throttled(tmp_path):
+    path = tmp_path / "latency.json"
+    history = LatencyHistory(str(path), save_interval=60)
+    history.record("Pi", 10, completion=1.0)
+    history.record("Pi", 10, completion=2.0)
+    assert LatencyHistory(str(path)).summary()["Pi/256"]["count"] == 1
+    history.save()
+    assert LatencyHistory(str(path)).summary()["Pi/256"]["count"] == 2
+
+
+def test_concurrent_histories_merge(tmp_path):
+    path = str(tmp_path / "latency.json")
+    first = LatencyHistory(path, save_interval=0)
+    second = LatencyHistory(path, save_interval=0)
+    first.record("Pi", 10, completion=1.0)
+    second.record("ChatGPT", 10, completion=2.0)
+    first.record("Pi", 10, completion=3.0)
+
+    summary = LatencyHistory(path).summary()
+    assert summary["Pi/256"]["count"] == 2
+    assert summary["ChatGPT/256"]["count"] == 1
+    assert first.summary().keys() == summary.keys()
+    assert LatencyHistory.shared(path) is LatencyHistory.shared(path)
@@ -0,0 +1,123 @@
+"""Browser pool tests"""
+
+import threading
+import time
+
+import pytest
+
+from talkingheads import BrowserPool
+
+
+class DummyClient:
+    def __init__(self, client_name, reset_ok=True):
+        self.client_name = client_name
+        self.reset_ok = reset_ok
+        self.resets = 0
+        self.closed = False
+
+    def reset_thread(self):
+        self.resets += 1
+        return self.reset_ok
+
+    def close(self):
+        self.closed = True
+
+
+def wait_idle(pool, name, count, timeout=2):
+    deadline = time.monotonic() + timeout
+    while pool.available()[name] != count and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return pool.available()[name]
+
+
+def test_pool_refills_and_recycles():
+    pool = BrowserPool({"Pi": 2}, factory=lambda name, config: DummyClient(name))
+    assert wait_idle(pool, "Pi", 2) == 2
+
+    client = pool.acquire("Pi", timeout=1)
+    assert wait_idle(pool, "Pi", 2) == 2
+
+    # The pool is full, the released client is closed after the reset
+    pool.release(client)
+    time.sleep(0.1)
+    assert client.resets == 1 and pool.available()["Pi"] == 2
+    assert client.closed
+
+    client = pool.acquire("Pi", timeout=1)
+    pool.release(client, recycle=False)
+    assert client.closed and client.resets == 0
+
+    with pool.lease("Pi", timeout=1) as leased:
+        assert leased.client_name == "Pi"
+    pool.close()
+
+
+def test_pool_launch_failure():
+    attempts = []
+
+    def factory(name, config):
+        attempts.append(time.monotonic())
+        raise RuntimeError("Verification failed")
+
+    pool = BrowserPool({"Pi": 1}, factory=factory, max_retries=2, retry_delay=0.1)
+    with pytest.raises(TimeoutError, match="Verification failed"):
+        pool.acquire("Pi", timeout=0.05)
+    with pytest.raises(KeyError):
+        pool.acquire("ChatGPT")
+
+    started = time.monotonic()
+    with pytest.raises(RuntimeError, match="Verification failed"):
+        pool.acquire("Pi")
+    assert time.monotonic() - started < 2
+    assert len(attempts) >= 3
+    assert attempts[2] - attempts[1] >= 0.15
+    pool.close()
+
+
+def test_pool_launch_retry():
+    attempts = []
+
+    def factory(name, config):
+        attempts.append(name)
+        if len(attempts) == 1:
+            raise RuntimeError("Verification failed")
+        return DummyClient(name)
+
+    pool = BrowserPool({"Pi": 1}, factory=factory, retry_delay=0.05)
+    assert pool.acquire("Pi", timeout=2).client_name == "Pi"
+    pool.close()
+
+
+def test_pool_close_drops_queued_launches():
+    launched = []
+
+    def factory(name, config):
+        launched.append(name)
+        time.sleep(0.2)
+        return DummyClient(name)
+
+    pool = BrowserPool({"Pi": 3}, factory=factory, max_workers=1)
+    time.sleep(0.05)
+    pool.close()
+    time.sleep(0.5)
+    assert launched == ["Pi"]
+
+
+def test_pool_close_closes_clients():
+    launched = []
+    lock = threading.Lock()
+
+    def factory(name, config):
+        with lock:
+            client = DummyClient(name)
+            launched.append(client)
+        if client is not launched[0]:
+            time.sleep(0.2)
+        return client
+
+    pool = BrowserPool({"Pi": 2}, factory=factory)
+    assert wait_idle(pool, "Pi", 1) == 1
+    pool.close()
+    assert launched[0].closed
+    time.sleep(0.3)
+    assert len(launched) == 2 and launched[1].closed
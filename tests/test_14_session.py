@@ -0,0 +1,56 @@
+"""Session snapshot encryption tests"""
+
+import pytest
+
+pytest.importorskip("cryptography")
+
+from talkingheads.session import decrypt_session, encrypt_session, get_passphrase
+from utils import get_offline_client
+
+
+def test_session_roundtrip():
+    snapshot = {"client": "ChatGPT", "cookies": [{"name": "sid", "value": "1"}]}
+    blob = encrypt_session(snapshot, "passphrase")
+    assert b"sid" not in blob
+    assert decrypt_session(blob, "passphrase") == snapshot
+    with pytest.raises(ValueError):
+        decrypt_session(blob, "wrong")
+
+
+def test_passphrase_from_environment(monkeypatch):
+    monkeypatch.setenv("TALKINGHEADS_SESSION_KEY", "from-env")
+    assert get_passphrase() == "from-env"
+    monkeypatch.delenv("TALKINGHEADS_SESSION_KEY")
+    with pytest.raises(NameError):
+        get_passphrase()
+
+
+def test_restore_session(tmp_path, monkeypatch):
+    monkeypatch.setenv("TALKINGHEADS_SESSION_KEY", "passphrase")
+    client = get_offline_client(client_name="ChatGPT")
+    path = tmp_path / "session.bin"
+    snapshot = {"client": "ChatGPT", "cookies": [], "origin": "", "local": {}, "session": {}}
+    path.write_bytes(encrypt_session(snapshot, "passphrase"))
+    assert client.restore_session(str(path)) == "1"
+
+    assert client.restore_session(str(path), passphrase="wrong") is None
+    path.write_bytes(encrypt_session({"client": "ChatGPT"}, "passphrase"))
+    assert client.restore_session(str(path)) is None
+    path.write_bytes(b"corrupted")
+    assert client.restore_session(str(path)) is None
+    monkeypatch.delenv("TALKINGHEADS_SESSION_KEY")
+    assert client.restore_session(str(path)) is None
+
+
+def test_credentials_with_session(tmp_path, monkeypatch):
+    path = tmp_path / "session.bin"
+    path.write_bytes(b"snapshot")
+    monkeypatch.delenv("ChatGPT_UNAME", raising=False)
+    monkeypatch.delenv("ChatGPT_PWD", raising=False)
+    with pytest.raises(NameError):
+        get_offline_client(client_name="ChatGPT", credential_check=True)
+    client = get_offline_client(
+        client_name="ChatGPT", credential_check=True, session_path=str(path)
+    )
+    with pytest.raises(NameError):
+        client.check_credentials(None, None)
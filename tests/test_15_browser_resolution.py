@@ -0,0 +1,35 @@
+"""Browser version detection and driver cache tests"""
+
+import os
+import stat
+
+import pytest
+
+from talkingheads.utils import detect_chrome_version, resolve_driver
+
+
+@pytest.mark.parametrize("output, version", [
+    ("Google Chrome 126.0.6478.126", 126),
+    ("Chromium 120.0.6099.224 built on Debian 12.4", 120),
+    ("Google Chrome for Testing 127.0.6533.88", 127),
+    ("Firefox 128.0", None),
+])
+def test_detect_version(tmp_path, output, version):
+    browser = tmp_path / "chrome"
+    calls = tmp_path / "calls"
+    browser.write_text(f"#!/bin/sh\necho x >> {calls}\necho '{output}'\n")
+    browser.chmod(browser.stat().st_mode | stat.S_IEXEC)
+
+    cache_dir = str(tmp_path / "cache")
+    assert detect_chrome_version(browser_path=str(browser), cache_dir=cache_dir) == version
+    assert detect_chrome_version(browser_path=str(browser), cache_dir=cache_dir) == version
+    # The detected version is cached, the browser runs once
+    assert len(calls.read_text().split()) == (1 if version else 2)
+
+
+def test_cached_driver_is_reused(tmp_path):
+    driver = tmp_path / "drivers" / "chromedriver_126"
+    driver.parent.mkdir()
+    driver.write_bytes(b"binary {console.log(\"undetected chromedriver 1337!\")}")
+    assert resolve_driver(126, cache_dir=str(tmp_path)) == str(driver)
+    assert os.path.exists(tmp_path / "drivers" / ".lock")
@@ -0,0 +1,44 @@
+"""Client registry and lazy import tests"""
+
+import subprocess
+import sys
+
+import talkingheads
+from talkingheads.registry import (
+    available_clients, get_client, register_client, unregister_client
+)
+
+
+def test_import_is_lazy():
+    code = (
+        "import sys, talkingheads; "
+        "print(any(name in sys.modules for name in ('selenium', 'pandas', 'talkingheads.base_browser')))"
+    )
+    output = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, text=True, check=True
+    ).stdout
+    assert output.strip() == "False"
+
+
+def test_builtin_clients():
+    assert "ChatGPT" in available_clients()
+    assert get_client("Pi").__name__ == "PiClient"
+    assert get_client("Pi") is talkingheads.PiClient
+    assert get_client("Unknown") is None
+
+
+def test_register_client():
+    class DummyClient:
+        pass
+
+    register_client("Dummy", DummyClient)
+    assert get_client("Dummy") is DummyClient
+    assert "Dummy" in available_clients()
+
+    register_client("Dummy", "talkingheads.latency:LatencyHistory")
+    assert get_client("Dummy") is talkingheads.LatencyHistory
+
+    assert unregister_client("Dummy")
+    assert "Dummy" not in available_clients()
+    assert get_client("Dummy") is None
+    assert not unregister_client("Dummy")
@@ -0,0 +1,128 @@
+"""Background warm-up tests"""
+
+import threading
+import time
+
+import pytest
+
+from talkingheads import base_browser, scripts
+from talkingheads.base_browser import BaseBrowser
+from talkingheads.model_library.lechat import LeChatClient
+from talkingheads.model_library.pi import PiClient
+from utils import FakeBrowser
+
+
+class SlowClient(BaseBrowser):
+    def __init__(self, delay=0.2, error=None, **kwargs):
+        self.delay = delay
+        self.error = error
+        self.started = threading.Event()
+        super().__init__(client_name="Pi", url="", credential_check=False, **kwargs)
+
+    def warm_up(self, *args):
+        self.started.set()
+        time.sleep(self.delay)
+        if self.error:
+            raise self.error
+        self.ready = True
+
+    def interact(self, prompt, deadline=None, timeout=None):
+        with self.deadline_scope(timeout, deadline):
+            return prompt
+
+
+def test_constructor_returns_immediately():
+    started = time.monotonic()
+    client = SlowClient(delay=0.5, start_async=True)
+    assert time.monotonic() - started < 0.4
+    assert client.started.wait(1)
+    assert not client.ready
+    assert client.interact("hello") == "hello"
+    assert client.ready
+    assert client.ready_future.result() is client
+
+
+def test_synchronous_start():
+    client = SlowClient(delay=0)
+    assert client.ready
+    assert client.ready_future.done()
+
+
+def test_wait_ready_timeout():
+    client = SlowClient(delay=0.5, start_async=True)
+    with pytest.raises(TimeoutError):
+        client.wait_ready(0.05)
+    with pytest.raises(TimeoutError):
+        client.interact("hello", timeout=0.05)
+    assert client.wait_ready()
+
+
+def test_warm_up_error():
+    client = SlowClient(delay=0, error=RuntimeError("Verification failed"), start_async=True)
+    with pytest.raises(RuntimeError):
+        client.interact("hello")
+    with pytest.raises(RuntimeError):
+        SlowClient(delay=0, error=RuntimeError("Verification failed"))
+
+
+def test_browser_methods_wait_for_warm_up():
+    class SlowLeChat(LeChatClient):
+        def warm_up(self, *args):
+            time.sleep(0.2)
+            self.browser = FakeBrowser()
+            self.ready = True
+
+    client = SlowLeChat(start_async=True, credential_check=False)
+    assert client.browser is None
+    assert client.reset_thread()
+    assert client.browser.calls == [("get", "https://chat.mistral.ai/chat")]
+
+
+class FakeChrome(FakeBrowser):
+    """Answers the scripts of the warm-up of an idle Pi page"""
+
+    def __init__(self, **kwargs):
+        super().__init__()
+
+    def execute_script(self, script, *args):
+        self.calls.append((script, args))
+        if script == scripts.PAGE_AGENT_CALL:
+            return {"value": {
+                "inputReady": True, "busy": False, "inputLength": 0, "sendEnabled": False,
+                "responses": 1, "lastLength": 20,
+            }}
+        if script == scripts.READ_STORAGE:
+            return ["https://pi.ai", {}, {}]
+        if "navigator.userAgent" in script:
+            return "Chrome"
+        if "document.readyState" in script:
+            return "complete"
+        return None
+
+    def execute_cdp_cmd(self, command, params):
+        self.calls.append((command, params))
+        return {"identifier": "1", "cookies": []}
+
+    def delete_all_cookies(self):
+        pass
+
+    def find_element(self, by, value):
+        return value
+
+
+def test_synchronous_warm_up(tmp_path, monkeypatch):
+    monkeypatch.setattr(base_browser.uc, "Chrome", FakeChrome)
+    monkeypatch.setattr(base_browser, "detect_chrome_version", lambda *args: None)
+    monkeypatch.setenv("TALKINGHEADS_SESSION_KEY", "passphrase")
+    session_path = tmp_path / "pi.session"
+    clients = []
+
+    starter = threading.Thread(
+        target=lambda: clients.append(PiClient(session_path=str(session_path))), daemon=True
+    )
+    starter.start()
+    starter.join(10)
+    assert not starter.is_alive(), "The synchronous warm-up is deadlocked"
+    assert clients[0].ready
+    assert session_path.exists()
+    assert clients[0].reset_thread()
@@ -0,0 +1,213 @@
+"""Swarm startup and eviction tests"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import yaml
+
+from talkingheads import MultiAgent
+from talkingheads.multiagent.multiagent import TokenBucket
+from talkingheads.registry import register_client, unregister_client
+
+
+class SlowClient:
+    def __init__(self, delay=0.3, fail=False, broken=False, tag=None, **kwargs):
+        time.sleep(delay)
+        if fail:
+            raise RuntimeError("Verification failed")
+        self.broken = broken
+        self.client_name = tag
+        self.kwargs = kwargs
+        self.ready = True
+        self.closed = False
+
+    def interact(self, prompt):
+        if self.broken:
+            raise TimeoutError("No response")
+        return prompt
+
+    def reset_thread(self):
+        return True
+
+    def close(self):
+        self.closed = True
+
+
+@pytest.fixture(autouse=True)
+def slow_clients():
+    names = [f"Slow{idx}" for idx in range(4)]
+    for name in names:
+        register_client(name, SlowClient)
+    yield
+    for name in names:
+        unregister_client(name)
+
+
+def write_config(tmp_path, nodes, **settings):
+    config = {
+        "multiagent_settings": settings,
+        "driver_settings": {"shared": {"verbose": False}, "nodes": nodes},
+    }
+    path = tmp_path / "swarm.yaml"
+    path.write_text(yaml.safe_dump(config))
+    return str(path)
+
+
+def test_token_bucket_spacing():
+    bucket = TokenBucket(0.1, burst=2)
+    waits = [bucket.acquire() for _ in range(4)]
+    assert waits[:2] == [0, 0]
+    assert all(0.05 < wait <= 0.1 for wait in waits[2:])
+
+
+def test_parallel_startup(tmp_path):
+    nodes = {f"Slow{idx}": {"tag": f"Agent{idx}"} for idx in range(4)}
+    started = time.monotonic()
+    swarm = MultiAgent(write_config(tmp_path, nodes))
+    assert time.monotonic() - started < 0.6
+    assert list(swarm.agent_swarm) == ["Agent0", "Agent1", "Agent2", "Agent3"]
+    assert all(report["status"] == "ready" for report in swarm.startup_report.values())
+    assert swarm.agent_swarm["Agent1"].kwargs["multihead"]
+
+
+def test_bounded_and_spaced_startup(tmp_path):
+    nodes = {f"Slow{idx}": {"delay": 0.1} for idx in range(4)}
+    swarm = MultiAgent(
+        write_config(tmp_path, nodes, max_parallel_starts=2, start_interval=0.2)
+    )
+    queued = sorted(report["queued"] for report in swarm.startup_report.values())
+    for previous, current in zip(queued, queued[1:]):
+        assert current - previous == pytest.approx(0.2, abs=0.08)
+
+
+def test_partial_failure(tmp_path):
+    nodes = {"Slow0": {}, "Slow1": {"fail": True}}
+    swarm = MultiAgent(write_config(tmp_path, nodes))
+    assert list(swarm.agent_swarm) == ["Slow0"]
+    assert isinstance(swarm.failed_agents["Slow1"], RuntimeError)
+    assert swarm.startup_report["Slow1"]["status"] == "failed"
+
+    with pytest.raises(RuntimeError):
+        MultiAgent(write_config(tmp_path, {"Slow1": {"fail": True}}))
+
+
+def test_lazy_start(tmp_path):
+    nodes = {"Slow0": {"delay": 0}, "Slow1": {"delay": 0}}
+    swarm = MultiAgent(write_config(tmp_path, nodes, lazy_start=True))
+    assert swarm.agent_names == ["Slow0", "Slow1"]
+    assert not swarm.agent_swarm
+    assert swarm.interact("Slow1", "hello") == "hello"
+    assert list(swarm.agent_swarm) == ["Slow1"]
+    assert list(swarm.reset_agents()) == [True, True]
+    assert list(swarm.agent_swarm) == ["Slow1"]
+
+
+def test_idle_eviction(tmp_path):
+    nodes = {"Slow0": {"delay": 0}, "Slow1": {"delay": 0}}
+    swarm = MultiAgent(write_config(tmp_path, nodes, idle_timeout=60))
+    agent = swarm.agent_swarm["Slow0"]
+    assert swarm.evict_idle() == []
+
+    swarm.interact("Slow1", "hello")
+    with swarm.use_agent("Slow1"):
+        assert swarm.evict_idle(0) == ["Slow0"]
+    assert agent.closed
+    assert list(swarm.agent_swarm) == ["Slow1"]
+
+    assert swarm.broadcast("hello") == {"Slow0": "hello", "Slow1": "hello"}
+    assert swarm.agent_swarm["Slow0"] is not agent
+
+
+def test_add_remove_replace(tmp_path):
+    swarm = MultiAgent(write_config(tmp_path, {"Slow0": {"delay": 0}}))
+    swarm.add_agent("Extra", "Slow1", {"delay": 0})
+    assert swarm.agent_names == ["Slow0", "Extra"]
+    with pytest.raises(ValueError):
+        swarm.add_agent("Extra", "Slow1")
+    with pytest.raises(RuntimeError):
+        swarm.add_agent("Broken", "Slow2", {"delay": 0, "fail": True})
+    assert "Broken" not in swarm.agent_configs
+
+    old_agent = swarm.agent_swarm["Extra"]
+    with swarm.use_agent("Extra") as agent:
+        assert swarm.replace_agent("Extra") is not old_agent
+        assert not agent.closed
+    assert old_agent.closed
+
+    with pytest.raises(RuntimeError):
+        swarm.replace_agent("Extra", config={"delay": 0, "fail": True})
+    assert "fail" not in swarm.agent_configs["Extra"][1]
+
+    agent = swarm.agent_swarm["Extra"]
+    with swarm.use_agent("Extra"):
+        assert swarm.remove_agent("Extra")
+        assert not agent.closed
+    assert agent.closed
+    assert swarm.agent_names == ["Slow0"]
+    assert not swarm.remove_agent("Extra")
+    assert swarm.broadcast("hello") == {"Slow0": "hello"}
+
+
+def test_reload_config(tmp_path):
+    swarm = MultiAgent(
+        write_config(tmp_path, {"Slow0": {"delay": 0}, "Slow1": {"delay": 0}})
+    )
+    unchanged = swarm.agent_swarm["Slow0"]
+    changes = swarm.reload_config(
+        write_config(tmp_path, {"Slow0": {"delay": 0}, "Slow1": {"delay": 0.01}, "Slow2": {}})
+    )
+    assert changes == {"added": ["Slow2"], "removed": [], "replaced": ["Slow1"], "failed": []}
+    assert swarm.agent_swarm["Slow0"] is unchanged
+    assert swarm.agent_swarm["Slow1"].kwargs == {
+        "verbose": False, "auto_save": False, "multihead": True
+    }
+
+    changes = swarm.reload_config(write_config(tmp_path, {"Slow0": {"delay": 0}}))
+    assert changes["removed"] == ["Slow1", "Slow2"]
+    assert swarm.agent_names == ["Slow0"]
+
+
+def test_broadcast_async(tmp_path):
+    swarm = MultiAgent(write_config(tmp_path, {"Slow0": {"delay": 0}, "Slow1": {"delay": 0}}))
+    executor = swarm.executor
+    futures = swarm.broadcast_async("hello", exclude=["Slow1"])
+    assert list(futures) == ["Slow0"]
+    assert futures["Slow0"].result() == "hello"
+    assert swarm.reset_agents() == [True, True]
+    assert swarm.broadcast("hello") == {"Slow0": "hello", "Slow1": "hello"}
+    assert swarm.executor is executor
+
+    swarm.add_agent("Extra", "Slow2", {"delay": 0})
+    assert swarm.executor_size == 3
+
+
+def test_broadcast_errors(tmp_path):
+    swarm = MultiAgent(
+        write_config(tmp_path, {"Slow0": {"delay": 0}, "Slow1": {"delay": 0, "broken": True}})
+    )
+    assert swarm.broadcast("hello") == {"Slow0": "hello"}
+    assert list(swarm.broadcast_errors) == ["Slow1"]
+    assert isinstance(swarm.broadcast_errors["Slow1"], TimeoutError)
+
+    def interact(prompt):
+        raise KeyError("choices")
+
+    swarm.agent_swarm["Slow0"].interact = interact
+    assert swarm.broadcast("hello") == {}
+    assert isinstance(swarm.broadcast_errors["Slow0"], KeyError)
+
+
+def test_del_after_failed_init():
+    swarm = MultiAgent.__new__(MultiAgent)
+    swarm.__del__()
+
+
+def test_concurrent_add(tmp_path):
+    swarm = MultiAgent(write_config(tmp_path, {"Slow0": {"delay": 0}}))
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(
+            lambda idx: swarm.add_agent(f"Extra{idx}", "Slow1", {"delay": 0.05}), range(8)
+        ))
+    assert sorted(swarm.agent_names) == [f"Extra{idx}" for idx in range(8)] + ["Slow0"]
+    assert set(swarm.agent_swarm) == set(swarm.agent_names)
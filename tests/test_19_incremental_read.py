@@ -0,0 +1,80 @@
+"""Incremental read tests, the in-page scripts are run with node"""
+
+import json
+import logging
+import shutil
+import subprocess
+
+import pytest
+
+from talkingheads import scripts
+from talkingheads.base_browser import BaseBrowser
+from talkingheads.utils import text_hash, utf16_length
+
+pytestmark = pytest.mark.skipif(shutil.which("node") is None, reason="node is not installed")
+
+HARNESS = """
+const input = JSON.parse(require("fs").readFileSync(0, "utf8"));
+globalThis.window = globalThis;
+window.__thCursors = input.cursors;
+globalThis.document = {getElementsByTagName: () => [{textContent: input.text}]};
+const result = (function () {
+%s
+}).apply(null, input.args);
+process.stdout.write(JSON.stringify({result, cursors: window.__thCursors}));
+"""
+
+TEXTS = ["Hello", "Hello 👋 wörld", "Hello 👋 wörld 🐈‍⬛ and 𝕏", "Hello 👋 wörld 🐈‍⬛ and 𝕏!"]
+
+
+def run_script(script, args, text="", cursors=None):
+    output = subprocess.run(
+        ["node", "-e", HARNESS % script],
+        input=json.dumps({"args": args, "text": text, "cursors": cursors or {}}),
+        capture_output=True, text=True, encoding="utf-8", check=True,
+    ).stdout
+    return json.loads(output)
+
+
+class FakePage:
+    def __init__(self):
+        self.text = ""
+        self.cursors = {}
+        self.transferred = 0
+
+    def close(self):
+        pass
+
+    def quit(self):
+        pass
+
+    def execute_script(self, script, *args):
+        output = run_script(script, list(args), self.text, self.cursors)
+        self.cursors = output["cursors"]
+        self.transferred += len(output["result"]["delta"])
+        return output["result"]
+
+
+@pytest.mark.parametrize("text", TEXTS + [""])
+def test_hash_parity(text):
+    output = run_script(scripts.HASH + "return [thHash(arguments[0]), arguments[0].length];", [text])
+    assert output["result"] == [text_hash(text), utf16_length(text)]
+
+
+def test_hash_extension():
+    assert text_hash("👋 wörld", text_hash("Hello ")) == text_hash("Hello 👋 wörld")
+
+
+def test_read_delta_non_bmp(caplog):
+    client = BaseBrowser.__new__(BaseBrowser)
+    client.browser = FakePage()
+    client.read_cursors = {}
+    client.auto_save = False
+    client.logger = logging.getLogger("test")
+
+    with caplog.at_level(logging.WARNING):
+        for text in TEXTS:
+            client.browser.text = text
+            assert client.read_last_text("tag name", "div") == text
+    assert not caplog.records
+    assert client.browser.transferred == len(TEXTS[-1])
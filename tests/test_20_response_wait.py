@@ -0,0 +1,86 @@
+"""Response wait tests"""
+
+import time
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+
+from talkingheads import scripts
+from talkingheads.model_library.pi import PiClient
+from utils import FakeBrowser, get_offline_client
+
+
+def test_settled_response():
+    browser = FakeBrowser([{"done": False, "length": 2}, {"done": True, "text": "Hello"}])
+    client = get_offline_client(browser)
+    assert client.wait_response() == "Hello"
+
+
+def test_unavailable_watcher():
+    client = get_offline_client(FakeBrowser([None]))
+    assert client.wait_response() is None
+
+
+def test_timeout_is_not_a_fallback():
+    class Generating(FakeBrowser):
+        def execute_async_script(self, script, *args):
+            time.sleep(0.05)
+            return {"done": False, "length": 1}
+
+    client = get_offline_client(Generating())
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        client.wait_response(timeout_dur=0.3)
+    assert time.monotonic() - started < 0.5
+
+
+def test_pi_waits_without_typing():
+    class PiPage(FakeBrowser):
+        def execute_script(self, script, *args):
+            self.calls.append((script, args))
+            return {"value": "sent"} if script == scripts.PAGE_AGENT_CALL else None
+
+        def execute_async_script(self, script, *args):
+            return {"done": True, "text": "Hi there", "sinceFirstChange": 0.1}
+
+    class OfflinePi(PiClient):
+        def warm_up(self, *args):
+            self.browser = PiPage()
+            self.ready = True
+
+    client = OfflinePi(page_agent=True)
+    assert client.interact("Hello") == "Hi there"
+    watch_args = next(args for script, args in client.browser.calls
+                      if script == scripts.WATCH_RESPONSE)
+    assert watch_args[-1] == client.markers.wait_xq
+    assert [args for script, args in client.browser.calls
+            if script == scripts.PAGE_AGENT_CALL] == [("submit", ("Hello",))]
+
+
+def test_stream_timeout():
+    class Streaming(FakeBrowser):
+        def execute_async_script(self, script, *args):
+            time.sleep(0.05)
+            return {"done": False, "text": "Hel"}
+
+    client = get_offline_client(Streaming())
+    client.submit_prompt = lambda prompt: True
+    deltas = []
+    started = time.monotonic()
+    with pytest.raises(TimeoutError):
+        for delta in client.interact_stream("Hello", timeout=0.3):
+            deltas.append(delta)
+    assert deltas == ["Hel"]
+    assert time.monotonic() - started < 0.5
+    assert client.deadline is None
+
+
+def test_stream_driver_error():
+    class Broken(FakeBrowser):
+        def execute_async_script(self, script, *args):
+            raise WebDriverException("disconnected")
+
+    client = get_offline_client(Broken())
+    client.submit_prompt = lambda prompt: True
+    with pytest.raises(WebDriverException):
+        list(client.interact_stream("Hello"))
@@ -0,0 +1,45 @@
+"""Page state classification tests, the xpaths are evaluated with lxml"""
+
+import pytest
+
+html = pytest.importorskip("lxml.html")
+
+from talkingheads.object_map import page_states
+
+
+def classify(client_name, body):
+    document = html.fromstring(f"<html><body>{body}</body></html>")
+    states = {**page_states.default, **page_states.get(client_name, {})}
+    for name, state in states.items():
+        if state.get("xq") and document.xpath(state["xq"]):
+            return name
+    return None
+
+
+@pytest.mark.parametrize(
+    "client_name, body, state",
+    [
+        ("ChatGPT", "<article><div data-message-author-role='user'>What is a usage cap?"
+                    "</div></article>", None),
+        ("ChatGPT", "<article><p>You reached our limit of jokes.</p></article>", None),
+        ("ChatGPT", "<div role='alert'>You've reached our limit of messages.</div>",
+         "usage_cap"),
+        ("ChatGPT", "<div class='toast-root' data-state='open'>Copied!</div>", None),
+        ("ChatGPT", "<div class='toast-root'>Something went wrong.</div>", "error"),
+        ("Claude", "<div data-testid='user-message'>Explain the message limit</div>", None),
+        ("Claude", "<div class='font-claude-message'>This error is common</div>", None),
+        ("Claude", "<div role='dialog'>You are out of free messages until 5 PM</div>",
+         "usage_cap"),
+        ("Gemini", "<mat-snack-bar-container>Copied to clipboard</mat-snack-bar-container>",
+         None),
+        ("Gemini", "<mat-snack-bar-container>Something went wrong</mat-snack-bar-container>",
+         "error"),
+        ("Gemini", "<message-content>Please try again later, says the error</message-content>",
+         None),
+        ("HuggingChat", "<p>Why do I send too many messages?</p>", None),
+        ("HuggingChat", "<div class='toast'>You sent too many messages</div>", "usage_cap"),
+        ("Pi", "<div id='challenge-stage'></div>", "challenge"),
+    ],
+)
+def test_classification(client_name, body, state):
+    assert classify(client_name, body) == state
@@ -0,0 +1,146 @@
+"""Completion detector tests"""
+
+import time
+
+import pytest
+
+from talkingheads.base_browser import (
+    ButtonStateDetector,
+    MarkerDisappearanceDetector,
+    NetworkIdleDetector,
+    StableTextDetector,
+)
+from talkingheads.model_library.claude import ClaudeClient
+from talkingheads.model_library.copilot import CopilotClient
+from talkingheads.model_library.huggingchat import HuggingChatClient
+from talkingheads.model_library.pi import PiClient
+
+from utils import FakeBrowser
+
+
+class FakeClient:
+    """Returns the given texts and marker states, or (present, enabled) pairs, in order"""
+
+    def __init__(self, texts=(), present=()):
+        self.texts = list(texts)
+        self.present = list(present)
+
+    def read_last_text(self, by, elem_query):
+        return self.texts.pop(0)
+
+    def probe(self, queries):
+        flags = self.present.pop(0)
+        present, enabled = flags if isinstance(flags, tuple) else (flags, True)
+        return {name: {"present": present, "enabled": enabled} for name in queries}
+
+
+def get_offline(client_class, **kwargs):
+    class OfflineClient(client_class):
+        def warm_up(self, *args):
+            self.browser = FakeBrowser()
+            self.ready = True
+
+    return OfflineClient(**kwargs)
+
+
+def get_detector(**kwargs):
+    detector = StableTextDetector("tag name", "div", **kwargs)
+    detector.reset(FakeClient())
+    return detector
+
+
+def test_period_follows_speed():
+    detector = get_detector(chunk_size=50, max_period=2.0)
+    detector.last_progress = (time.monotonic() - 1.0, 0)
+    detector.observe(100)
+    assert detector.period == pytest.approx(0.5, rel=0.05)
+
+    detector.last_progress = (time.monotonic() - 1.0, 0)
+    detector.observe(10000)
+    assert detector.period == detector.min_period
+
+    detector.last_progress = (time.monotonic() - 1.0, 0)
+    detector.observe(10)
+    assert detector.period == detector.max_period
+
+
+def test_period_backs_off():
+    detector = get_detector(min_period=0.1, max_period=0.3, backoff=1.5)
+    detector.observe()
+    assert detector.period == pytest.approx(0.15)
+    detector.observe(5)
+    assert detector.period == pytest.approx(0.15)
+    detector.observe(5)
+    assert detector.period == pytest.approx(0.225)
+    detector.observe(5)
+    assert detector.period == 0.3
+    assert detector.last_progress[1] == 5
+
+    detector.reset(FakeClient())
+    assert detector.period == 0.1 and detector.last_progress is None
+
+
+def test_stable_text():
+    detector = get_detector(quiet_period=0.05)
+    client = FakeClient(["", "", "Hel", "Hello", "Hello", "Hello"])
+    assert not detector.check(client)
+    time.sleep(0.06)
+    assert not detector.check(client)
+    assert not detector.check(client)
+    assert not detector.check(client)
+    assert not detector.check(client)
+    time.sleep(0.06)
+    assert detector.check(client)
+
+
+def test_marker_disappearance():
+    detector = MarkerDisappearanceDetector("tag name", "button", appear_timeout=5)
+    client = FakeClient(present=[False, True, True, False])
+    detector.reset(client)
+    assert [detector.check(client) for _ in range(4)] == [False, False, False, True]
+
+    detector = MarkerDisappearanceDetector("tag name", "button", appear_timeout=0.05)
+    detector.reset(client)
+    client.present = [False, False]
+    assert not detector.check(client)
+    time.sleep(0.06)
+    assert detector.check(client)
+
+
+def test_button_state():
+    detector = ButtonStateDetector("tag name", "button", enabled=False, appear_timeout=5)
+    client = FakeClient(present=[(True, False), (False, False), (True, True), (True, False)])
+    detector.reset(client)
+    assert [detector.check(client) for _ in range(4)] == [False, False, False, True]
+
+    detector = ButtonStateDetector("tag name", "button", appear_timeout=0.05)
+    detector.reset(client)
+    client.present = [(True, True), (True, True)]
+    assert not detector.check(client)
+    time.sleep(0.06)
+    assert detector.check(client)
+
+
+@pytest.mark.parametrize(
+    "client_class, elem_query, enabled",
+    [
+        (ClaudeClient, "send_button_xq", False),
+        (CopilotClient, "submit_xq", False),
+        (PiClient, "textarea_xq", True),
+    ],
+)
+def test_client_detectors(client_class, elem_query, enabled):
+    client = get_offline(client_class)
+    detector = client.completion_detector
+    assert isinstance(detector, ButtonStateDetector)
+    assert detector.elem_query == client.markers[elem_query]
+    assert detector.enabled is enabled
+
+
+def test_network_detectors():
+    client = get_offline(HuggingChatClient, credential_check=False)
+    assert isinstance(client.completion_detector, MarkerDisappearanceDetector)
+    client = get_offline(HuggingChatClient, credential_check=False, network_capture=True)
+    assert isinstance(client.completion_detector, NetworkIdleDetector)
+    client = get_offline(PiClient, network_capture=True)
+    assert isinstance(client.completion_detector, ButtonStateDetector)
@@ -0,0 +1,35 @@
+"""Interaction deadline tests"""
+
+import time
+
+import pytest
+
+from utils import get_offline_client
+
+
+def test_nested_deadlines():
+    client = get_offline_client()
+    assert client.deadline is None
+    with client.deadline_scope(timeout=1):
+        outer = client.deadline
+        with client.deadline_scope(timeout=5):
+            assert client.deadline == outer
+        with client.deadline_scope(deadline=time.time() + 0.5):
+            assert client.deadline == pytest.approx(time.monotonic() + 0.5, abs=0.05)
+            assert client.remaining_time(10) <= 0.5
+            assert client.waiter(10)._timeout <= 0.5
+        assert client.deadline == outer
+        assert client.remaining_time(0.2) == 0.2
+    assert client.deadline is None
+    assert client.remaining_time(3) == 3
+
+
+def test_exceeded_deadline():
+    client = get_offline_client()
+    with client.deadline_scope(timeout=0.02):
+        time.sleep(0.03)
+        with pytest.raises(TimeoutError):
+            client.check_deadline()
+        with pytest.raises(TimeoutError):
+            client.remaining_time()
+    client.check_deadline()
@@ -0,0 +1,104 @@
+"""Prompt input tests"""
+
+import os
+
+import pytest
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.common.keys import Keys
+
+from talkingheads import scripts
+from talkingheads.base_browser import LONG_PROMPT_INSTRUCTION
+from utils import FakeBrowser, get_offline_client
+
+
+def get_attaching_client(attached=True, **kwargs):
+    client = get_offline_client(client_name="ChatGPT", long_prompt_limit=10, **kwargs)
+    client.attached = []
+
+    def attach_file(file_path):
+        with open(file_path, encoding="utf-8") as fd:
+            client.attached.append((file_path, fd.read()))
+        if isinstance(attached, Exception):
+            raise attached
+        return attached
+
+    client.attach_file = attach_file
+    return client
+
+
+def test_long_prompt_is_attached():
+    client = get_attaching_client()
+    assert client.attach_long_prompt("short") == "short"
+    assert not client.attached
+
+    prompt = "A long prompt " * 10
+    text = client.attach_long_prompt(prompt)
+    (file_path, content), = client.attached
+    assert content == prompt
+    assert text == LONG_PROMPT_INSTRUCTION.format(os.path.basename(file_path))
+    assert not os.path.exists(file_path)
+
+
+def test_long_prompt_attachment_failure():
+    prompt = "A long prompt " * 10
+    client = get_attaching_client(attached=False)
+    assert client.attach_long_prompt(prompt) == prompt
+    assert not os.path.exists(client.attached[0][0])
+
+    client = get_attaching_client(attached=OSError("disconnected"))
+    with pytest.raises(OSError):
+        client.attach_long_prompt(prompt)
+    assert not os.path.exists(client.attached[0][0])
+
+
+def test_long_prompt_without_upload():
+    client = get_offline_client(client_name="Pi", long_prompt_limit=10)
+    assert client.attach_long_prompt("A long prompt " * 10) == "A long prompt " * 10
+
+
+class FakeTextArea:
+    def __init__(self):
+        self.keys = []
+
+    def send_keys(self, *keys):
+        self.keys.extend(keys)
+
+
+def test_prompt_is_pasted():
+    browser = FakeBrowser(["paste", "Hello\nworld"])
+    client = get_offline_client(browser)
+    text_area = FakeTextArea()
+    assert client.type_prompt(text_area, "Hello\nworld")
+    assert not text_area.keys
+    assert [call[0] for call in browser.calls] == [scripts.INSERT_TEXT, scripts.INPUT_VALUE]
+    assert browser.calls[0][1] == (text_area, "Hello\nworld")
+
+
+def test_prompt_is_inserted_natively():
+    browser = FakeBrowser(["native", " Hello  world "])
+    client = get_offline_client(browser)
+    text_area = FakeTextArea()
+    assert client.type_prompt(text_area, "Hello world")
+    assert ("Input.insertText", {"text": "Hello world"}) in browser.calls
+    assert not text_area.keys
+
+
+def test_prompt_is_typed_on_mismatch():
+    client = get_offline_client(FakeBrowser(["paste", "Hel"]))
+    text_area = FakeTextArea()
+    assert not client.type_prompt(text_area, "Hello\nworld")
+    assert text_area.keys == [
+        Keys.CONTROL + "a", Keys.DELETE,
+        "Hello", Keys.SHIFT + Keys.ENTER, "world", Keys.SHIFT + Keys.ENTER,
+    ]
+
+
+def test_prompt_is_typed_on_driver_error():
+    class Broken(FakeBrowser):
+        def execute_script(self, script, *args):
+            raise WebDriverException("detached")
+
+    client = get_offline_client(Broken())
+    text_area = FakeTextArea()
+    assert not client.type_prompt(text_area, "Hello")
+    assert text_area.keys == ["Hello", Keys.SHIFT + Keys.ENTER]
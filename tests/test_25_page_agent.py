@@ -0,0 +1,113 @@
+"""Page agent tests"""
+
+from talkingheads import scripts
+from talkingheads.model_library.pi import PiClient
+from utils import FakeBrowser, get_offline_client
+
+
+class AgentPage(FakeBrowser):
+    """Answers the calls of the page agent with the given values in order"""
+
+    def __init__(self, values, injected=True):
+        super().__init__()
+        self.values = list(values)
+        self.injected = injected
+
+    def execute_script(self, script, *args):
+        self.calls.append((script, args))
+        if script == scripts.PAGE_AGENT_CALL and not self.injected:
+            return None
+        if script in (scripts.PAGE_AGENT_CALL, scripts.PAGE_AGENT):
+            self.injected = True
+            return {"value": self.values.pop(0)}
+        return None
+
+
+def get_agent_client(values, injected=True, **kwargs):
+    client = get_offline_client(AgentPage(values, injected), page_agent=True, **kwargs)
+    client.sent = []
+    client.send_prompt = lambda prompt: client.sent.append(prompt) or True
+    return client
+
+
+def state(**values):
+    return {
+        "inputReady": True, "busy": False, "inputLength": 0, "sendEnabled": False,
+        "responses": 1, "lastLength": 10, **values,
+    }
+
+
+def test_agent_is_injected():
+    client = get_agent_client(["sent", "sent"], injected=False)
+    assert client.run_page_agent("submit", "Hello") == "sent"
+    (call_script, call_args), (inject_script, inject_args) = client.browser.calls
+    assert call_script == scripts.PAGE_AGENT_CALL and call_args == ("submit", ("Hello",))
+    assert inject_script == scripts.PAGE_AGENT
+    assert inject_args == (client.get_page_agent_config(), "submit", ("Hello",))
+
+    assert client.run_page_agent("submit", "Hello") == "sent"
+    assert client.browser.calls[-1][0] == scripts.PAGE_AGENT_CALL
+
+
+def test_agent_config():
+    class OfflinePi(PiClient):
+        def warm_up(self, *args):
+            self.browser = FakeBrowser()
+            self.ready = True
+
+    client = OfflinePi()
+    assert client.get_page_agent_config() == {
+        "input": ["xpath", client.markers.textarea_xq],
+        "send": ["xpath", client.markers.sendkeys_xq],
+        "response": ["xpath", client.markers.chatbox_xq],
+        "busy": ["xpath", client.markers.wait_xq],
+    }
+
+
+def test_submit_paths():
+    client = get_agent_client(["sent"])
+    assert client.submit_prompt("Hello")
+    assert not client.sent
+
+    client = get_agent_client(["enter"])
+    assert client.submit_prompt("Hello")
+    key_events = [
+        params["type"] for command, params in client.browser.calls
+        if command == "Input.dispatchKeyEvent"
+    ]
+    assert key_events == ["keyDown", "keyUp"]
+    assert not client.sent
+
+    client = get_agent_client(["mismatch"])
+    assert client.submit_prompt("Hello")
+    assert client.sent == ["Hello"]
+
+    client = get_offline_client(AgentPage([]))
+    client.send_prompt = lambda prompt: prompt == "Hello"
+    assert client.submit_prompt("Hello")
+    assert not client.browser.calls
+
+
+def test_ready_with_input():
+    client = get_agent_client([
+        state(busy=True), state(inputLength=5, sendEnabled=False),
+        state(inputLength=5, sendEnabled=True),
+    ])
+    assert client.is_ready_to_prompt(timeout_dur=2, settle_period=0.01)
+    assert not client.browser.values
+
+
+def test_ready_after_settling():
+    client = get_agent_client([
+        state(lastLength=3), state(lastLength=8), state(lastLength=8), state(),
+    ])
+    assert client.is_ready_to_prompt(timeout_dur=2, settle_period=0.01)
+    assert len(client.browser.values) == 1
+
+
+def test_not_ready():
+    client = get_agent_client([state(inputReady=False)] * 100)
+    assert not client.is_ready_to_prompt(timeout_dur=0.1, settle_period=0.01)
+
+    client = get_offline_client(FakeBrowser([None, None]), page_agent=True)
+    assert not client.is_ready_to_prompt(timeout_dur=1)
@@ -0,0 +1,96 @@
+"""Batched element lookup tests"""
+
+from selenium.webdriver.common.by import By
+
+from talkingheads import scripts
+from utils import FakeBrowser, get_offline_client
+
+
+class LinkPage(FakeBrowser):
+    """Finds the links through the driver, the other lookups run in the page"""
+
+    def find_elements(self, by, value):
+        self.calls.append((by, value))
+        return ["link1", "link2"] if by == By.LINK_TEXT else []
+
+
+def test_find_many():
+    browser = LinkPage([{
+        "input": {"value": "textarea", "index": 1, "cost": 0.4},
+        "responses": {"value": ["r1", "r2"], "index": 0, "cost": 0.2},
+        "missing": {"value": None, "index": -1, "cost": 0.3},
+    }])
+    client = get_offline_client(browser, client_name="ChatGPT")
+    textarea_xq = client.markers.textarea_xq
+    found = client.find_many({
+        "input": (By.XPATH, textarea_xq),
+        "responses": (By.XPATH, client.markers.chatbox_xq, "all"),
+        "missing": (By.ID, "missing", "last"),
+        "link": (By.LINK_TEXT, "New chat", "last"),
+    })
+    assert found == {
+        "input": "textarea", "responses": ["r1", "r2"], "missing": None, "link": "link2"
+    }
+
+    script, (in_page, root) = browser.calls[0]
+    assert script == scripts.FIND_MANY and root is None
+    assert set(in_page["input"][0]) == {
+        (By.CSS_SELECTOR, 'div[contenteditable="true"]'),
+        (By.CSS_SELECTOR, 'textarea[id="prompt-textarea"]'),
+    }
+    assert in_page["input"][1] == "first"
+    assert in_page["responses"][1] == "all"
+    assert in_page["missing"] == [[(By.ID, "missing")], "last"]
+    assert "link" not in in_page
+    assert browser.calls[1] == (By.LINK_TEXT, "New chat")
+
+    # The fallback which matched is tried first from now on
+    assert client.selectors.compile(By.XPATH, textarea_xq)[0] == (
+        By.CSS_SELECTOR, 'textarea[id="prompt-textarea"]'
+    )
+    stats = client.selectors.stats
+    assert stats[(By.XPATH, textarea_xq)]["lookups"] == 1
+    assert stats[(By.ID, "missing")] == {"winner": None, "cost": 0.3, "lookups": 1}
+
+
+def test_find_many_within_element():
+    browser = FakeBrowser([{"item": {"value": "span", "index": 0, "cost": 0.1}}])
+    client = get_offline_client(browser, client_name="ChatGPT")
+    found = client.find_many({"item": (By.XPATH, "//span")}, dom_element="root")
+    assert found == {"item": "span"}
+    assert browser.calls[0][1] == ({"item": [[(By.XPATH, "//span")], "first"]}, "root")
+    assert not client.selectors.stats
+
+
+def test_probe():
+    flags = {"send": {"count": 1, "present": True, "visible": True, "enabled": False}}
+    browser = FakeBrowser([flags])
+    client = get_offline_client(browser, client_name="ChatGPT")
+    assert client.probe({"send": (By.XPATH, client.markers.send_btn_xq)}) == flags
+    script, (queries,) = browser.calls[0]
+    assert script == scripts.PROBE
+    assert queries == {"send": [
+        (By.CSS_SELECTOR, 'button[data-testid="send-button"]'),
+        (By.CSS_SELECTOR, 'button[aria-label="Send prompt"]'),
+    ]}
+
+
+def test_cached_lookup():
+    def found(value):
+        return {"//textarea": {"value": value, "index": 0, "cost": 0.1}}
+
+    browser = FakeBrowser([found("old"), True, False, found("new"), found(["new"])])
+    client = get_offline_client(browser)
+    assert client.find_or_fail(By.XPATH, "//textarea", use_cache=True) == "old"
+    assert client.find_or_fail(By.XPATH, "//textarea", use_cache=True) == "old"
+    assert client.cache_stats == {"hits": 1, "misses": 1}
+
+    # The cached element is detached, it is located again
+    assert client.find_or_fail(By.XPATH, "//textarea", use_cache=True) == "new"
+    assert client.cache_stats == {"hits": 1, "misses": 2}
+    assert client.element_cache[(By.XPATH, "//textarea")] == "new"
+
+    # Only the first element is cached
+    assert client.find_or_fail(By.XPATH, "//textarea", "all", use_cache=True) == ["new"]
+    assert client.cache_stats == {"hits": 1, "misses": 2}
+    assert not browser.results
@@ -31,3 +31,46 @@ def get_driver_arguments(name: str, incognito: bool = False) -> Dict[str, Any]:
         "incognito": incognito,
         "user_data_dir": os.getenv('CHROME_USER_DATA_DIR')
     }
+
+
+class FakeBrowser:
+    """A stand-in for the webdriver, the scripts return the given results in order"""
+
+    def __init__(self, results=None):
+        self.results = list(results or [])
+        self.calls = []
+
+    def execute_script(self, script, *args):
+        self.calls.append((script, args))
+        return self.results.pop(0) if self.results else None
+
+    execute_async_script = execute_script
+
+    def execute_cdp_cmd(self, command, params):
+        self.calls.append((command, params))
+        return {"identifier": "1"}
+
+    def get_log(self, _):
+        return []
+
+    def get(self, url):
+        self.calls.append(("get", url))
+
+    def close(self):
+        pass
+
+    def quit(self):
+        pass
+
+
+def get_offline_client(browser=None, client_name="Pi", **kwargs):
+    """Returns a ready client driving a fake browser, to test the logic without Chrome"""
+    from talkingheads.base_browser import BaseBrowser
+
+    class OfflineClient(BaseBrowser):
+        def warm_up(self, *args):
+            self.browser = browser or FakeBrowser()
+            self.ready = True
+
+    kwargs.setdefault("credential_check", False)
+    return OfflineClient(client_name=client_name, url="", **kwargs)